@@ -0,0 +1,182 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench_async
+~~~~~~~~~~~~~~~~~
+
+Benchmark of slow WeApRous handlers, the ones waiting on another service.
+It serves an app mixing three routes:
+
+- ``/async``: an ``async def`` handler awaiting ``--delay`` seconds,
+- ``/sync``: a synchronous handler sleeping ``--delay`` seconds,
+- ``/fast``: a synchronous handler answering at once,
+
+and, for each engine, drives ``--concurrency`` clients on each route alone,
+then on the three routes at once, and reports throughput and latency
+percentiles per route.
+
+An awaiting handler holds no thread, so ``/async`` scales with the number
+of clients while ``/sync`` is bounded by ``threads / delay`` requests per
+second. ``/fast`` shares the threads of ``/sync`` and queues behind it,
+but not behind ``/async``, whose waiting handlers take no thread.
+
+Usage::
+
+    python bench_async.py --concurrency 64 --delay 0.1 --threads 8
+"""
+
+import argparse
+import subprocess
+import sys
+import threading
+import time
+
+from bench_engines import wait_port, fetch
+
+APP_CMD = """
+import asyncio, time
+from daemon import WeApRous
+
+app = WeApRous()
+
+@app.route('/async', methods=['GET'])
+async def slow_async(headers, body):
+    await asyncio.sleep({delay})
+    return {{'waited': {delay}}}
+
+@app.route('/sync', methods=['GET'])
+def slow_sync(headers, body):
+    time.sleep({delay})
+    return {{'waited': {delay}}}
+
+@app.route('/fast', methods=['GET'])
+def fast(headers, body):
+    return {{'waited': 0}}
+
+app.prepare_address('127.0.0.1', {port})
+app.run(engine='{engine}', threads={threads})
+"""
+
+REQUEST = (
+    "GET {path} HTTP/1.1\r\n"
+    "Host: bench\r\n"
+    "Connection: close\r\n"
+    "\r\n"
+)
+
+ENGINES = ("threaded", "pool", "asyncio", "selectors")
+
+
+def start_app(port, engine, delay, threads):
+    """Start the app server process with its output discarded."""
+    code = APP_CMD.format(port=port, engine=engine, delay=delay, threads=threads)
+    return subprocess.Popen([sys.executable, "-c", code],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def run_load(port, paths, concurrency, duration):
+    """
+    Drive ``concurrency`` client threads per path for ``duration`` seconds.
+
+    :rtype dict: path -> throughput and latency percentiles in milliseconds.
+    """
+    latencies = {path: [] for path in paths}
+    errors = {path: 0 for path in paths}
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def client(path):
+        payload = REQUEST.format(path=path).encode()
+        local = []
+        failed = 0
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            try:
+                fetch(port, payload)
+            except OSError:
+                failed += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies[path].extend(local)
+            errors[path] += failed
+
+    threads = [threading.Thread(target=client, args=(path,))
+               for path in paths for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    results = {}
+    for path, values in latencies.items():
+        values.sort()
+
+        def pct(p):
+            if not values:
+                return 0.0
+            return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+        results[path] = {
+            "rps": len(values) / elapsed,
+            "p50": pct(0.50),
+            "p99": pct(0.99),
+            "errors": errors[path],
+        }
+    return results
+
+
+def report(name, result):
+    print("{:<28} {:>8.0f} req/s  p50 {:>8.2f} ms  p99 {:>8.2f} ms  errors {}".format(
+        name, result["rps"], result["p50"], result["p99"], result["errors"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_async',
+                                     description='Benchmark slow async and sync handlers')
+    parser.add_argument('--concurrency', type=int, default=64,
+                        help='clients per route')
+    parser.add_argument('--delay', type=float, default=0.1,
+                        help='seconds waited by the slow handlers')
+    parser.add_argument('--threads', type=int, default=8,
+                        help='worker or executor threads of the server')
+    parser.add_argument('--duration', type=float, default=3.0,
+                        help='seconds of load per run')
+    parser.add_argument('--engines', default=",".join(ENGINES))
+    parser.add_argument('--base-port', type=int, default=19100)
+    args = parser.parse_args()
+
+    print("{} clients per route, handlers waiting {} s, {} threads".format(
+        args.concurrency, args.delay, args.threads))
+    port = args.base_port
+    for engine in args.engines.split(","):
+        server = start_app(port, engine, args.delay, args.threads)
+        try:
+            wait_port(port)
+            for path in ("/async", "/sync"):
+                result = run_load(port, [path], args.concurrency, args.duration)
+                report("{}{}".format(engine, path), result[path])
+            mixed = run_load(port, ["/async", "/sync", "/fast"], args.concurrency,
+                             args.duration)
+            for path, result in mixed.items():
+                report("{}/mixed{}".format(engine, path), result)
+        finally:
+            server.terminate()
+            server.wait()
+        port += 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench_engines
+~~~~~~~~~~~~~~~~~
+
+Benchmark of the serving engines. It compares the threaded ``run_backend`` and
+``run_proxy`` against the ``selectors`` reactor on the static file path and on
+the proxy relay path, and reports throughput and latency percentiles.
+
+Each server runs in its own process so that the load generator does not share
+the GIL with it.
+
+Usage::
+
+    python bench_engines.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_CMD = (
+    "from daemon import create_backend;"
+    "create_backend('127.0.0.1', {port}, engine='{engine}')"
+)
+
+PROXY_CMD = (
+    "from daemon import create_proxy;"
+    "create_proxy('127.0.0.1', {port}, "
+    "{{'bench': ('127.0.0.1:{upstream}', 'round-robin')}}, engine='{engine}')"
+)
+
+REQUEST = (
+    "GET {path} HTTP/1.1\r\n"
+    "Host: bench\r\n"
+    "Connection: close\r\n"
+    "\r\n"
+)
+
+
+def start_server(code):
+    """Start a server process running ``code`` with its output discarded."""
+    return subprocess.Popen(
+        [sys.executable, "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_port(port, timeout=5.0):
+    """Wait until ``port`` accepts connections."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("Server on port {} did not start".format(port))
+
+
+def fetch(port, payload):
+    """Send one request and read the response until the server closes."""
+    conn = socket.create_connection(("127.0.0.1", port), timeout=10)
+    try:
+        conn.sendall(payload)
+        size = 0
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                return size
+            size += len(chunk)
+    finally:
+        conn.close()
+
+
+def run_load(port, path, requests, concurrency):
+    """
+    Issue ``requests`` requests from ``concurrency`` client threads.
+
+    :rtype dict: throughput and latency percentiles in milliseconds.
+    """
+    payload = REQUEST.format(path=path).encode()
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    per_client = requests // concurrency
+
+    def client():
+        local = []
+        for _ in range(per_client):
+            start = time.perf_counter()
+            try:
+                fetch(port, payload)
+            except OSError:
+                with lock:
+                    errors[0] += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    def pct(p):
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": pct(0.50),
+        "p99": pct(0.99),
+        "errors": errors[0],
+    }
+
+
+def report(name, result):
+    print("{:<28} {:>9.0f} req/s  p50 {:>7.2f} ms  p99 {:>7.2f} ms  errors {}".format(
+        name, result["rps"], result["p50"], result["p99"], result["errors"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_engines',
+                                     description='Benchmark the serving engines')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--path', default='/static/images/welcome.png')
+    parser.add_argument('--base-port', type=int, default=19000)
+    args = parser.parse_args()
+
+    port = args.base_port
+    for engine in ("threaded", "selectors"):
+        backend = start_server(BACKEND_CMD.format(port=port, engine=engine))
+        proxy = start_server(PROXY_CMD.format(port=port + 1, upstream=port, engine=engine))
+        try:
+            wait_port(port)
+            wait_port(port + 1)
+            report("backend/{}".format(engine),
+                   run_load(port, args.path, args.requests, args.concurrency))
+            report("proxy+backend/{}".format(engine),
+                   run_load(port + 1, args.path, args.requests, args.concurrency))
+        finally:
+            proxy.terminate()
+            backend.terminate()
+            proxy.wait()
+            backend.wait()
+        port += 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench_memory
+~~~~~~~~~~~~~~~~~
+
+Memory and allocation benchmark of the per-request objects. It drives
+:meth:`HttpAdapter.handle_message <HttpAdapter.handle_message>` in process,
+without sockets, and reports with :mod:`tracemalloc`:
+
+- ``objects``: bytes held by one request and response pair, and by one
+  adapter (its 16 KiB receive buffer included),
+- ``peak``: bytes in use at the peak of one request, adapter included,
+- ``retained``: bytes kept in use between requests, adapter included,
+- ``req/s``: in-process throughput,
+
+for new objects per request and, when supported, the recycled objects of
+``object_pool=True``, on a hook, a static file and a 500-message history
+returned by the hook as a ``json.dumps`` string or as a dict.
+
+Usage::
+
+    python bench_memory.py --requests 20000
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import time
+import tracemalloc
+
+from daemon.httpadapter import HttpAdapter
+from daemon.request import Request
+from daemon.response import Response
+
+MESSAGES = {
+    "hook": (
+        b"GET /hello HTTP/1.1\r\n"
+        b"Host: bench\r\n"
+        b"User-Agent: bench\r\n"
+        b"Cookie: auth=true; theme=dark\r\n"
+        b"\r\n"
+    ),
+    "static": (
+        b"GET /login.html HTTP/1.1\r\n"
+        b"Host: bench\r\n"
+        b"User-Agent: bench\r\n"
+        b"\r\n"
+    ),
+    "history/str": (
+        b"GET /history-str HTTP/1.1\r\n"
+        b"Host: bench\r\n"
+        b"\r\n"
+    ),
+    "history/dict": (
+        b"GET /history HTTP/1.1\r\n"
+        b"Host: bench\r\n"
+        b"\r\n"
+    ),
+}
+
+HISTORY = [{"from": "user{}".format(i % 7), "message": "message number {}".format(i),
+            "timestamp": "2025-01-01T12:00:{:02d}.000000".format(i % 60),
+            "channel": "general"} for i in range(500)]
+
+
+def hello(headers="guest", body="anonymous"):
+    return '{"message": "hello"}'
+
+
+def history_str(headers="guest", body="anonymous"):
+    return json.dumps({"status": "success", "count": len(HISTORY), "messages": HISTORY})
+
+
+def history(headers="guest", body="anonymous"):
+    return {"status": "success", "count": len(HISTORY), "messages": HISTORY}
+
+
+# As set by :meth:`WeApRous.route`.
+for func, path in ((hello, "/hello"), (history_str, "/history-str"), (history, "/history")):
+    func._route_path = path
+    func._route_methods = ["GET"]
+
+
+ROUTES = {("GET", "/hello"): hello,
+          ("GET", "/history-str"): history_str,
+          ("GET", "/history"): history}
+
+
+def make_adapter(object_pool):
+    """Build an adapter, None if ``object_pool`` is not supported."""
+    if not object_pool:
+        return HttpAdapter("127.0.0.1", 9000, None, ("127.0.0.1", 0), ROUTES)
+    try:
+        return HttpAdapter("127.0.0.1", 9000, None, ("127.0.0.1", 0), ROUTES,
+                           object_pool=True)
+    except TypeError:
+        return None
+
+
+def serve(adapter, msg, served):
+    """Answer ``msg``, reading a streamed response to its end."""
+    response, _ = adapter.handle_message(msg, ROUTES, served)
+    if not isinstance(response, bytes):
+        for _ in response:
+            pass
+
+
+def object_bytes(factory, count=1000):
+    """Bytes held by one object built by ``factory``."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def measure(msg, object_pool, requests):
+    """
+    Serve ``msg`` ``requests`` times on one adapter.
+
+    :rtype dict: peak bytes per request and throughput, None if unsupported.
+    """
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        # Load the module-level caches (mimetypes, ...) before counting.
+        serve(make_adapter(False), msg, 1)
+
+        # Bytes are counted from before the adapter is built, so that what
+        # a request keeps alive after it is served counts as well.
+        gc.collect()
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        adapter = make_adapter(object_pool)
+        if adapter is None:
+            tracemalloc.stop()
+            return None
+
+        # Warm up the pools and the caches.
+        for served in range(1, 101):
+            serve(adapter, msg, served)
+
+        peak = 0
+        samples = min(requests, 2000)
+        for served in range(samples):
+            tracemalloc.reset_peak()
+            serve(adapter, msg, 1)
+            peak += tracemalloc.get_traced_memory()[1] - base
+            sink.seek(0)
+            sink.truncate()
+        retained = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for served in range(requests):
+            serve(adapter, msg, 1)
+            if served % 1000 == 0:
+                sink.seek(0)
+                sink.truncate()
+        elapsed = time.perf_counter() - start
+
+    return {
+        "peak": peak / samples,
+        "retained": retained,
+        "rps": requests / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_memory',
+                                     description='Benchmark the per-request allocations')
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    print("{:<28} {:>9.0f} bytes".format(
+        "objects/request+response", object_bytes(lambda: (Request(), Response()))))
+    print("{:<28} {:>9.0f} bytes".format(
+        "objects/adapter", object_bytes(lambda: make_adapter(False))))
+    for name, msg in MESSAGES.items():
+        for object_pool in (False, True):
+            result = measure(msg, object_pool, args.requests)
+            label = "{}/{}".format(name, "pooled" if object_pool else "new")
+            if result is None:
+                print("{:<28} unsupported".format(label))
+                continue
+            print("{:<28} {:>9.0f} bytes peak  {:>9.0f} bytes retained  "
+                  "{:>9.0f} req/s".format(label, result["peak"],
+                                          result["retained"], result["rps"]))
+
+
+if __name__ == "__main__":
+    main()
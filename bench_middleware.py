@@ -0,0 +1,129 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench_middleware
+~~~~~~~~~~~~~~~~~
+
+Microbenchmark of the middleware chains. It dispatches prepared requests
+through :meth:`HttpAdapter.dispatch <HttpAdapter.dispatch>` with handlers
+returning at once, and times per request:
+
+- a route of no middleware, then with ``--layers`` app middleware of each
+  kind (before, after, around), with and without ``--layers`` more of its
+  own,
+- a protected page of the static site, answered 401 by the login layer,
+  and a public one served from disk,
+
+against ``direct``: the hook called and its response built without any
+chain, the floor of the hook routes.
+
+Usage::
+
+    python bench_middleware.py --layers 3 --rounds 20000
+"""
+
+import argparse
+import time
+
+from daemon.httpadapter import HttpAdapter
+from daemon.middleware import Middleware, Pipeline
+from daemon.router import Router
+
+
+def build_middleware(layers):
+    middleware = Middleware()
+    for _ in range(layers):
+        middleware.before(lambda req, resp: None)
+        middleware.after(lambda req, resp, raw: raw)
+
+        def around(req, resp):
+            yield
+        middleware.around(around)
+    return middleware
+
+
+def build_adapter(layers):
+    """An adapter of the routes ``/plain``, ``/app`` and ``/own``."""
+    def plain(headers, body):
+        return "hello"
+
+    def app(headers, body):
+        return "hello"
+
+    def own(headers, body):
+        return "hello"
+
+    own._route_middleware = build_middleware(layers)
+    middleware = build_middleware(layers)
+    for func, path in ((plain, "/plain"), (app, "/app"), (own, "/own")):
+        func._route_path = path
+        func._route_methods = ["GET"]
+    # The route without middleware is compiled apart, without the app's.
+    Pipeline({("GET", "/plain"): plain})
+    Pipeline({("GET", "/app"): app, ("GET", "/own"): own}, middleware)
+    routes = Router({("GET", "/plain"): plain, ("GET", "/app"): app, ("GET", "/own"): own})
+    return HttpAdapter("127.0.0.1", 0, None, None, routes, server_timing=False), routes
+
+
+def per_call(func, rounds):
+    """Microseconds per call of ``func()``, best of three runs."""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        elapsed = (time.perf_counter() - start) / rounds * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_middleware',
+                                     description='Benchmark the middleware chains')
+    parser.add_argument('--layers', type=int, default=3,
+                        help='middleware of each kind, per registry')
+    parser.add_argument('--rounds', type=int, default=20000)
+    args = parser.parse_args()
+
+    adapter, routes = build_adapter(args.layers)
+
+    def exchange(path):
+        message = "GET {} HTTP/1.1\r\nHost: bench\r\n\r\n".format(path).encode()
+
+        def run():
+            req, resp = adapter.new_exchange()
+            req.prepare(message, routes)
+            return adapter.dispatch(req, resp)
+        return run
+
+    def direct():
+        req, resp = adapter.new_exchange()
+        req.prepare(b"GET /plain HTTP/1.1\r\nHost: bench\r\n\r\n", routes)
+        return adapter.build_hook_response(req, resp, adapter.call_hook(req))
+
+    cases = [
+        ("direct", direct),
+        ("route/no middleware", exchange("/plain")),
+        ("route/app x{}".format(3 * args.layers), exchange("/app")),
+        ("route/app+own x{}".format(6 * args.layers), exchange("/own")),
+        ("static/401", exchange("/index.html")),
+        ("static/login.html", exchange("/login.html")),
+    ]
+    print("{:<24} {:>10}".format("request", "us/request"))
+    for name, func in cases:
+        rounds = args.rounds if not name.startswith("static/login") else max(args.rounds // 10, 1)
+        print("{:<24} {:>10.2f}".format(name, per_call(func, rounds)))
+
+
+if __name__ == "__main__":
+    main()
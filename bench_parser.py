@@ -0,0 +1,124 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench_parser
+~~~~~~~~~~~~~~~~~
+
+Microbenchmark of the request parsing. It compares
+:func:`parse_request <daemon.parser.parse_request>` with the ``str`` parser
+it replaced in :meth:`Request.prepare <Request.prepare>` (decode the whole
+message, then ``splitlines``, ``split('\\r\\n')`` and
+``split('\\r\\n\\r\\n')``), and reports the time per message:
+
+- ``parse``: the request line and the headers, body included,
+- ``parse+use``: the same, then reading the ``connection`` and ``cookie``
+  headers and the body, as the server does for every request,
+
+on a short ``GET``, a browser-like ``GET`` and ``POST`` requests with
+form and large bodies.
+
+Usage::
+
+    python bench_parser.py --rounds 20000
+"""
+
+import argparse
+import time
+
+from daemon.parser import parse_request
+
+BROWSER_HEADERS = (
+    b"Host: 127.0.0.1:9000\r\n"
+    b"User-Agent: Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0\r\n"
+    b"Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8\r\n"
+    b"Accept-Language: en-US,en;q=0.5\r\n"
+    b"Accept-Encoding: gzip, deflate, br\r\n"
+    b"Connection: keep-alive\r\n"
+    b"Cookie: auth=true; theme=dark; session=0123456789abcdef\r\n"
+    b"Upgrade-Insecure-Requests: 1\r\n"
+    b"Sec-Fetch-Dest: document\r\n"
+    b"Sec-Fetch-Mode: navigate\r\n"
+    b"Sec-Fetch-Site: none\r\n"
+    b"Priority: u=0, i\r\n"
+)
+
+
+def post(body):
+    return (b"POST /login HTTP/1.1\r\n" + BROWSER_HEADERS
+            + b"Content-Type: application/x-www-form-urlencoded\r\n"
+            + b"Content-Length: %d\r\n\r\n" % len(body) + body)
+
+
+MESSAGES = {
+    "get/short": b"GET /hello HTTP/1.1\r\nHost: bench\r\n\r\n",
+    "get/browser": b"GET /login.html HTTP/1.1\r\n" + BROWSER_HEADERS + b"\r\n",
+    "post/form": post(b"username=admin&password=password"),
+    "post/64KiB": post(b"message=" + b"x" * (64 * 1024)),
+}
+
+
+def legacy_parse(msg):
+    """The former ``Request.prepare``: request line, headers and body."""
+    request = msg.decode()
+    method, path, version = request.splitlines()[0].split()
+    headers = {}
+    for line in request.split('\r\n')[1:]:
+        if ': ' in line:
+            key, val = line.split(': ', 1)
+            headers[key.lower()] = val
+    parts = request.split('\r\n\r\n', 1)
+    body = parts[1] if len(parts) > 1 else ""
+    return method, path, version, headers, body
+
+
+def legacy_use(msg):
+    method, path, version, headers, body = legacy_parse(msg)
+    return headers.get('connection', ''), headers.get('cookie', ''), body
+
+
+def parse_use(msg):
+    method, path, version, headers, body = parse_request(msg)
+    return headers.get('connection', ''), headers.get('cookie', ''), body
+
+
+def per_call(func, msg, rounds):
+    """Microseconds per call of ``func(msg)``, best of three runs."""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func(msg)
+        elapsed = (time.perf_counter() - start) / rounds * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_parser',
+                                     description='Benchmark the request parsing')
+    parser.add_argument('--rounds', type=int, default=20000)
+    args = parser.parse_args()
+
+    print("{:<24} {:>12} {:>12} {:>8}".format("message", "str (us)", "bytes (us)", "speedup"))
+    for name, msg in MESSAGES.items():
+        rounds = args.rounds if len(msg) < 4096 else max(args.rounds // 20, 1)
+        for label, old, new in (("parse", legacy_parse, parse_request),
+                                ("parse+use", legacy_use, parse_use)):
+            old_us = per_call(old, msg, rounds)
+            new_us = per_call(new, msg, rounds)
+            print("{:<24} {:>12.2f} {:>12.2f} {:>7.1f}x".format(
+                "{}/{}".format(name, label), old_us, new_us, old_us / new_us))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+bench_router
+~~~~~~~~~~~~~~~~~
+
+Microbenchmark of the route matching. It builds an API of ``--resources``
+resources with five routes each (list, create, read, update by typed id,
+and a nested collection), then times per lookup:
+
+- ``router``: :meth:`Router.match <daemon.router.Router.match>`,
+- ``regex scan``: the usual alternative, one compiled regex per route
+  tried in registration order,
+- ``exact dict``: the former ``(method, path)`` lookup, which cannot
+  match the parameter routes and is only a floor for the static ones,
+
+on the first and last static routes, a parameter route, a path of no
+route (404) and a path of another method (405).
+
+Usage::
+
+    python bench_router.py --resources 100 --rounds 20000
+"""
+
+import argparse
+import re
+import time
+
+from daemon.router import Router
+
+
+def handler(**params):
+    return params
+
+
+def build_routes(resources):
+    routes = {}
+    for i in range(resources):
+        base = "/api/v1/res{}".format(i)
+        routes[("GET", base)] = handler
+        routes[("POST", base)] = handler
+        routes[("GET", base + "/<int:item_id>")] = handler
+        routes[("PUT", base + "/<int:item_id>")] = handler
+        routes[("GET", base + "/<owner>/items/<int:item_id>")] = handler
+    return routes
+
+
+def compile_scan(routes):
+    """One regex per route, as a linear router would do."""
+    def pattern(path):
+        def param(match):
+            kind, name = match.group(1) or "str", match.group(2)
+            return r"(?P<{}>\d+)".format(name) if kind == "int" else r"(?P<{}>[^/]+)".format(name)
+        return re.compile("^" + re.sub(r"<(?:(\w+):)?(\w+)>", param, path) + "$")
+    return [(method, pattern(path), func) for (method, path), func in routes.items()]
+
+
+def scan(compiled, method, path):
+    allowed = []
+    for route_method, regex, func in compiled:
+        found = regex.match(path)
+        if found is not None:
+            if route_method == method:
+                return func, found.groupdict(), None
+            allowed.append(route_method)
+    return None, None, tuple(allowed) or None
+
+
+def per_call(func, rounds):
+    """Microseconds per call of ``func()``, best of three runs."""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        elapsed = (time.perf_counter() - start) / rounds * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='bench_router',
+                                     description='Benchmark the route matching')
+    parser.add_argument('--resources', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=20000)
+    args = parser.parse_args()
+
+    routes = build_routes(args.resources)
+    last = args.resources - 1
+    start = time.perf_counter()
+    router = Router(routes)
+    built = (time.perf_counter() - start) * 1e3
+    compiled = compile_scan(routes)
+    print("{} routes, router built in {:.1f} ms".format(len(routes), built))
+
+    lookups = [
+        ("static/first", "GET", "/api/v1/res0"),
+        ("static/last", "GET", "/api/v1/res{}".format(last)),
+        ("param/last", "GET", "/api/v1/res{}/alice/items/42".format(last)),
+        ("404", "GET", "/api/v2/none"),
+        ("405", "DELETE", "/api/v1/res{}/42".format(last)),
+    ]
+    print("{:<16} {:>12} {:>14} {:>12}".format("lookup", "router (us)", "regex scan (us)", "dict (us)"))
+    for name, method, path in lookups:
+        assert router.match(method, path)[0] is scan(compiled, method, path)[0]
+        router_us = per_call(lambda: router.match(method, path), args.rounds)
+        scan_us = per_call(lambda: scan(compiled, method, path),
+                           max(args.rounds // args.resources, 10))
+        dict_us = per_call(lambda: routes.get((method, path)), args.rounds)
+        print("{:<16} {:>12.2f} {:>14.2f} {:>12.2f}".format(name, router_us, scan_us, dict_us))
+
+
+if __name__ == "__main__":
+    main()
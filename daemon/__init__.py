@@ -13,8 +13,22 @@
 from .backend import create_backend
 from .proxy import create_proxy
 from .weaprous import WeApRous
+from .router import Router
 from .response import Response
 from .request import Request
+from .context import Context
+from .hookloop import HookLoop
+from .middleware import Middleware, Pipeline
 from .backend import create_backend
 from .httpadapter import HttpAdapter
-from .dictionary import CaseInsensitiveDict
\ No newline at end of file
+from .dictionary import CaseInsensitiveDict, QueryDict
+from .workerpool import WorkerPool
+from .prefork import Supervisor
+from .handoff import Handoff
+from .timers import TimerWheel
+from .admission import Admission
+from .objectpool import ObjectPool
+from .logger import get_logger
+from .accesslog import AccessLog
+from .metrics import Metrics
+from .profiler import Profiler
@@ -0,0 +1,328 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.accesslog
+~~~~~~~~~~~~~~~~~
+
+This module provides the access log of the backend and the proxy: one line
+per request, in the Common Log Format followed by the latency, the upstream
+of the proxy and the request ID, which joins the lines of the proxy and of
+the backend for the same request::
+
+    127.0.0.1 - - [17/Oct/2026:09:30:00 +0000] "GET /login.html HTTP/1.1" 200 2573 0.000412 - 3f9a0c12b7e4-1a
+
+``bytes`` counts the whole response sent, headers included; ``latency``
+is the time from the complete request to the response ready, or to the
+last chunk produced for a streamed one.
+
+Request threads put their entries in a :class:`RingBuffer <RingBuffer>`
+without taking any lock. A writer thread drains it every ``flush_interval``
+seconds, writes the entries as one block, and rotates the file by size or
+age, so a rotation never stalls a request. When the writer falls a whole
+ring behind, the oldest entries are dropped and counted.
+
+Usage Example:
+--------------
+>>> access_log = AccessLog("access.log", max_bytes=10 * 1024 * 1024)
+>>> access_log.record(addr, "GET", "/", "HTTP/1.1", 200, 2573, 0.0004)
+"""
+
+import atexit
+import itertools
+import os
+import sys
+import threading
+import time
+
+#: Entries the ring holds before the oldest are overwritten.
+CAPACITY = 8192
+
+#: Seconds between two writes of the writer thread.
+FLUSH_INTERVAL = 0.5
+
+#: Size in bytes past which the log is rotated.
+MAX_BYTES = 10 * 1024 * 1024
+
+#: Rotated files kept, ``access.log.1`` being the most recent.
+BACKUPS = 5
+
+#: Access logs of the process, flushed at exit.
+_access_logs = []
+
+
+def format_entry(entry):
+    """
+    Format an entry into a log line.
+
+    :param entry (tuple): ``(created, addr, method, path, version, status,
+                          bytes, latency, upstream, request_id)``.
+
+    :rtype str: The line, ending with a newline.
+    """
+    (created, addr, method, path, version, status, nbytes, latency, upstream,
+     request_id) = entry
+    host = addr[0] if isinstance(addr, tuple) else addr
+    return '{} - - [{}] "{} {} {}" {} {} {:.6f} {} {}\n'.format(
+        host or "-",
+        time.strftime("%d/%b/%Y:%H:%M:%S +0000", time.gmtime(created)),
+        method or "-", path or "-", version or "-",
+        status or "-", nbytes, latency, upstream or "-", request_id or "-")
+
+
+class RingBuffer:
+    """
+    Fixed-size ring of entries with many writers and one reader.
+
+    A writer claims a sequence number from :func:`itertools.count`, which
+    is atomic under the GIL, and stores ``(seq, item)`` in its slot; the
+    reader takes the slots in sequence order and stops at the first one
+    not written yet.
+
+    Attributes:
+        capacity (int): Number of slots.
+        dropped (int): Entries overwritten before they were read.
+    """
+
+    __attrs__ = [
+        "capacity",
+        "dropped",
+    ]
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.dropped = 0
+        self._slots = [None] * capacity
+        self._claim = itertools.count()
+        #: Sequence number of the next entry to read.
+        self._read = 0
+
+    def put(self, item):
+        """Store ``item``, overwriting the oldest entry when the ring is full."""
+        seq = next(self._claim)
+        self._slots[seq % self.capacity] = (seq, item)
+
+    def drain(self):
+        """
+        Take the entries written since the last call, in order; only one
+        thread may drain.
+
+        :rtype list: The entries.
+        """
+        slots = self._slots
+        capacity = self.capacity
+        read = self._read
+        items = []
+        while True:
+            entry = slots[read % capacity]
+            if entry is None or entry[0] < read:
+                # Claimed but not written yet, or nothing new.
+                break
+            seq, item = entry
+            if seq > read:
+                # The writers lapped the reader: entries older than one
+                # ring behind ``seq`` were overwritten.
+                skipped = seq - capacity + 1 - read
+                self.dropped += skipped
+                read += skipped
+                continue
+            items.append(item)
+            read += 1
+        self._read = read
+        return items
+
+
+class AccessLog:
+    """
+    Access log written by a background thread, with size and time rotation.
+
+    Attributes:
+        path (str): File of the log, ``-`` for stdout.
+        max_bytes (int): Size past which the file is rotated, None to never
+                         rotate by size.
+        rotate_interval (float): Seconds after which the file is rotated,
+                                 None to never rotate by age.
+        backups (int): Rotated files kept.
+        flush_interval (float): Seconds between two writes.
+        ring (RingBuffer): Entries waiting for the writer.
+    """
+
+    __attrs__ = [
+        "path",
+        "max_bytes",
+        "rotate_interval",
+        "backups",
+        "flush_interval",
+        "ring",
+    ]
+
+    def __init__(self, path, max_bytes=MAX_BYTES, rotate_interval=None,
+                 backups=BACKUPS, capacity=CAPACITY, flush_interval=FLUSH_INTERVAL):
+        """
+        Initialize a new AccessLog instance; the writer thread starts with
+        the first entry.
+
+        :param path (str): File of the log, ``-`` for stdout.
+        :param max_bytes (int): Size past which the file is rotated.
+        :param rotate_interval (float): Seconds after which the file is rotated.
+        :param backups (int): Rotated files kept.
+        :param capacity (int): Entries the ring holds.
+        :param flush_interval (float): Seconds between two writes.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.ring = RingBuffer(capacity)
+        self._file = None
+        self._opened = 0
+        self._thread = None
+        self._lock = threading.Lock()
+        _access_logs.append(self)
+
+    def record(self, addr, method, path, version, status, nbytes, latency,
+               upstream=None, request_id=None):
+        """
+        Log one request.
+
+        :param addr (tuple): Address of the client.
+        :param method (str): Method of the request.
+        :param path (str): Path of the request.
+        :param version (str): HTTP version of the request.
+        :param status (int): Status code of the response.
+        :param nbytes (int): Bytes of the response, headers included.
+        :param latency (float): Seconds to answer the request.
+        :param upstream (str): ``host:port`` the proxy forwarded to.
+        :param request_id (str): ID of the request, see ``X-Request-ID``.
+        """
+        self.ring.put((time.time(), addr, method, path, version, status,
+                       nbytes, latency, upstream, request_id))
+        if self._thread is None:
+            self.start()
+
+    def record_exchange(self, addr, request, response, nbytes, latency, upstream=None,
+                        request_id=None):
+        """
+        Log a relayed request from its raw messages.
+
+        :param addr (tuple): Address of the client.
+        :param request (bytes): The raw request, or at least its request line.
+        :param response (bytes): The raw response, or at least its status line.
+        :param nbytes (int): Bytes of the response, headers included.
+        :param latency (float): Seconds to answer the request.
+        :param upstream (str): ``host:port`` the request was forwarded to.
+        :param request_id (str): ID of the request, see ``X-Request-ID``.
+        """
+        line = request[:request.find(b"\r\n")].decode('latin-1').split()
+        method, path, version = (line + [None, None, None])[:3]
+        status = response[9:12].decode('ascii', 'replace')
+        self.record(addr, method, path, version, status, nbytes, latency, upstream,
+                    request_id)
+
+    def start(self):
+        """Start the writer thread, if not running yet."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.run, name="AccessLog",
+                                            daemon=True)
+            self._thread.start()
+
+    def run(self):
+        """Write the entries every ``flush_interval`` seconds."""
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """Write the pending entries as one block, then rotate if due."""
+        with self._lock:
+            entries = self.ring.drain()
+            if not entries:
+                return
+            block = "".join(format_entry(entry) for entry in entries)
+            try:
+                stream = self.open()
+                stream.write(block)
+                stream.flush()
+                if stream is not sys.stdout and self.rotation_due(stream):
+                    self.rotate()
+            except (OSError, ValueError):
+                # A failed write loses the block, never the request.
+                self.close()
+
+    def open(self):
+        """
+        The open log file, reopened when another process rotated it.
+
+        :rtype file: The stream to write to.
+        """
+        if self.path == "-":
+            return sys.stdout
+        if self._file is not None:
+            try:
+                if os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino:
+                    self.close()
+            except FileNotFoundError:
+                self.close()
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8", buffering=64 * 1024)
+            self._opened = time.time()
+        return self._file
+
+    def rotation_due(self, stream):
+        """
+        :rtype bool: True if the file reached ``max_bytes`` or
+                     ``rotate_interval``.
+        """
+        if self.max_bytes and stream.tell() >= self.max_bytes:
+            return True
+        if self.rotate_interval and time.time() - self._opened >= self.rotate_interval:
+            return True
+        return False
+
+    def rotate(self):
+        """Shift ``path.N`` to ``path.N+1``, ``path`` to ``path.1``, drop the oldest."""
+        self.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = "{}.{}".format(self.path, index)
+            if os.path.exists(source):
+                os.replace(source, "{}.{}".format(self.path, index + 1))
+        if self.backups > 0:
+            os.replace(self.path, "{}.1".format(self.path))
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        """Close the log file; the next write opens it again."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def stats(self):
+        """
+        :rtype dict: entries dropped because the writer fell behind.
+        """
+        return {"dropped": self.ring.dropped}
+
+
+def flush():
+    """Write the pending entries of every access log, e.g. before ``os._exit``."""
+    for access_log in _access_logs:
+        access_log.flush()
+
+
+atexit.register(flush)
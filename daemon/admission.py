@@ -0,0 +1,234 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.admission
+~~~~~~~~~~~~~~~~~
+
+This module provides the admission control of the backend and the proxy.
+Requests are let in through a :class:`Gate <Gate>` capping how many are
+processed at once; a request over the cap waits in the gate queue up to
+``queue_timeout`` seconds, then is shed with a prebuilt
+``503 Service Unavailable`` carrying ``Retry-After``. The admitted requests
+keep a bounded latency instead of every request slowing down together.
+
+:class:`Admission <Admission>` sorts the requests of the backend on two
+paths, each with its own gate:
+
+- ``expensive``: WeApRous hooks,
+- ``cheap``: static files and the built-in pages, not limited by default,
+  so they short-circuit the admission without taking any lock.
+
+Usage Example:
+--------------
+>>> admission = Admission(max_concurrency=16, queue_timeout=0.5)
+>>> gate = admission.gate(req)
+>>> if gate is not None and not gate.acquire():
+>>>     conn.sendall(admission.response)
+"""
+
+import threading
+import time
+
+#: Seconds a request over the cap may wait for a slot.
+QUEUE_TIMEOUT = 1.0
+
+#: Maximum number of requests waiting for a slot of a gate.
+MAX_QUEUED = 64
+
+#: Seconds advertised to shed clients in ``Retry-After``.
+RETRY_AFTER = 1
+
+
+def build_overload_response(retry_after=RETRY_AFTER):
+    """
+    Build the ``503 Service Unavailable`` response of shed requests.
+
+    :param retry_after (int): Seconds advertised in ``Retry-After``.
+
+    :rtype bytes: The encoded HTTP response.
+    """
+    return (
+        "HTTP/1.1 503 Service Unavailable\r\n"
+        "Content-Type: text/plain\r\n"
+        "Content-Length: 19\r\n"
+        "Retry-After: {}\r\n"
+        "Connection: close\r\n"
+        "\r\n"
+        "Service Unavailable"
+    ).format(retry_after).encode('utf-8')
+
+
+class Gate:
+    """
+    A concurrency limit with a bounded, deadline-limited waiting queue.
+
+    Attributes:
+        limit (int): Maximum number of requests processed at once.
+        max_queued (int): Maximum number of requests waiting for a slot.
+        queue_timeout (float): Seconds a request may wait for a slot.
+    """
+
+    __attrs__ = [
+        "limit",
+        "max_queued",
+        "queue_timeout",
+    ]
+
+    def __init__(self, limit, max_queued=MAX_QUEUED, queue_timeout=QUEUE_TIMEOUT):
+        """
+        :raise ValueError: If ``limit`` is not positive.
+        """
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+
+        # Live counters, guarded by ``_cond``.
+        self._active = 0
+        self._queued = 0
+        self._admitted = 0
+        self._shed = 0
+
+    def try_acquire(self):
+        """
+        Take a slot if one is free, without waiting nor counting a shed request.
+
+        :rtype bool: True if a slot was taken.
+        """
+        with self._cond:
+            if self._active < self.limit:
+                self._active += 1
+                self._admitted += 1
+                return True
+            return False
+
+    def acquire(self, timeout=None):
+        """
+        Take a slot, waiting in the queue while every slot is taken.
+
+        :param timeout (float): Seconds to wait, ``queue_timeout`` by default;
+                                0 sheds at once.
+
+        :rtype bool: True if a slot was taken, False if the request is shed.
+        """
+        if timeout is None:
+            timeout = self.queue_timeout
+        with self._cond:
+            if self._active < self.limit:
+                self._active += 1
+                self._admitted += 1
+                return True
+            if timeout <= 0 or self._queued >= self.max_queued:
+                self._shed += 1
+                return False
+
+            deadline = time.monotonic() + timeout
+            self._queued += 1
+            try:
+                while self._active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._shed += 1
+                        return False
+                    self._cond.wait(remaining)
+                self._active += 1
+                self._admitted += 1
+                return True
+            finally:
+                self._queued -= 1
+
+    def release(self):
+        """Free the slot of a finished request."""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def stats(self):
+        """
+        Snapshot of the live gate counters.
+
+        :rtype dict: slots in use, queue depth and request counters.
+        """
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "active": self._active,
+                "queued": self._queued,
+                "admitted": self._admitted,
+                "shed": self._shed,
+            }
+
+
+class Admission:
+    """
+    Admission control of a server: the gates of the expensive and the cheap
+    requests and the prebuilt response of the shed ones.
+
+    Attributes:
+        expensive (Gate): Gate of the WeApRous hooks, None when unlimited.
+        cheap (Gate): Gate of the other requests, None when unlimited.
+        response (bytes): Prebuilt ``503`` response of the shed requests.
+    """
+
+    __attrs__ = [
+        "expensive",
+        "cheap",
+        "response",
+    ]
+
+    def __init__(self, max_concurrency=None, max_static=None, max_queued=MAX_QUEUED,
+                 queue_timeout=QUEUE_TIMEOUT, retry_after=RETRY_AFTER):
+        """
+        Initialize a new Admission instance.
+
+        :param max_concurrency (int): Cap of the expensive requests, None for
+                                      no limit.
+        :param max_static (int): Cap of the cheap requests, None for no limit.
+        :param max_queued (int): Maximum number of waiting requests per gate.
+        :param queue_timeout (float): Seconds a request may wait for a slot.
+        :param retry_after (int): Seconds advertised to shed clients.
+        """
+        self.expensive = None
+        if max_concurrency:
+            self.expensive = Gate(max_concurrency, max_queued, queue_timeout)
+        self.cheap = None
+        if max_static:
+            self.cheap = Gate(max_static, max_queued, queue_timeout)
+        self.response = build_overload_response(retry_after)
+
+    def gate(self, req):
+        """
+        The gate a prepared request goes through.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+
+        :rtype Gate: The gate, None when the path is not limited.
+        """
+        if req.hook:
+            return self.expensive
+        return self.cheap
+
+    def stats(self):
+        """
+        Snapshot of the counters of the gates.
+
+        :rtype dict: counters of each limited path.
+        """
+        stats = {}
+        if self.expensive is not None:
+            stats["expensive"] = self.expensive.stats()
+        if self.cheap is not None:
+            stats["cheap"] = self.cheap.stats()
+        return stats
@@ -0,0 +1,320 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.aioserver
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``asyncio`` serving engine of the backend. All client
+connections are served on a single event loop with stream readers and writers
+instead of one OS thread per socket, which keeps mostly idle clients cheap.
+Connections are persistent, with the keep-alive rules and the idle, read
+and write deadlines of :meth:`HttpAdapter.handle_client <HttpAdapter.handle_client>`;
+an expired deadline aborts the transport from the timer wheel thread.
+
+Request handling reuses :class:`HttpAdapter <HttpAdapter>`:
+
+- Native ``async def`` WeApRous hooks are awaited directly on the loop, which
+  is also the :class:`HookLoop <HookLoop>` of the server.
+- Synchronous hooks and static files are dispatched in a thread pool
+  executor, so blocking handlers never stall the loop.
+
+Usage Example:
+--------------
+>>> run_asyncio_backend("127.0.0.1", 9000, routes={}, threads=8)
+"""
+
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .httpadapter import HttpAdapter
+from .prefork import listen_socket
+from .reader import MessageError, RECV_SIZE
+from .logger import get_logger
+
+log = get_logger("AsyncBackend")
+
+
+async def read_messages(reader, http_reader, deadline):
+    """
+    Read the complete request messages available on a stream.
+
+    :param reader (asyncio.StreamReader): Client stream reader.
+    :param http_reader (HttpReader): Incremental reader of the connection.
+    :param deadline (Deadline): Deadline of the connection, idle until the
+                                first byte of a message, then read.
+
+    :rtype list: The messages (bytes), empty on EOF.
+
+    :raise MessageError: if a message exceeds the limits or is malformed.
+    """
+    messages = http_reader.messages()
+    if messages:
+        return messages
+
+    if http_reader.pending:
+        deadline.reading()
+    else:
+        deadline.idle()
+    while not messages:
+        data = await reader.read(RECV_SIZE)
+        if not data:
+            return []
+        if deadline.kind == "idle":
+            deadline.reading()
+        http_reader.feed(data)
+        messages = http_reader.messages()
+    deadline.clear()
+    return messages
+
+
+async def admit(gate):
+    """
+    Take a slot of an admission gate; a request over the cap waits for one
+    in the default executor, off the loop.
+
+    :rtype bool: False if the request is shed.
+    """
+    if gate.try_acquire():
+        return True
+    return await asyncio.get_running_loop().run_in_executor(None, gate.acquire)
+
+
+async def handle_message(daemon, msg, routes, executor, served):
+    """
+    Answer one request message, awaiting native async hooks on the loop and
+    running everything else in the executor.
+
+    :rtype tuple: (bytes, bool) the framed response and whether the
+                  connection stays open. A streamed response is an iterator
+                  of bytes, its framed header first.
+    """
+    loop = asyncio.get_running_loop()
+    started = time.monotonic()
+    req, resp = daemon.new_exchange()
+    try:
+        daemon.mark(req, None)
+        req.prepare(msg, routes)
+        daemon.mark(req, "parse")
+        keep_alive = daemon.keep_alive(req) and served < daemon.max_requests
+        gate = daemon.gate(req)
+        if gate is not None and not await admit(gate):
+            keep_alive = False
+            response = daemon.admission.response
+        else:
+            try:
+                if req.hook and asyncio.iscoroutinefunction(req.hook):
+                    response, unwind = daemon.enter_hook(req, resp)
+                    if unwind is not None:
+                        try:
+                            hook_result = await daemon.call_hook(req)
+                        except Exception as e:
+                            response = daemon.leave_hook(req, resp, unwind, error=e)
+                        else:
+                            response = daemon.leave_hook(req, resp, unwind, hook_result)
+                else:
+                    response = await loop.run_in_executor(executor, daemon.dispatch,
+                                                          req, resp)
+            finally:
+                if gate is not None:
+                    gate.release()
+    except Exception as e:
+        log.error("Error processing request: {}", e)
+        keep_alive = False
+        response = daemon.build_error_response(500, "Internal Server Error")
+        resp.stream = None
+
+    response = daemon.frame_response(response, keep_alive, served, req)
+    stream = daemon.observe(req, response, resp.stream, started)
+    if stream is not None:
+        response = itertools.chain((response,), stream)
+    daemon.recycle()
+    return response, keep_alive
+
+
+async def drain(writer, deadline):
+    """Wait for the written data to be sent, under the write deadline."""
+    deadline.writing()
+    try:
+        await writer.drain()
+    finally:
+        deadline.clear()
+
+
+async def send_stream(writer, stream, executor, deadline):
+    """
+    Write a streamed response chunk by chunk. The chunks are produced in the
+    executor, since the generator may block, and each one is drained before
+    the next is produced.
+
+    :rtype bool: False if the stream failed and the connection must close.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            chunk = await loop.run_in_executor(executor, next, stream, None)
+            if chunk is None:
+                return True
+            writer.write(chunk)
+            await drain(writer, deadline)
+    except ConnectionError:
+        return False
+    except Exception as e:
+        log.error("Error streaming response: {}", e)
+        return False
+
+
+async def handle_stream(reader, writer, ip, port, routes, executor, adapters=None,
+                        **settings):
+    """
+    Serve one persistent client connection on the event loop.
+
+    :param reader (asyncio.StreamReader): Client stream reader.
+    :param writer (asyncio.StreamWriter): Client stream writer.
+    :param ip (str): IP address of the server.
+    :param port (int): Port number the server is listening on.
+    :param routes (dict): Dictionary of route handlers.
+    :param executor (Executor): Executor running the synchronous handlers.
+    :param adapters (ObjectPool): Pool of recycled adapters, if any.
+    :param settings: Connection settings of :class:`HttpAdapter <HttpAdapter>`.
+    """
+    loop = asyncio.get_running_loop()
+    addr = writer.get_extra_info("peername")
+    if adapters is not None:
+        daemon = adapters.acquire()
+        daemon.connaddr = addr
+    else:
+        daemon = HttpAdapter(ip, port, None, addr, routes, **settings)
+    deadline = daemon.deadline
+    deadline.on_expire = lambda: loop.call_soon_threadsafe(expire, writer, deadline)
+    served = 0
+    keep_alive = True
+
+    while keep_alive:
+        try:
+            batch = await read_messages(reader, daemon.reader, deadline)
+        except MessageError as e:
+            log.warning("Rejected request from {}: {}", addr, e)
+            writer.write(e.response)
+            break
+        except ConnectionError:
+            break
+        if not batch:
+            break
+
+        for msg in batch:
+            served += 1
+            response, keep_alive = await handle_message(
+                daemon, msg, routes, executor, served)
+            if isinstance(response, bytes):
+                writer.write(response)
+            elif not await send_stream(writer, response, executor, deadline):
+                keep_alive = False
+            if not keep_alive:
+                break
+
+        try:
+            await drain(writer, deadline)
+        except ConnectionError as e:
+            log.warning("Error writing to {}: {}", addr, e)
+            break
+
+    deadline.clear()
+    writer.close()
+    if adapters is not None:
+        adapters.release(daemon)
+
+
+def expire(writer, deadline):
+    """Deadline callback, on the loop: abort the connection."""
+    log.info("Closing {} after {} timeout",
+             writer.get_extra_info("peername"), deadline.kind)
+    writer.transport.abort()
+
+
+async def serve(ip, port, routes, executor, reuse_port=False, adapters=None, **settings):
+    """
+    Start the asyncio server and serve forever.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param executor (Executor): Executor running the synchronous handlers.
+    :param reuse_port (bool): Bind with ``SO_REUSEPORT``.
+    :param adapters (ObjectPool): Pool of recycled adapters, if any.
+    :param settings: Connection settings of :class:`HttpAdapter <HttpAdapter>`.
+    """
+    handoff = settings.get("handoff")
+    hook_loop = settings.get("hook_loop")
+    if hook_loop is not None:
+        # The async hooks share the serving loop.
+        hook_loop.use(asyncio.get_running_loop())
+
+    async def on_connect(reader, writer):
+        if handoff is None:
+            await handle_stream(reader, writer, ip, port, routes, executor, adapters,
+                                **settings)
+            return
+        with handoff.track():
+            await handle_stream(reader, writer, ip, port, routes, executor, adapters,
+                                **settings)
+
+    if handoff is not None:
+        sock = handoff.listen(ip, port, reuse_port)
+    else:
+        sock = listen_socket(ip, port, reuse_port)
+    server = await asyncio.start_server(on_connect, sock=sock)
+    log.info("Listening on port {}", port)
+    if routes != {}:
+        log.info("route settings {}", routes)
+
+    loop = asyncio.get_running_loop()
+    if handoff is not None:
+        # Stop accepting once the listening socket is handed over.
+        handoff.on_handoff(lambda: loop.call_soon_threadsafe(server.close))
+
+    async with server:
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            if handoff is None or not handoff.draining.is_set():
+                raise
+    # Keep serving the in-flight connections while draining.
+    await loop.run_in_executor(None, handoff.wait_drained)
+
+
+def run_asyncio_backend(ip, port, routes, threads=8, reuse_port=False, adapters=None,
+                        **settings):
+    """
+    Run the backend on an asyncio event loop.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param threads (int): Size of the executor running synchronous handlers.
+    :param reuse_port (bool): Bind with ``SO_REUSEPORT``.
+    :param adapters (ObjectPool): Pool of recycled adapters, if any.
+    :param settings: Connection settings of :class:`HttpAdapter <HttpAdapter>`
+                     (``idle_timeout``, ``max_requests``, ``max_header_size``,
+                     ``max_body_size``, ``read_timeout``, ``write_timeout``,
+                     ``wheel``, ``handoff``, ``admission``, ``object_pool``).
+    """
+    executor = ThreadPoolExecutor(max_workers=threads,
+                                  thread_name_prefix="backend-executor")
+    try:
+        asyncio.run(serve(ip, port, routes, executor, reuse_port, adapters, **settings))
+    except OSError as e:
+        log.error("Socket error: {}", e)
+    finally:
+        executor.shutdown(wait=False)
@@ -31,12 +31,35 @@ Requirements:
 Notes:
 ------
 - The server create daemon threads for client handling.
+- With ``engine="pool"`` a fixed :class:`WorkerPool <WorkerPool>` drains a bounded
+  accept queue instead, applying its overload policy when the queue is full.
+- With ``engine="asyncio"`` all connections are served on one event loop, see
+  :mod:`daemon.aioserver`.
+- With ``engine="selectors"`` all connections are served by a non-blocking
+  reactor thread, see :mod:`daemon.reactor`.
+- Every connection is under an idle, read or write deadline enforced by a
+  :class:`TimerWheel <TimerWheel>`, which closes slow or stalled clients,
+  see :mod:`daemon.timers`.
+- With ``max_concurrency=N`` at most N WeApRous hooks run at once (and
+  ``max_static`` static requests); requests over the cap wait up to
+  ``queue_timeout`` seconds, then are shed with ``503``, see
+  :mod:`daemon.admission`. The ``selectors`` engine never waits for a slot:
+  its hooks run in an executor and on the hook loop, and a request over the
+  cap is shed at once.
+- With ``handoff=path`` the listening socket is handed to the next process
+  started with the same path, which restarts the server without refusing
+  connections, see :mod:`daemon.handoff`.
+- With ``workers=N`` (N > 1) :func:`create_backend` forks N worker processes,
+  each listening with ``SO_REUSEPORT``, under a :class:`Supervisor <Supervisor>`,
+  see :mod:`daemon.prefork`.
 - The current implementation error handling is minimal, socket errors are printed to the console.
 - The actual request processing is delegated to the HttpAdapter class.
 
 Usage Example:
 --------------
 >>> create_backend("127.0.0.1", 9000, routes={})
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="pool", threads=16)
+>>> create_backend("127.0.0.1", 9000, routes={}, workers=4)
 
 """
 
@@ -45,63 +68,282 @@ import threading
 import argparse
 
 from .response import *
-from .httpadapter import HttpAdapter
+from .httpadapter import HttpAdapter, IDLE_TIMEOUT, MAX_REQUESTS
+from .reader import MAX_HEADER_SIZE, MAX_BODY_SIZE
 from .dictionary import CaseInsensitiveDict
+from .workerpool import WorkerPool
+from .aioserver import run_asyncio_backend
+from .reactor import run_reactor_backend
+from .prefork import Supervisor, listen_socket
+from .handoff import Handoff, DRAIN_TIMEOUT
+from .timers import TimerWheel, READ_TIMEOUT, WRITE_TIMEOUT
+from .admission import Admission, QUEUE_TIMEOUT
+from .objectpool import ObjectPool
+from .accesslog import AccessLog, MAX_BYTES as ACCESS_LOG_MAX_BYTES
+from .metrics import Metrics
+from .profiler import Profiler
+from .hookloop import HookLoop
+from .middleware import Pipeline
+from .logger import get_logger
 
-def handle_client(ip, port, conn, addr, routes):
+log = get_logger("Backend")
+
+#: Serving engines supported by :func:`run_backend`.
+ENGINES = ("threaded", "pool", "asyncio", "selectors")
+
+def handle_client(ip, port, conn, addr, routes, adapters=None, **settings):
     """
     Initializes an HttpAdapter instance and delegates the client handling logic to it.
+    With an adapter pool, a recycled adapter of the worker thread is used instead.
 
     :param ip (str): IP address of the server.
     :param port (int): Port number the server is listening on.
     :param conn (socket.socket): Client connection socket.
     :param addr (tuple): client address (IP, port).
     :param routes (dict): Dictionary of route handlers.
+    :param adapters (ObjectPool): Pool of recycled adapters, if any.
+    :param settings: Connection settings of :class:`HttpAdapter <HttpAdapter>`
+                     (``idle_timeout``, ``max_requests``, ``max_header_size``,
+                     ``max_body_size``, ``read_timeout``, ``write_timeout``,
+                     ``wheel``, ``handoff``, ``admission``, ``object_pool``,
+                     ``access_log``, ``metrics``, ``profiler``,
+                     ``server_timing``, ``hook_loop``, ``pipeline``).
     """
-    daemon = HttpAdapter(ip, port, conn, addr, routes)
+    if adapters is not None:
+        daemon = adapters.acquire()
+        try:
+            daemon.handle_client(conn, addr, routes)
+        finally:
+            adapters.release(daemon)
+        return
+
+    daemon = HttpAdapter(ip, port, conn, addr, routes, **settings)
 
     # Handle client
     daemon.handle_client(conn, addr, routes)
 
-def run_backend(ip, port, routes):
+def run_backend(ip, port, routes, engine="threaded", threads=8, queue_size=64,
+                overload="block", pool=None, idle_timeout=IDLE_TIMEOUT,
+                max_requests=MAX_REQUESTS, max_header_size=MAX_HEADER_SIZE,
+                max_body_size=MAX_BODY_SIZE, reuse_port=False, handoff=None,
+                drain_timeout=DRAIN_TIMEOUT, read_timeout=READ_TIMEOUT,
+                write_timeout=WRITE_TIMEOUT, wheel=None, max_concurrency=None,
+                max_static=None, queue_timeout=QUEUE_TIMEOUT, admission=None,
+                object_pool=False, access_log=None,
+                access_log_max_bytes=ACCESS_LOG_MAX_BYTES, access_log_rotate=None,
+                metrics=None, profiler=None, server_timing=True, middleware=None):
     """
     Starts the backend server, binds to the specified IP and port, and listens for incoming
     connections. Each connection is handled in a separate thread. The backend accepts incoming
     connections and spawns a thread for each client.
 
+    With ``engine="pool"`` the connections are queued to a fixed-size
+    :class:`WorkerPool <WorkerPool>` instead. A caller that wants to read the
+    live counters can build the pool itself and pass it as ``pool``.
+
+    With ``engine="asyncio"`` the connections are served on one event loop and
+    ``threads`` sizes the executor running synchronous handlers. With
+    ``engine="selectors"`` they are served by the non-blocking reactor, and
+    the WeApRous hooks run off the reactor thread, the synchronous ones on
+    ``threads`` executor threads.
+
+    Native ``async def`` hooks run on one :class:`HookLoop <HookLoop>` per
+    process: the serving loop of the ``asyncio`` engine, a loop thread of
+    their own with the other engines.
+
+    The deadlines of the connections are enforced by a
+    :class:`TimerWheel <TimerWheel>`; a caller that wants to read the reaped
+    counters can build the wheel itself and pass it as ``wheel``.
+
+    With ``max_concurrency`` or ``max_static`` the requests go through an
+    :class:`Admission <Admission>` control, which may also be prebuilt and
+    passed as ``admission``.
+
+    With ``object_pool`` the request, response and adapter objects are
+    recycled through per-worker pools (worker threads of the ``pool``
+    engine, the loop of ``asyncio``, the reactor of ``selectors``); the
+    ``threaded`` engine, with one short-lived thread per connection, only
+    recycles the request and response objects.
+
+    With ``access_log`` every request is logged by an
+    :class:`AccessLog <AccessLog>`, one per process. With ``metrics`` the
+    latencies and counters of every route are served on that path, e.g.
+    ``/metrics``; each worker process serves its own. With ``profiler`` a
+    sampling profiler of the process is started and read through the admin
+    routes below that path, e.g. ``/debug/profile``.
 
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict): Dictionary of route handlers.
+    :param engine (str): Serving engine, ``threaded``, ``pool``, ``asyncio``
+                        or ``selectors``.
+    :param threads (int): Number of pool worker threads (``pool`` engine) or
+                          executor threads (``asyncio`` and ``selectors``
+                          engines).
+    :param queue_size (int): Accept queue capacity (``pool`` engine only).
+    :param overload (str): Overload policy ``block``, ``reject`` or ``drop``
+                           (``pool`` engine only).
+    :param pool (WorkerPool): Prebuilt pool, overrides the sizing arguments.
+    :param idle_timeout (float): Seconds a persistent connection may stay idle.
+    :param max_requests (int): Maximum number of requests per connection.
+    :param max_header_size (int): Limit of a request line and headers.
+    :param max_body_size (int): Limit of a request body.
+    :param reuse_port (bool): Bind with ``SO_REUSEPORT``, so that several
+                              processes can listen on the same port.
+    :param handoff (str): Path of the Unix socket on which the listening
+                          socket is taken over from the previous process and
+                          handed over to the next one.
+    :param drain_timeout (float): Seconds to drain the connections after the
+                                  handoff.
+    :param read_timeout (float): Seconds to receive a whole request once its
+                                 first byte arrived.
+    :param write_timeout (float): Seconds a response write may stay blocked.
+    :param wheel (TimerWheel): Prebuilt timer wheel of the deadlines.
+    :param max_concurrency (int): Cap of the WeApRous hooks running at once.
+    :param max_static (int): Cap of the other requests processed at once.
+    :param queue_timeout (float): Seconds a request over a cap may wait.
+    :param admission (Admission): Prebuilt admission control, overrides the
+                                  caps.
+    :param object_pool (bool): Recycle the request, response and adapter
+                               objects.
+    :param access_log (str): File of the access log, ``-`` for stdout; or a
+                             prebuilt :class:`AccessLog <AccessLog>`.
+    :param access_log_max_bytes (int): Size past which the access log is rotated.
+    :param access_log_rotate (float): Seconds after which the access log is
+                                      rotated.
+    :param metrics (str): Path on which the metrics are served; or prebuilt
+                          :class:`Metrics <Metrics>`.
+    :param profiler (str): Prefix of the profiler admin routes; or a prebuilt
+                           :class:`Profiler <Profiler>`.
+    :param server_timing (bool): Add a ``Server-Timing`` header with the
+                                 parse, route, handler and serialize phases
+                                 to the responses.
+    :param middleware (Middleware): Middleware of the app, compiled here with
+                                    the metrics, profiler and the middleware
+                                    of each route into a :class:`Pipeline <Pipeline>`.
     """
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if engine not in ENGINES:
+        raise ValueError("Invalid backend engine: {}".format(engine))
+
+    if handoff is not None:
+        handoff = Handoff(handoff, drain_timeout)
+    if wheel is None:
+        wheel = TimerWheel()
+    if admission is None and (max_concurrency or max_static):
+        admission = Admission(max_concurrency, max_static,
+                              queue_timeout=queue_timeout)
+    if isinstance(access_log, str):
+        access_log = AccessLog(access_log, access_log_max_bytes, access_log_rotate)
+    if isinstance(metrics, str):
+        metrics = Metrics(metrics)
+    if isinstance(profiler, str):
+        profiler = Profiler(profiler)
+
+    settings = {
+        "idle_timeout": idle_timeout,
+        "max_requests": max_requests,
+        "max_header_size": max_header_size,
+        "max_body_size": max_body_size,
+        "handoff": handoff,
+        "read_timeout": read_timeout,
+        "write_timeout": write_timeout,
+        "wheel": wheel,
+        "admission": admission,
+        "object_pool": object_pool,
+        "access_log": access_log,
+        "metrics": metrics,
+        "profiler": profiler,
+        "server_timing": server_timing,
+        "hook_loop": HookLoop(),
+        "pipeline": Pipeline(routes, middleware, metrics, profiler),
+    }
+
+    adapters = None
+    if object_pool and engine != "threaded":
+        adapters = ObjectPool(lambda: HttpAdapter(ip, port, None, None, routes, **settings))
+
+    if engine == "selectors":
+        # The reactor advances the wheel from its own loop.
+        run_reactor_backend(ip, port, routes, reuse_port, adapters, threads=threads,
+                            **settings)
+        return
+
+    wheel.start()
+    if engine == "asyncio":
+        run_asyncio_backend(ip, port, routes, threads, reuse_port, adapters, **settings)
+        return
+
+    if engine == "pool":
+        if pool is None:
+            pool = WorkerPool(threads, queue_size, overload)
+        pool.start(lambda conn, addr: handle_client(ip, port, conn, addr, routes,
+                                                    adapters, **settings))
+    else:
+        pool = None
 
     try:
-        server.bind((ip, port))
-        server.listen(50)
-        print("[Backend] Listening on port {}".format(port))
+        if handoff is not None:
+            server = handoff.listen(ip, port, reuse_port)
+        else:
+            server = listen_socket(ip, port, reuse_port)
+        log.info("Listening on port {}", port)
         if routes != {}:
-            print("[Backend] route settings {}".format(routes))
+            log.info("route settings {}", routes)
+        if pool is not None:
+            log.info("worker pool of {} workers, queue {} ({})",
+                     pool.workers, pool.queue_size, pool.overload)
 
         while True:
             conn, addr = server.accept()
+            if handoff is not None and handoff.draining.is_set():
+                # Handed over while blocked in accept: serve this last
+                # connection, the handoff thread ends the process once
+                # the others are drained.
+                handle_client(ip, port, conn, addr, routes, **settings)
+                handoff.wait_drained()
+                return
+            if pool is not None:
+                pool.submit(conn, addr)
+                continue
+
             # Create a new thread for each client connection
             client_thread = threading.Thread(
                 target=handle_client,
-                args=(ip, port, conn, addr, routes)
+                args=(ip, port, conn, addr, routes),
+                kwargs=settings
             )
             client_thread.daemon = True  # Thread will die when main program exits
             client_thread.start()
     except socket.error as e:
-      print("Socket error: {}".format(e))
+      log.error("Socket error: {}", e)
 
-def create_backend(ip, port, routes={}):
+def create_backend(ip, port, routes={}, workers=1, **options):
     """
     Entry point for creating and running the backend server.
 
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict, optional): Dictionary of route handlers. Defaults to empty dict.
+    :param workers (int): Number of worker processes. With more than one, each
+                          process runs :func:`run_backend` on its own
+                          ``SO_REUSEPORT`` socket under a supervisor. Not
+                          combined with ``handoff``.
+    :param options: Engine options forwarded to :func:`run_backend`
+                    (``engine``, ``threads``, ``queue_size``, ``overload``, ``pool``,
+                    ``idle_timeout``, ``max_requests``, ``max_header_size``,
+                    ``max_body_size``, ``read_timeout``, ``write_timeout``,
+                    ``wheel``, ``handoff``, ``drain_timeout``,
+                    ``max_concurrency``, ``max_static``, ``queue_timeout``,
+                    ``admission``, ``object_pool``, ``access_log``,
+                    ``access_log_max_bytes``, ``access_log_rotate``, ``metrics``,
+                    ``profiler``, ``server_timing``, ``middleware``).
     """
 
-    run_backend(ip, port, routes)
\ No newline at end of file
+    if workers > 1:
+        if options.get("handoff"):
+            raise ValueError("handoff requires a single worker process")
+        Supervisor(lambda: run_backend(ip, port, routes, reuse_port=True, **options),
+                   workers, name="backend").run()
+        return
+
+    run_backend(ip, port, routes, **options)
\ No newline at end of file
@@ -0,0 +1,128 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.context
+~~~~~~~~~~~~~~~~~
+
+This module provides the request context given to the WeApRous handlers
+declaring a ``request`` parameter, in place of the ``headers`` string and
+the decoded ``body`` of the former calling convention.
+
+Nothing is copied: the context reads the prepared
+:class:`Request <Request>`, whose headers, cookies, query, form and JSON
+body are parsed on first access.
+
+Usage::
+
+  >>> @app.route('/channels/<channel>/messages', methods=['POST'])
+  >>> def post_message(request, channel):
+  >>>     user = request.cookies.get('user')
+  >>>     text = request.json['message']
+  >>>     return json.dumps({'status': 'queued'}), 202, {'Location': '/channels/' + channel}
+"""
+
+from .utils import new_request_id
+
+
+class Context:
+    """
+    Read-only view of a request for a handler.
+
+    Attributes:
+        method (str): Method of the request.
+        path (str): Path, without the query string.
+        headers (Headers): Header fields, by lowercase name.
+        cookies (dict): Cookies of the Cookie header.
+        query (QueryDict): Parameters of the query string.
+        params (dict): Parameters of the route path.
+        body (bytes): The raw body.
+        text (str): The body decoded as UTF-8.
+        json: The JSON body, None without a body.
+        form (dict): Fields of a form body.
+        request_id (str): ID of the request.
+    """
+
+    __attrs__ = [
+        "method",
+        "path",
+        "headers",
+        "cookies",
+        "query",
+        "params",
+        "body",
+        "text",
+        "json",
+        "form",
+        "request_id",
+    ]
+
+    __slots__ = ("_request",)
+
+    def __init__(self, request):
+        """
+        :param request (Request): The prepared :class:`Request <Request>`.
+        """
+        self._request = request
+
+    @property
+    def method(self):
+        return self._request.method
+
+    @property
+    def path(self):
+        return self._request.path.partition('?')[0]
+
+    @property
+    def headers(self):
+        return self._request.headers
+
+    @property
+    def cookies(self):
+        return self._request.cookies
+
+    @property
+    def query(self):
+        return self._request.query
+
+    @property
+    def params(self):
+        return self._request.params or {}
+
+    @property
+    def body(self):
+        return self._request.body
+
+    @property
+    def text(self):
+        return self._request.body.decode('utf-8', 'replace')
+
+    @property
+    def json(self):
+        """
+        :raise ValueError: if the body is not valid JSON.
+        """
+        return self._request.json
+
+    @property
+    def form(self):
+        return self._request.form
+
+    @property
+    def request_id(self):
+        """The ID of the X-Request-ID header, drawn here when absent."""
+        if self._request.request_id is None:
+            self._request.request_id = new_request_id()
+        return self._request.request_id
+
+    def __repr__(self):
+        return "<Context {} {}>".format(self.method, self._request.path)
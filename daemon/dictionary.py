@@ -10,9 +10,14 @@
 #
 
 try:
-    from collections.abc import MutableMapping
+    from collections.abc import Mapping, MutableMapping
 except ImportError:
-    from collections import MutableMapping
+    from collections import Mapping, MutableMapping
+
+try:
+    from urllib.parse import parse_qsl
+except ImportError:
+    from urlparse import parse_qsl
 
 class CaseInsensitiveDict(MutableMapping):
     """The :class:`CaseInsensitiveDict<MutableMapping>` object, which 
@@ -51,4 +56,78 @@ class CaseInsensitiveDict(MutableMapping):
         return iter(self.store)
 
     def __len__(self):
-        return len(self.store)
\ No newline at end of file
+        return len(self.store)
+
+
+class QueryDict(Mapping):
+    """The :class:`QueryDict<Mapping>` object, the parameters of a query
+    string, percent-decoded. A name may repeat: item access returns its
+    last value, :meth:`getlist` all of them.
+
+    Usage::
+
+      >>> query = QueryDict("channel=general&limit=20&tag=a&tag=b%20c")
+      >>> query['channel']
+      'general'
+      >>> query.get('limit', 50, type=int)
+      20
+      >>> query.get('channel', 0, type=int)     # a bad value gives the default
+      0
+      >>> query.getlist('tag')
+      ['a', 'b c']
+
+    """
+
+    def __init__(self, query=""):
+        self.store = {}
+        for name, value in parse_qsl(query, keep_blank_values=True):
+            self.store.setdefault(name, []).append(value)
+
+    def __getitem__(self, key):
+        return self.store[key][-1]
+
+    def __iter__(self):
+        return iter(self.store)
+
+    def __len__(self):
+        return len(self.store)
+
+    def get(self, key, default=None, type=None):
+        """
+        The last value of ``key``, converted by ``type`` if given.
+
+        :param key (str): Parameter name.
+        :param default: Returned when the parameter is absent, or when
+                        ``type`` raises ValueError or TypeError on its value.
+        :param type (callable): Converter of the value, e.g. ``int``.
+        """
+        values = self.store.get(key)
+        if not values:
+            return default
+        if type is None:
+            return values[-1]
+        try:
+            return type(values[-1])
+        except (ValueError, TypeError):
+            return default
+
+    def getlist(self, key, type=None):
+        """
+        All the values of ``key``, in order; those ``type`` rejects are
+        left out.
+
+        :rtype list:
+        """
+        values = self.store.get(key, [])
+        if type is None:
+            return list(values)
+        converted = []
+        for value in values:
+            try:
+                converted.append(type(value))
+            except (ValueError, TypeError):
+                pass
+        return converted
+
+    def __repr__(self):
+        return repr(dict(self.items()))
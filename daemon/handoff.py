@@ -0,0 +1,213 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.handoff
+~~~~~~~~~~~~~~~~~
+
+This module provides the zero-downtime restart of a server process. The
+listening socket is never closed across a redeploy: the running process
+hands its file descriptor to its successor over a Unix socket
+(``SCM_RIGHTS``), so connections queued by the kernel in the meantime are
+accepted by the new process instead of being refused.
+
+The sequence, with both processes started with the same handoff path:
+
+1. The new process connects to the path and receives the listening socket.
+   When nobody answers on the path, it binds the address itself.
+2. The old process stops accepting, answers its in-flight requests with
+   ``Connection: close`` and exits once its connections are closed, or
+   after ``drain_timeout`` seconds.
+3. The new process serves the path for the next deploy.
+
+Usage Example:
+--------------
+>>> handoff = Handoff("/tmp/chatapp.sock")
+>>> server = handoff.listen("0.0.0.0", 8001)
+"""
+
+import contextlib
+import os
+import socket
+import sys
+import threading
+import time
+
+from .prefork import listen_socket
+from .accesslog import flush as flush_access_log
+from .logger import get_logger, flush as flush_log
+
+log = get_logger("Handoff")
+
+#: Seconds the old process waits for its in-flight connections to close.
+DRAIN_TIMEOUT = 30
+
+
+class Handoff:
+    """
+    Listening socket of a process, handed over to its successor on request.
+
+    Attributes:
+        path (str): Path of the Unix socket the successor connects to.
+        drain_timeout (float): Seconds to wait for the in-flight connections
+                               once the listening socket is handed over.
+        draining (threading.Event): Set once the listening socket is handed
+                                    over; no new connection is accepted and
+                                    the open ones are closed after their
+                                    current request.
+        active (int): Number of open connections.
+    """
+
+    __attrs__ = [
+        "path",
+        "drain_timeout",
+        "draining",
+        "active",
+    ]
+
+    def __init__(self, path, drain_timeout=DRAIN_TIMEOUT):
+        self.path = path
+        self.drain_timeout = drain_timeout
+        self.draining = threading.Event()
+        self.active = 0
+        #: The listening socket of the process.
+        self.server = None
+        #: Called once the listening socket is handed over.
+        self._callbacks = []
+        #: Guards ``active`` and signals when it drops to zero.
+        self._idle = threading.Condition()
+
+    def listen(self, ip, port, reuse_port=False):
+        """
+        Take over the listening socket of the previous process, or bind
+        the address when there is none, then wait for a successor.
+
+        :param ip (str): IP address to bind.
+        :param port (int): Port number to listen on.
+        :param reuse_port (bool): Bind with ``SO_REUSEPORT``.
+
+        :rtype socket.socket: The (blocking) listening socket.
+        """
+        server = self.receive()
+        if server is None:
+            server = listen_socket(ip, port, reuse_port)
+        else:
+            log.info("Took over the listening socket from {}", self.path)
+        self.server = server
+
+        thread = threading.Thread(target=self.serve, name="handoff")
+        thread.daemon = True
+        thread.start()
+        return server
+
+    def receive(self):
+        """
+        Ask the process serving ``path`` for its listening socket.
+
+        :rtype socket.socket: The received socket, None when no process
+                              answers on the path.
+        """
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(self.path)
+            _, fds, _, _ = socket.recv_fds(client, 16, 1)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        finally:
+            client.close()
+        if not fds:
+            return None
+
+        server = socket.socket(fileno=fds[0])
+        # The previous engine may have left the shared descriptor non-blocking.
+        server.setblocking(True)
+        return server
+
+    def serve(self):
+        """Wait for a successor, hand the listening socket over and drain."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        unix = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        unix.bind(self.path)
+        unix.listen(1)
+
+        conn, _ = unix.accept()
+        # Stop accepting before the successor may change the descriptor mode.
+        self.draining.set()
+        for callback in self._callbacks:
+            callback()
+        with conn:
+            socket.send_fds(conn, [b"L"], [self.server.fileno()])
+        # The successor binds the path again, it must not be unlinked.
+        unix.close()
+
+        log.info("Listening socket handed over, draining {} connections", self.active)
+        drained = self.wait_drained()
+        log.info("{} exiting", "Drained," if drained else "Drain timeout,")
+        flush_access_log()
+        flush_log()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(0)
+
+    def on_handoff(self, callback):
+        """
+        Register a callback run (from the handoff thread) when the listening
+        socket is handed over, e.g. to stop an accept loop.
+        """
+        self._callbacks.append(callback)
+
+    def opened(self):
+        """Count a new connection."""
+        with self._idle:
+            self.active += 1
+
+    def closed(self):
+        """Count a closed connection."""
+        with self._idle:
+            self.active -= 1
+            if self.active <= 0:
+                self._idle.notify_all()
+
+    @contextlib.contextmanager
+    def track(self):
+        """
+        Context manager counting a connection while it is open.
+
+        Usage::
+
+          >>> with handoff.track():
+          >>>     serve(conn)
+        """
+        self.opened()
+        try:
+            yield self
+        finally:
+            self.closed()
+
+    def wait_drained(self):
+        """
+        Wait for the open connections to close, at most ``drain_timeout``.
+
+        :rtype bool: True if every connection closed in time.
+        """
+        deadline = time.time() + self.drain_timeout
+        with self._idle:
+            while self.active > 0:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
@@ -0,0 +1,125 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.hookloop
+~~~~~~~~~~~~~~~~~
+
+This module provides the event loop on which a backend runs its native
+``async def`` WeApRous hooks, one per server process.
+
+The ``asyncio`` engine lends its own serving loop; the other engines get a
+loop started on a background thread at the first coroutine hook. Either
+way, every coroutine of the process shares that loop, so the clients and
+connection pools a handler keeps between requests stay usable, and any
+number of handlers can be waiting at once without a thread each.
+
+Usage Example:
+--------------
+>>> loop = HookLoop()
+>>> future = loop.submit(fetch_peer("alice"))      # concurrent.futures.Future
+>>> loop.run(fetch_peer("bob"), timeout=5)          # blocks the calling thread
+"""
+
+import asyncio
+import threading
+
+from .logger import get_logger
+
+log = get_logger("HookLoop")
+
+
+class HookLoop:
+    """
+    Event loop of the coroutine hooks of a server.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The loop, None until started.
+        owned (bool): Whether the loop runs on a thread of its own, rather
+                      than being lent by the serving engine.
+    """
+
+    __attrs__ = [
+        "loop",
+        "owned",
+    ]
+
+    def __init__(self):
+        self.loop = None
+        self.owned = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def use(self, loop):
+        """
+        Run the hooks on ``loop``, the running loop of the serving engine.
+
+        :param loop (asyncio.AbstractEventLoop): The serving loop.
+        """
+        with self._lock:
+            self.loop = loop
+            self.owned = False
+
+    def start(self):
+        """Start the loop thread, unless a loop is already set."""
+        with self._lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name="HookLoop", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self.loop = loop
+            self.owned = True
+        log.info("Event loop of the async hooks started")
+
+    def submit(self, coro):
+        """
+        Schedule ``coro`` on the loop, from any other thread.
+
+        :param coro (coroutine): The coroutine returned by a hook.
+
+        :rtype concurrent.futures.Future: Its result.
+        """
+        if self.loop is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """
+        Run ``coro`` on the loop and wait for its result in the calling
+        thread, which must not be the loop's.
+
+        :param coro (coroutine): The coroutine returned by a hook.
+        :param timeout (float): Seconds to wait, None for no limit.
+
+        :raise concurrent.futures.TimeoutError: if ``timeout`` elapses.
+        """
+        return self.submit(coro).result(timeout)
+
+    def stop(self):
+        """Stop the owned loop thread; a lent loop is left running."""
+        with self._lock:
+            loop, thread, owned = self.loop, self._thread, self.owned
+            self.loop = None
+            self._thread = None
+        if owned and loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
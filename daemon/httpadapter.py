@@ -20,9 +20,44 @@ raw URL paths and RESTful route definitions, and integrates with
 Request and Response objects to handle client-server communication.
 """
 
+import asyncio
+import inspect
+import itertools
+import time
+
 from .request import Request
-from .response import Response
+from .context import Context
+from .response import Response, error_response
+from .middleware import EMPTY, Pipeline
 from .dictionary import CaseInsensitiveDict
+from .objectpool import ObjectPool
+from .reader import HttpReader, MessageError, MAX_HEADER_SIZE, MAX_BODY_SIZE
+from .timers import Deadline, READ_TIMEOUT, WRITE_TIMEOUT, shutdown
+from .utils import frame_response, new_request_id, server_timing
+from .logger import get_logger
+
+log = get_logger("HttpAdapter")
+
+#: Seconds a persistent connection may stay idle between requests.
+IDLE_TIMEOUT = 5
+
+#: Maximum number of requests served on one persistent connection.
+MAX_REQUESTS = 100
+
+#: Route label in the metrics of the files served without a route.
+STATIC_ROUTE = "static"
+
+#: Route label in the metrics of the other requests without a route.
+UNMATCHED_ROUTE = "unmatched"
+
+#: Per-worker pools of the request and response objects, used by the
+#: adapters built with ``object_pool=True``.
+REQUESTS = ObjectPool(Request)
+RESPONSES = ObjectPool(Response)
+
+#: Middleware chains of the adapters built without a pipeline: the login of
+#: the static site only.
+PIPELINE = Pipeline()
 
 class HttpAdapter:
     """
@@ -42,6 +77,36 @@ class HttpAdapter:
         routes (dict): Mapping of route paths to handler functions.
         request (Request): Request object for parsing incoming data.
         response (Response): Response object for building and sending replies.
+        idle_timeout (float): Seconds a persistent connection may stay idle.
+        max_requests (int): Maximum number of requests per connection.
+        reader (HttpReader): Incremental reader of the request messages.
+        handoff (Handoff): Listening socket handoff of the process, if any;
+                           connections are closed after their current
+                           request once it is draining.
+        read_timeout (float): Seconds to receive a whole request.
+        write_timeout (float): Seconds a response write may stay blocked.
+        wheel (TimerWheel): Timer wheel enforcing the idle, read and write
+                            deadlines; without it only the idle timeout is
+                            applied, per socket operation.
+        deadline (Deadline): Deadline of the current connection.
+        admission (Admission): Admission control of the server, if any;
+                               requests over its caps are shed with ``503``.
+        object_pool (bool): Recycle the :class:`Request <Request>` and
+                            :class:`Response <Response>` objects through
+                            per-worker pools instead of building new ones.
+        access_log (AccessLog): Access log of the server, if any.
+        metrics (Metrics): Metrics of the server, if any; served on
+                           ``metrics.path``.
+        profiler (Profiler): Sampling profiler of the process, if any;
+                             driven through the routes below ``profiler.path``.
+        server_timing (bool): Add a ``Server-Timing`` header with the parse,
+                              route, handler and serialize phases to every
+                              response.
+        hook_loop (HookLoop): Event loop of the native ``async def`` hooks
+                              of the server; without it each coroutine runs
+                              on a loop of its own.
+        pipeline (Pipeline): Middleware chains of the server, compiled at
+                             startup.
     """
 
     __attrs__ = [
@@ -52,9 +117,33 @@ class HttpAdapter:
         "routes",
         "request",
         "response",
+        "idle_timeout",
+        "max_requests",
+        "reader",
+        "handoff",
+        "read_timeout",
+        "write_timeout",
+        "wheel",
+        "deadline",
+        "admission",
+        "object_pool",
+        "access_log",
+        "metrics",
+        "profiler",
+        "server_timing",
+        "hook_loop",
+        "pipeline",
     ]
 
-    def __init__(self, ip, port, conn, connaddr, routes):
+    __slots__ = tuple(__attrs__)
+
+    def __init__(self, ip, port, conn, connaddr, routes,
+                 idle_timeout=IDLE_TIMEOUT, max_requests=MAX_REQUESTS,
+                 max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE,
+                 handoff=None, read_timeout=READ_TIMEOUT,
+                 write_timeout=WRITE_TIMEOUT, wheel=None, admission=None,
+                 object_pool=False, access_log=None, metrics=None,
+                 profiler=None, server_timing=True, hook_loop=None, pipeline=None):
         """
         Initialize a new HttpAdapter instance.
 
@@ -63,6 +152,22 @@ class HttpAdapter:
         :param conn (socket): Active socket connection.
         :param connaddr (tuple): Address of the connected client.
         :param routes (dict): Mapping of route paths to handler functions.
+        :param idle_timeout (float): Seconds a persistent connection may stay idle.
+        :param max_requests (int): Maximum number of requests per connection.
+        :param max_header_size (int): Limit of a request line and headers.
+        :param max_body_size (int): Limit of a request body.
+        :param handoff (Handoff): Listening socket handoff of the process.
+        :param read_timeout (float): Seconds to receive a whole request.
+        :param write_timeout (float): Seconds a response write may stay blocked.
+        :param wheel (TimerWheel): Timer wheel enforcing the deadlines.
+        :param admission (Admission): Admission control of the server.
+        :param object_pool (bool): Recycle the request and response objects.
+        :param access_log (AccessLog): Access log of the server.
+        :param metrics (Metrics): Metrics of the server.
+        :param profiler (Profiler): Sampling profiler of the process.
+        :param server_timing (bool): Add a ``Server-Timing`` header to the responses.
+        :param hook_loop (HookLoop): Event loop of the async hooks.
+        :param pipeline (Pipeline): Middleware chains of the server.
         """
 
         #: IP address.
@@ -75,19 +180,69 @@ class HttpAdapter:
         self.connaddr = connaddr
         #: Routes
         self.routes = routes
-        #: Request
-        self.request = Request()
-        #: Response
-        self.response = Response()
+        #: Request, set for each message
+        self.request = None
+        #: Response, set for each message
+        self.response = None
+        #: Idle timeout of persistent connections
+        self.idle_timeout = idle_timeout
+        #: Maximum number of requests per connection
+        self.max_requests = max_requests
+        #: Incremental reader of the request messages
+        self.reader = HttpReader(max_header_size, max_body_size)
+        #: Listening socket handoff
+        self.handoff = handoff
+        #: Read timeout of a request
+        self.read_timeout = read_timeout
+        #: Write timeout of a response
+        self.write_timeout = write_timeout
+        #: Timer wheel of the deadlines
+        self.wheel = wheel
+        #: Deadline of the connection
+        self.deadline = self.make_deadline(self.expire)
+        #: Admission control
+        self.admission = admission
+        #: Recycle the request and response objects
+        self.object_pool = object_pool
+        #: Access log
+        self.access_log = access_log
+        #: Metrics
+        self.metrics = metrics
+        #: Sampling profiler
+        self.profiler = profiler
+        #: Add the Server-Timing header
+        self.server_timing = server_timing
+        #: Event loop of the async hooks
+        self.hook_loop = hook_loop
+        #: Middleware chains
+        self.pipeline = pipeline if pipeline is not None else PIPELINE
+
+    def reset(self):
+        """Detach the adapter from its connection, to serve another one."""
+        self.conn = None
+        self.connaddr = None
+        self.request = None
+        self.response = None
+        self.reader.reset()
+        self.deadline.clear()
+        self.deadline.on_expire = self.expire
 
     def handle_client(self, conn, addr, routes):
         """
         Handle an incoming client connection.
 
-        This method reads the request from the socket, prepares the request object,
+        This method reads the requests from the socket, prepares the request object,
         invokes the appropriate route handler if available, builds the response,
         and sends it back to the client.
 
+        The connection is persistent: requests, pipelined or not, are served
+        in order in a loop until the client asks to close (``Connection: close``,
+        or an HTTP/1.0 request without ``Connection: keep-alive``), stays idle
+        for ``idle_timeout`` seconds, or reaches ``max_requests`` requests.
+        A client taking more than ``read_timeout`` seconds to send a request,
+        or blocking a response write for ``write_timeout`` seconds, is
+        disconnected.
+
         :param conn (socket): The client socket connection.
         :param addr (tuple): The client's address.
         :param routes (dict): The route mapping for dispatching requests.
@@ -97,61 +252,498 @@ class HttpAdapter:
         self.conn = conn        
         # Connection address.
         self.connaddr = addr
-        # Request handler
-        req = self.request
-        # Response handler
-        resp = self.response
 
-        try:
-            # Handle the request
-            msg = conn.recv(1024).decode()
+        if self.handoff is not None:
+            with self.handoff.track():
+                self.serve_connection(conn, addr, routes)
+        else:
+            self.serve_connection(conn, addr, routes)
+
+    def serve_connection(self, conn, addr, routes):
+        """
+        Serve the requests of a persistent connection, then close it.
+
+        :param conn (socket): The client socket connection.
+        :param addr (tuple): The client's address.
+        :param routes (dict): The route mapping for dispatching requests.
+        """
+        if self.wheel is None:
+            conn.settimeout(self.idle_timeout)
+        served = 0
+        keep_alive = True
+
+        while keep_alive:
+            try:
+                # Handle the requests
+                batch = self.reader.read(conn, self.deadline)
+            except MessageError as e:
+                log.warning("Rejected request from {}: {}", addr, e)
+                self.sendall(conn, e.response)
+                break
+            except OSError:
+                # Idle timeout or connection reset
+                break
             # --- BỔ SUNG KHẮC PHỤC LỖI ---
-            if not msg:
-                print("[HttpAdapter] Client closed connection or sent empty request.")
-                conn.close()
-                return # Thoát khỏi hàm xử lý client
+            if not batch:
+                if served == 0:
+                    log.debug("Client closed connection or sent empty request.")
+                break # Thoát khỏi hàm xử lý client
             # -----------------------------
-            req.prepare(msg, routes)
 
-            # Public paths that don't require authentication
-            public_paths = [
-                '/login.html',
-                '/chat.html',
-                '/nonexistent.html'  # For 404 testing
-            ]
-            
-            # Check if path is public (login page, static files, API routes)
-            is_public = (
-                req.path in public_paths or
-                req.path.startswith('/static/') or
-                req.path.startswith('/api/') or
-                req.path.startswith('/images/')
-            )
-
-            # Handle authentication for /login POST request
-            if req.hook:
-                print("[HttpAdapter] hook in route-path METHOD {} PATH {}".format(req.hook._route_path, req.hook._route_methods))
-                # Call the hook function with proper parameters
-                hook_result = req.hook(headers=str(req.headers), body=req.body)
-                # Set the response content
-                resp.content = hook_result if hook_result else ""
-                response = resp.build_response(req)
-            # Handle authentication for /login POST request (ƯU TIÊN 2)
-            elif req.method == 'POST' and req.path == '/login':
-                response = self.handle_login(req, resp)
-            # Handle authentication check for protected routes (ƯU TIÊN 3)
-            elif (req.path == '/index.html' or req.path == '/') and not is_public:
-                response = self.handle_protected_route(req, resp)
+            # Pipelined requests are answered in order and their responses
+            # written back together, up to a streamed response whose chunks
+            # are sent as they are produced.
+            output = []
+            for msg in batch:
+                served += 1
+                response, keep_alive = self.handle_message(msg, routes, served)
+                if isinstance(response, bytes):
+                    output.append(response)
+                elif not self.send_stream(conn, output, response):
+                    keep_alive = False
+                if not keep_alive:
+                    break
+
+            if not self.sendall(conn, b"".join(output)):
+                break
+
+        self.deadline.clear()
+        conn.close()
+
+    def make_deadline(self, on_expire):
+        """
+        Build the :class:`Deadline <Deadline>` of a connection with the
+        timeouts of the adapter.
+
+        :param on_expire (callable): Closes the connection.
+        """
+        return Deadline(self.wheel, on_expire, self.idle_timeout,
+                        self.read_timeout, self.write_timeout)
+
+    def expire(self):
+        """Deadline callback: disconnect the client of a blocked thread."""
+        log.info("Closing {} after {} timeout", self.connaddr, self.deadline.kind)
+        if self.conn is not None:
+            shutdown(self.conn)
+
+    def sendall(self, conn, data):
+        """
+        Send ``data`` under the write deadline.
+
+        :rtype bool: False if the connection failed or timed out.
+        """
+        self.deadline.writing()
+        try:
+            conn.sendall(data)
+        except OSError:
+            return False
+        finally:
+            self.deadline.clear()
+        return True
+
+    def handle_message(self, msg, routes, served=1):
+        """
+        Answer one request message of a persistent connection.
+
+        :param msg (bytes): The complete request message.
+        :param routes (dict): The route mapping for dispatching requests.
+        :param served (int): Number of requests served on the connection,
+                             this one included.
+
+        :rtype tuple: (bytes, bool) the framed response and whether the
+                      connection stays open. A streamed response is an
+                      iterator of bytes, its framed header first.
+        """
+        started = time.monotonic()
+        req, resp = self.new_exchange()
+
+        try:
+            self.mark(req, None)
+            req.prepare(msg, routes)
+            self.mark(req, "parse")
+            keep_alive = self.keep_alive(req) and served < self.max_requests
+            gate = self.gate(req)
+            if gate is not None and not gate.acquire():
+                keep_alive = False
+                response = self.admission.response
             else:
-                # Build normal response (public files)
-                response = resp.build_response(req)
+                try:
+                    response = self.dispatch(req, resp)
+                finally:
+                    if gate is not None:
+                        gate.release()
         except Exception as e:
-            print("[HttpAdapter] Error processing request: {}".format(e))
+            log.error("Error processing request: {}", e)
+            keep_alive = False
             response = self.build_error_response(500, "Internal Server Error")
+            resp.stream = None
 
-        #print(response)
-        conn.sendall(response)
-        conn.close()
+        response = self.frame_response(response, keep_alive, served, req)
+        stream = self.observe(req, response, resp.stream, started)
+        if stream is not None:
+            response = itertools.chain((response,), stream)
+        self.recycle()
+        return response, keep_alive
+
+    def observe(self, req, response, stream, started):
+        """
+        Record an answered request in the access log and the metrics, if any.
+
+        :param req (Request): The answered request.
+        :param response (bytes): The framed response, or header of a
+                                 streamed one.
+        :param stream (iterator): Chunks of a streamed response, or None.
+        :param started (float): :func:`time.monotonic` when the request
+                                was complete.
+
+        :rtype iterator: ``stream``, recording the request once it ends.
+        """
+        if self.access_log is None and self.metrics is None:
+            return stream
+        status = response[9:12].decode('ascii', 'replace')
+        # Read now: the request is recycled before a stream ends.
+        exchange = (self.connaddr, req.method, req.path, req.version,
+                    self.route_of(req, status), status, req.request_id)
+        if stream is not None:
+            return self.track(stream, len(response), started, exchange)
+        self.record(exchange, len(response), time.monotonic() - started)
+        return None
+
+    def track(self, stream, nbytes, started, exchange):
+        """
+        Relay the chunks of a streamed response, recording the request
+        once the stream ends.
+
+        :param nbytes (int): Bytes sent before the chunks (the header).
+        :param exchange (tuple): ``(addr, method, path, version, route, status,
+                                 request_id)``.
+        """
+        try:
+            for chunk in stream:
+                nbytes += len(chunk)
+                yield chunk
+        finally:
+            self.record(exchange, nbytes, time.monotonic() - started)
+
+    def record(self, exchange, nbytes, latency):
+        """Record one answered request, see :meth:`observe`."""
+        addr, method, path, version, route, status, request_id = exchange
+        if self.access_log is not None:
+            self.access_log.record(addr, method, path, version, status, nbytes, latency,
+                                   request_id=request_id)
+        if self.metrics is not None:
+            self.metrics.observe_request(method, route, status, nbytes, latency)
+
+    def route_of(self, req, status=None):
+        """
+        The route of ``req`` in the metrics: the path of its hook, else one
+        label for all the requests without a route, so that scanned or
+        missing URLs do not each make a series.
+
+        :param req (Request): The request.
+        :param status (str): Status code of the response, None while it is
+                             being answered.
+
+        :rtype str: The route path, :data:`STATIC_ROUTE` for a served file
+                    (and the phases of any unrouted request), else
+                    :data:`UNMATCHED_ROUTE`.
+        """
+        if req.hook:
+            return req.hook._route_path
+        if status is None or status[:1] in ("2", "3"):
+            return STATIC_ROUTE
+        return UNMATCHED_ROUTE
+
+    def mark(self, req, phase):
+        """
+        End a phase of the request: it lasted since the previous mark. The
+        phase is timed in the metrics, if any, and in ``Server-Timing``.
+
+        :param req (Request): The request.
+        :param phase (str): ``parse``, ``route``, ``handler`` or
+                            ``serialize``; None for the first mark.
+        """
+        now = time.perf_counter()
+        timings = req.timings
+        if phase is not None and timings and self.metrics is not None:
+            self.metrics.observe_phase(phase, req.method, self.route_of(req),
+                                       now - timings[-1][1])
+        timings.append((phase, now))
+
+    def trace_headers(self, req):
+        """
+        The ``X-Request-ID`` header of the request, generated when the
+        client or proxy sent none, and its ``Server-Timing`` header.
+
+        :param req (Request): The answered request.
+
+        :rtype list: Header lines (bytes).
+        """
+        if req.request_id is None:
+            req.request_id = new_request_id()
+        headers = [b"X-Request-ID: " + req.request_id.encode('latin-1')]
+        marks = req.timings
+        if self.server_timing and len(marks) > 1:
+            phases = [(marks[i][0], marks[i][1] - marks[i - 1][1])
+                      for i in range(1, len(marks))]
+            headers.append(b"Server-Timing: " + server_timing(phases))
+        return headers
+
+    def new_exchange(self):
+        """
+        Set up the :class:`Request <Request>` and :class:`Response <Response>`
+        of the next message, recycled ones with ``object_pool``.
+
+        :rtype tuple: (Request, Response).
+        """
+        if self.object_pool:
+            self.request = REQUESTS.acquire()
+            self.response = RESPONSES.acquire()
+        else:
+            # Request handler
+            self.request = Request()
+            # Response handler
+            self.response = Response()
+        return self.request, self.response
+
+    def recycle(self):
+        """Give the request and response of an answered message back to the pools."""
+        if self.object_pool:
+            REQUESTS.release(self.request)
+            RESPONSES.release(self.response)
+            self.request = None
+            self.response = None
+
+    def send_stream(self, conn, output, stream):
+        """
+        Send a streamed response after the pending output of the batch.
+
+        :param conn (socket): The client socket connection.
+        :param output (list): Responses of the batch not sent yet, emptied.
+        :param stream (iterator): Framed header and chunks of the response.
+
+        :rtype bool: False if the stream failed and the connection must
+                     close, the response being truncated.
+        """
+        if not self.sendall(conn, b"".join(output)):
+            return False
+        del output[:]
+        try:
+            for part in stream:
+                if not self.sendall(conn, part):
+                    return False
+        except Exception as e:
+            log.error("Error streaming response: {}", e)
+            return False
+        return True
+
+    def keep_alive(self, req):
+        """
+        Whether the connection stays open after answering ``req``.
+
+        HTTP/1.1 connections are persistent unless the client sends
+        ``Connection: close``; HTTP/1.0 ones only with ``Connection: keep-alive``.
+        No connection stays open once the process is draining.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+
+        :rtype bool:
+        """
+        if self.handoff is not None and self.handoff.draining.is_set():
+            return False
+        connection = req.headers.get('connection', '').lower()
+        if req.version == 'HTTP/1.1':
+            return 'close' not in connection
+        if req.version == 'HTTP/1.0':
+            return 'keep-alive' in connection
+        return False
+
+    def gate(self, req):
+        """
+        The admission :class:`Gate <Gate>` ``req`` goes through.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+
+        :rtype Gate: The gate, None when the request is not limited.
+        """
+        if self.admission is None:
+            return None
+        return self.admission.gate(req)
+
+    def frame_response(self, response, keep_alive, served=1, req=None):
+        """
+        Set the connection framing headers of a raw response.
+
+        ``Content-Length`` is recomputed from the actual body and the
+        ``Connection`` (and ``Keep-Alive``) headers are set from ``keep_alive``,
+        replacing whatever the response builder wrote.
+
+        :param response (bytes): The encoded HTTP response.
+        :param keep_alive (bool): Whether the connection stays open.
+        :param served (int): Number of requests served on the connection.
+        :param req (Request): The answered request, to add its
+                              :meth:`trace_headers`.
+
+        :rtype bytes: The framed HTTP response.
+        """
+        params = None
+        if keep_alive:
+            params = b"timeout=%d, max=%d" % (self.idle_timeout, self.max_requests - served)
+        extra = self.trace_headers(req) if req is not None else None
+        return frame_response(response, keep_alive, params, extra)
+
+    def dispatch(self, req, resp):
+        """
+        Dispatch a prepared request and build the raw response.
+
+        A request with a WeApRous hook goes through the middleware chain of
+        its route to the hook; any other through the fallback chain of the
+        :attr:`pipeline` (``405``, login form, protected pages) to the
+        public (static) files.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+        :param resp (Response): The :class:`Response <Response>` to fill.
+
+        :rtype bytes: The encoded HTTP response.
+        """
+        self.mark(req, "route")
+        if req.hook:
+            log.debug("hook in route-path METHOD {} PATH {}", req.hook._route_path, req.hook._route_methods)
+            chain = getattr(req.hook, "_route_chain", EMPTY)
+            response = chain.run(req, resp, self.answer_hook)
+        else:
+            chain = self.pipeline.fallback
+            response = chain.run(req, resp, self.answer_static)
+        self.mark(req, "serialize")
+        return response
+
+    def answer_hook(self, req, resp):
+        """
+        Call the WeApRous hook of the request and build its raw response,
+        the endpoint of the chain of its route.
+
+        :rtype bytes: The encoded HTTP response.
+        """
+        hook_result = self.call_hook(req)
+        if inspect.iscoroutine(hook_result):
+            # Native async hook awaited from a worker thread
+            hook_result = self.run_coroutine(hook_result)
+        self.mark(req, "handler")
+        return self.build_hook_response(req, resp, hook_result)
+
+    def answer_static(self, req, resp):
+        """
+        Build the raw response of a public (static) file, the endpoint of
+        the fallback chain.
+
+        :rtype bytes: The encoded HTTP response.
+        """
+        return resp.build_response(req)
+
+    def enter_hook(self, req, resp):
+        """
+        Enter the middleware chain of an async hook, which the caller then
+        awaits on its loop and hands to :meth:`leave_hook`.
+
+        :rtype tuple: (response, unwind), see :meth:`Chain.enter <Chain.enter>`:
+                      a response means the chain answered, the hook is not
+                      to be called.
+        """
+        self.mark(req, "route")
+        response, unwind = getattr(req.hook, "_route_chain", EMPTY).enter(req, resp)
+        if unwind is None:
+            self.mark(req, "serialize")
+        return response, unwind
+
+    def leave_hook(self, req, resp, unwind, hook_result=None, error=None):
+        """
+        Build the raw response of an async hook and leave its middleware
+        chain.
+
+        :param unwind (list): The layers returned by :meth:`enter_hook`.
+        :param hook_result: The value returned by the hook.
+        :param error (Exception): The error raised by the hook, if any.
+
+        :rtype bytes: The encoded HTTP response.
+
+        :raise Exception: ``error``, unless a middleware answered it.
+        """
+        response = None
+        if error is None:
+            self.mark(req, "handler")
+            try:
+                response = self.build_hook_response(req, resp, hook_result)
+            except Exception as e:
+                error = e
+        response = getattr(req.hook, "_route_chain", EMPTY).leave(req, resp, unwind,
+                                                                  response, error)
+        self.mark(req, "serialize")
+        return response
+
+    def run_coroutine(self, coro):
+        """
+        Run the coroutine of an async hook on the event loop of the server
+        and wait for its result; the calling thread must not be the loop's.
+
+        :param coro (coroutine): The coroutine returned by :meth:`call_hook`.
+        """
+        if self.hook_loop is None:
+            return asyncio.run(coro)
+        return self.hook_loop.run(coro)
+
+    def call_hook(self, req):
+        """
+        Call the WeApRous hook of the request with proper parameters.
+
+        For a coroutine hook the returned value is the coroutine, which the
+        caller is expected to await. A hook registered with a ``request``
+        parameter gets a :class:`Context <Context>` of the request. The
+        others get the headers as a string and the decoded body, and
+        :attr:`Request.query <Request.query>` when they have a ``query``
+        parameter. The parameters of the route path are passed by name.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+        """
+        params = req.params or {}
+        if getattr(req.hook, "_route_context", False):
+            return req.hook(request=Context(req), **params)
+        # Former calling convention
+        if getattr(req.hook, "_route_query", False):
+            return req.hook(headers=str(req.headers), body=req.body.decode('utf-8', 'replace'),
+                            query=req.query, **params)
+        return req.hook(headers=str(req.headers), body=req.body.decode('utf-8', 'replace'),
+                        **params)
+
+    def build_hook_response(self, req, resp, hook_result):
+        """
+        Build the raw response from the value returned by a WeApRous hook.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+        :param resp (Response): The :class:`Response <Response>` to fill.
+        :param hook_result: The value returned by the hook: the body (a dict
+                            or list is encoded as JSON), or a ``(body,
+                            status)`` or ``(body, status, headers)`` tuple.
+
+        :rtype bytes: The encoded HTTP response.
+        """
+        if isinstance(hook_result, tuple):
+            if len(hook_result) not in (2, 3):
+                raise TypeError("A hook returns (body, status) or (body, status, headers), "
+                                "not a tuple of {}".format(len(hook_result)))
+            body, status = hook_result[0], hook_result[1]
+            resp.status_code = int(status)
+            if len(hook_result) == 3 and hook_result[2]:
+                resp.headers.update(hook_result[2])
+            # An explicit status answers even an empty body
+            resp.content = body if body is not None else ""
+            return resp.build_content_response(req)
+        if isinstance(hook_result, (dict, list)):
+            # Encoded as JSON, even when empty
+            resp.content = hook_result
+            return resp.build_content_response(req)
+        # Set the response content
+        resp.content = hook_result if hook_result else ""
+        return resp.build_response(req)
 
     def extract_cookies(self, req):
         """
@@ -253,61 +845,12 @@ class HttpAdapter:
 
         return headers
     
-    def handle_login(self, req, resp):
-        """Handle login POST request with authentication."""
-        form_data = req.parse_form_data()
-        username = form_data.get('username', '')
-        password = form_data.get('password', '')
-        
-        print("[HttpAdapter] Login attempt: username={}, password={}".format(username, password))
-        
-        # Check credentials (admin/password)
-        if username == 'admin' and password == 'password':
-            # Login successful - set cookie and serve index page
-            resp.set_cookie('auth', 'true')
-            resp.status_code = 200
-            req.path = '/index.html'  # Serve index page
-            return resp.build_response(req)
-        else:
-            # Login failed - return 401
-            return self.build_error_response(401, "Unauthorized")
-    
-    def handle_protected_route(self, req, resp):
-        """Handle protected routes that require authentication."""
-        auth_cookie = req.cookies.get('auth', '')
-        
-        if auth_cookie == 'true':
-            # Authenticated - serve the requested page
-            if req.path == '/':
-                req.path = '/index.html'
-            return resp.build_response(req)
-        else:
-            # Not authenticated - return 401 or redirect to login
-            return self.build_error_response(401, "Unauthorized - Please login first")
-    
-    def build_error_response(self, status_code, message):
-        """Build error response."""
-        if status_code == 401:
-            response_body = """
-            <html><body>
-            <h1>401 Unauthorized</h1>
-            <p>{}</p>
-            <a href="/login.html">Login Here</a>
-            </body></html>
-            """.format(message)
-        else:
-            response_body = """
-            <html><body>
-            <h1>{} {}</h1>
-            <p>An error occurred: {}</p>
-            </body></html>
-            """.format(status_code, message, message)
-            
-        response_text = """HTTP/1.1 {} {}
-Content-Type: text/html
-Content-Length: {}
-Connection: close
-
-{}""".format(status_code, message, len(response_body), response_body)
-        
-        return response_text.encode('utf-8')
\ No newline at end of file
+    def build_error_response(self, status_code, message, allow=None):
+        """
+        Build error response.
+
+        :param status_code (int): Status code.
+        :param message (str): Reason phrase, also shown in the page.
+        :param allow (tuple): Methods of the ``Allow`` header of a 405.
+        """
+        return error_response(status_code, message, allow)
@@ -0,0 +1,292 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.logger
+~~~~~~~~~~~~~~~~~
+
+This module provides the leveled logging of the daemon. A record is a tuple
+queued for a background writer thread, which formats the queued records and
+writes them in batches, so request threads never wait on the terminal or a
+log file.
+
+- Formatting is lazy: ``log.debug("path {}", path)`` keeps ``path`` and only
+  the writer calls :meth:`str.format`. Arguments must not be mutated after
+  the call.
+- A disabled level costs a call to an empty function: :meth:`Logger.set_level`
+  binds the methods of the disabled levels to a no-op. Guard the arguments
+  that are costly to compute with :meth:`Logger.enabled`.
+- The queue is bounded: past ``MAX_PENDING`` records the oldest are dropped
+  rather than blocking the caller.
+
+Usage Example:
+--------------
+>>> log = get_logger("Backend")
+>>> configure(level="debug")
+>>> log.info("Listening on port {}", 9000)
+"""
+
+import atexit
+import collections
+import os
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+#: Level names, as accepted by :func:`configure` and the ``--log-level`` flags.
+LEVELS = {
+    "debug": DEBUG,
+    "info": INFO,
+    "warning": WARNING,
+    "error": ERROR,
+}
+
+#: Default level of the loggers.
+LEVEL = INFO
+
+#: Seconds between two batches of the writer thread.
+FLUSH_INTERVAL = 0.1
+
+#: Maximum number of records waiting for the writer.
+MAX_PENDING = 10000
+
+_LABELS = {
+    DEBUG: "DEBUG",
+    INFO: "INFO",
+    WARNING: "WARNING",
+    ERROR: "ERROR",
+}
+
+
+def _disabled(msg, *args):
+    """Stand-in for the methods of the disabled levels."""
+
+
+def format_record(record):
+    """
+    Format a queued record into one line.
+
+    :param record (tuple): ``(created, level, name, msg, args)``.
+
+    :rtype str: The line, ending with a newline.
+    """
+    created, level, name, msg, args = record
+    if args:
+        try:
+            msg = msg.format(*args)
+        except (IndexError, KeyError, ValueError):
+            msg = "{} {}".format(msg, args)
+    return "{}.{:03d} {:<7} [{}] {}\n".format(
+        time.strftime("%H:%M:%S", time.localtime(created)),
+        int(created * 1000) % 1000, _LABELS.get(level, level), name, msg)
+
+
+class LogWriter:
+    """
+    Background thread writing the queued records in batches.
+
+    Attributes:
+        stream (file): Output of the records, ``sys.stdout`` when None.
+        interval (float): Seconds between two batches.
+    """
+
+    __attrs__ = [
+        "stream",
+        "interval",
+    ]
+
+    def __init__(self, stream=None, interval=FLUSH_INTERVAL, max_pending=MAX_PENDING):
+        """
+        Initialize a new LogWriter instance.
+
+        :param stream (file): Output of the records, ``sys.stdout`` when None.
+        :param interval (float): Seconds between two batches.
+        :param max_pending (int): Maximum number of queued records.
+        """
+        self.stream = stream
+        self.interval = interval
+        #: Queued records; ``deque.append`` needs no lock from the callers.
+        self._pending = collections.deque(maxlen=max_pending)
+        #: Serializes the batches of the thread and of :meth:`flush`.
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def emit(self, record):
+        """
+        Queue a record, starting the writer thread on the first one.
+
+        :param record (tuple): ``(created, level, name, msg, args)``.
+        """
+        self._pending.append(record)
+        if self._thread is None:
+            self.start()
+
+    def start(self):
+        """Start the writer thread, if not running yet."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.run, name="LogWriter",
+                                            daemon=True)
+            self._thread.start()
+
+    def run(self):
+        """Write the queued records every ``interval`` seconds."""
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self):
+        """Format and write every queued record."""
+        with self._lock:
+            pending = self._pending
+            lines = []
+            while pending:
+                try:
+                    lines.append(format_record(pending.popleft()))
+                except IndexError:
+                    break
+            if not lines:
+                return
+            stream = self.stream or sys.stdout
+            try:
+                stream.write("".join(lines))
+                stream.flush()
+            except (OSError, ValueError):
+                # Closed or broken output: the records are lost, not the server.
+                pass
+
+    def after_fork(self):
+        """
+        Reset the writer in a forked child: the thread did not survive the
+        fork and the queued records belong to the parent.
+        """
+        self._lock = threading.Lock()
+        self._pending.clear()
+        self._thread = None
+
+
+class Logger:
+    """
+    A named logger; its records are tagged ``[name]``, e.g. ``[Backend]``.
+
+    Attributes:
+        name (str): Tag of the records.
+        level (int): Lowest enabled level.
+    """
+
+    __attrs__ = [
+        "name",
+        "level",
+    ]
+
+    def __init__(self, name, writer, level=LEVEL):
+        self.name = name
+        self.writer = writer
+        self.set_level(level)
+
+    def set_level(self, level):
+        """
+        Enable the levels from ``level`` up.
+
+        :param level (int): Lowest enabled level.
+        """
+        self.level = level
+        for value, method in ((DEBUG, "debug"), (INFO, "info"),
+                              (WARNING, "warning"), (ERROR, "error")):
+            if value >= level:
+                self.__dict__.pop(method, None)
+            else:
+                setattr(self, method, _disabled)
+
+    def enabled(self, level):
+        """
+        :rtype bool: True if the records of ``level`` are written.
+        """
+        return level >= self.level
+
+    def log(self, level, msg, *args):
+        """Queue a record of ``level``, if enabled."""
+        if level >= self.level:
+            self.writer.emit((time.time(), level, self.name, msg, args))
+
+    def debug(self, msg, *args):
+        self.writer.emit((time.time(), DEBUG, self.name, msg, args))
+
+    def info(self, msg, *args):
+        self.writer.emit((time.time(), INFO, self.name, msg, args))
+
+    def warning(self, msg, *args):
+        self.writer.emit((time.time(), WARNING, self.name, msg, args))
+
+    def error(self, msg, *args):
+        self.writer.emit((time.time(), ERROR, self.name, msg, args))
+
+
+_writer = LogWriter()
+_loggers = {}
+_level = LEVEL
+
+
+def get_logger(name):
+    """
+    The logger tagged ``name``, shared by every caller.
+
+    :param name (str): Tag of the records.
+
+    :rtype Logger: The logger, at the configured level.
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, Logger(name, _writer, _level))
+    return logger
+
+
+def configure(level=None, path=None, stream=None):
+    """
+    Set the level of every logger and the output of the records.
+
+    :param level (str or int): Lowest enabled level, a name of ``LEVELS``.
+    :param path (str): File the records are appended to.
+    :param stream (file): Output of the records, ``sys.stdout`` by default.
+
+    :raise ValueError: If ``level`` is not a known level.
+    """
+    global _level
+    if level is not None:
+        if isinstance(level, str):
+            if level.lower() not in LEVELS:
+                raise ValueError("unknown log level {}".format(level))
+            level = LEVELS[level.lower()]
+        _level = level
+        for logger in list(_loggers.values()):
+            logger.set_level(level)
+    if path is not None:
+        stream = open(path, "a", encoding="utf-8")
+    if stream is not None:
+        _writer.flush()
+        _writer.stream = stream
+
+
+def flush():
+    """Write the queued records now, e.g. before ``os._exit``."""
+    _writer.flush()
+
+
+atexit.register(flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=flush, after_in_child=_writer.after_fork)
@@ -0,0 +1,339 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.metrics
+~~~~~~~~~~~~~~~~~
+
+This module provides the metrics of the backend and the proxy, served in
+the Prometheus text format on an opt-in path (``/metrics``):
+
+- ``http_requests_total``, ``http_response_bytes_total`` and the
+  ``http_request_duration_seconds`` histogram, by route ``(method, path)``
+  and status class,
+- ``http_phase_duration_seconds``: the parse, route, handler and
+  serialize phases of each route,
+- ``proxy_upstream_*``: the same counters and histogram by upstream,
+- ``*_quantile_seconds``: p50, p99 and p999 estimated from the buckets.
+
+Each thread updates its own shard of series, so no lock is taken on the
+request path; a scrape merges the shards. The shard of a thread that ended,
+e.g. the thread of a closed connection, is folded into one shared shard,
+so the number of shards follows the live threads. The counters are per
+process: with several worker processes, each serves its own.
+
+Usage Example:
+--------------
+>>> metrics = Metrics("/metrics")
+>>> metrics.observe_request("GET", "/hello", "200", 120, 0.0021)
+>>> print(metrics.render())
+"""
+
+import bisect
+import threading
+
+from .utils import text_response
+
+#: Upper bounds in seconds of the latency histogram buckets.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+#: Quantiles estimated from the buckets.
+QUANTILES = (0.5, 0.99, 0.999)
+
+#: Series a thread keeps per family before folding new labels into ``other``.
+MAX_SERIES = 500
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram, with request, byte and status counters.
+
+    Attributes:
+        counts (list): Observations per bucket, the last one ``+Inf``.
+        sum (float): Sum of the observed seconds.
+        count (int): Number of observations.
+        bytes (int): Bytes of the responses.
+        statuses (dict): Observations per status class (``2xx``, ...).
+    """
+
+    __slots__ = ("counts", "sum", "count", "bytes", "statuses")
+
+    def __init__(self, buckets=BUCKETS):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.bytes = 0
+        self.statuses = {}
+
+    def observe(self, seconds, buckets=BUCKETS):
+        self.counts[bisect.bisect_left(buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def merge(self, other):
+        """Add the observations of ``other`` to this histogram."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.sum += other.sum
+        self.count += other.count
+        self.bytes += other.bytes
+        for status, count in list(other.statuses.items()):
+            self.statuses[status] = self.statuses.get(status, 0) + count
+
+    def quantile(self, q, buckets=BUCKETS):
+        """
+        Estimate a quantile, interpolating within its bucket as Prometheus'
+        ``histogram_quantile`` does.
+
+        :param q (float): The quantile, between 0 and 1.
+
+        :rtype float: Seconds, None without observations.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if index == len(buckets):
+                    # The +Inf bucket: no upper bound to interpolate to.
+                    return buckets[-1]
+                lower = buckets[index - 1] if index else 0.0
+                return lower + (buckets[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return buckets[-1]
+
+
+def escape(value):
+    """Escape a label value of the text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def labels(names, values, **extra):
+    """Format a label set, e.g. ``{method="GET",route="/"}``."""
+    pairs = list(zip(names, values)) + list(extra.items())
+    return "{" + ",".join('{}="{}"'.format(name, escape(value))
+                          for name, value in pairs) + "}"
+
+
+class Metrics:
+    """
+    Per-thread sharded metrics of a server.
+
+    Attributes:
+        path (str): Path on which the metrics are served.
+        buckets (tuple): Upper bounds of the histogram buckets.
+    """
+
+    __attrs__ = [
+        "path",
+        "buckets",
+    ]
+
+    #: Families: (prefix of the counters, None for none, prefix of the
+    #: latency histogram, label names).
+    FAMILIES = {
+        "request": ("http", "http_request", ("method", "route")),
+        "phase": (None, "http_phase", ("phase", "method", "route")),
+        "upstream": ("proxy_upstream", "proxy_upstream", ("upstream",)),
+    }
+
+    def __init__(self, path="/metrics", buckets=BUCKETS):
+        self.path = path
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        #: Shards of the live threads, (thread, family -> labels -> Histogram).
+        self._shards = []
+        #: Series of the ended threads, family -> labels -> Histogram.
+        self._retired = {family: {} for family in self.FAMILIES}
+        #: Guards ``_shards`` and ``_retired``, taken once per thread.
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        """The shard of the calling thread."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {family: {} for family in self.FAMILIES}
+            with self._lock:
+                self._reap()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _reap(self):
+        """Fold the shards of the ended threads into ``_retired``, under ``_lock``."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            for family, series in shard.items():
+                self._fold(self._retired[family], series, MAX_SERIES)
+        self._shards = live
+
+    def _fold(self, into, series, limit=None):
+        """
+        Merge the histograms of ``series`` into ``into``.
+
+        :param limit (int): Series of ``into`` past which new labels are
+                            folded into ``other``, None for no limit.
+        """
+        for key, histogram in list(series.items()):
+            total = into.get(key)
+            if total is None:
+                if limit is not None and len(into) >= limit:
+                    key = key[:-1] + ("other",)
+                    total = into.get(key)
+                if total is None:
+                    total = into[key] = Histogram(self.buckets)
+            total.merge(histogram)
+
+    def _series(self, family, key):
+        series = self._shard()[family]
+        histogram = series.get(key)
+        if histogram is None:
+            if len(series) >= MAX_SERIES:
+                key = key[:-1] + ("other",)
+                histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+        return histogram
+
+    def observe_request(self, method, route, status, nbytes, seconds):
+        """
+        Count an answered request of a route.
+
+        :param method (str): Method of the request.
+        :param route (str): Route path of the hook, else ``static`` or
+                            ``unmatched``.
+        :param status (str): Status code of the response.
+        :param nbytes (int): Bytes of the response.
+        :param seconds (float): Latency of the request.
+        """
+        histogram = self._series("request", (method, route))
+        histogram.observe(seconds, self.buckets)
+        histogram.bytes += nbytes
+        status = "{}xx".format(str(status)[:1] or "-")
+        histogram.statuses[status] = histogram.statuses.get(status, 0) + 1
+
+    def observe_phase(self, phase, method, route, seconds):
+        """
+        Time a phase of a request, ``parse``, ``route``, ``handler`` or
+        ``serialize``.
+        """
+        self._series("phase", (phase, method, route)).observe(seconds, self.buckets)
+
+    def observe_upstream(self, upstream, status, nbytes, seconds):
+        """
+        Count a request relayed by the proxy to ``upstream`` (``host:port``).
+        """
+        histogram = self._series("upstream", (upstream or "-",))
+        histogram.observe(seconds, self.buckets)
+        histogram.bytes += nbytes
+        status = "{}xx".format(str(status)[:1] or "-")
+        histogram.statuses[status] = histogram.statuses.get(status, 0) + 1
+
+    def is_scrape(self, method, path):
+        """
+        :rtype bool: True if the request asks for the metrics.
+        """
+        return method == "GET" and path is not None and path.split("?", 1)[0] == self.path
+
+    def is_scrape_message(self, message):
+        """
+        :param message (bytes): A raw request, or at least its request line.
+
+        :rtype bool: True if the request asks for the metrics.
+        """
+        line = message[:message.find(b"\r\n")].split(None, 2)
+        return len(line) > 1 and self.is_scrape(line[0].decode('latin-1'),
+                                                line[1].decode('latin-1'))
+
+    def observe_exchange(self, request, response, nbytes, seconds, upstream=None):
+        """
+        Count a relayed request from its raw messages, see :meth:`observe_upstream`.
+        """
+        self.observe_upstream(upstream, response[9:12].decode('ascii', 'replace'),
+                              nbytes, seconds)
+
+    def collect(self):
+        """
+        Merge the shards of every thread.
+
+        :rtype dict: family -> labels -> Histogram.
+        """
+        merged = {family: {} for family in self.FAMILIES}
+        with self._lock:
+            self._reap()
+            shards = [shard for _, shard in self._shards]
+            for family, series in self._retired.items():
+                self._fold(merged[family], series)
+        for shard in shards:
+            for family, series in shard.items():
+                self._fold(merged[family], series)
+        return merged
+
+    def render(self):
+        """
+        The metrics in the Prometheus text format (version 0.0.4).
+
+        :rtype str:
+        """
+        lines = []
+        for family, series in self.collect().items():
+            prefix, latency, names = self.FAMILIES[family]
+            items = sorted(series.items())
+            if prefix is not None:
+                lines.append("# HELP {}_requests_total Requests answered, by status class.".format(prefix))
+                lines.append("# TYPE {}_requests_total counter".format(prefix))
+                for key, histogram in items:
+                    for status, count in sorted(histogram.statuses.items()):
+                        lines.append("{}_requests_total{} {}".format(
+                            prefix, labels(names, key, status=status), count))
+                lines.append("# HELP {}_response_bytes_total Bytes of the responses.".format(prefix))
+                lines.append("# TYPE {}_response_bytes_total counter".format(prefix))
+                for key, histogram in items:
+                    lines.append("{}_response_bytes_total{} {}".format(
+                        prefix, labels(names, key), histogram.bytes))
+
+            name = "{}_duration_seconds".format(latency)
+            lines.append("# HELP {} Latency in seconds.".format(name))
+            lines.append("# TYPE {} histogram".format(name))
+            for key, histogram in items:
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append("{}_bucket{} {}".format(
+                        name, labels(names, key, le=bound), cumulative))
+                lines.append("{}_sum{} {:.6f}".format(name, labels(names, key), histogram.sum))
+                lines.append("{}_count{} {}".format(name, labels(names, key), histogram.count))
+
+            name = "{}_duration_quantile_seconds".format(latency)
+            lines.append("# HELP {} Latency quantiles estimated from the buckets.".format(name))
+            lines.append("# TYPE {} gauge".format(name))
+            for key, histogram in items:
+                for q in QUANTILES:
+                    value = histogram.quantile(q, self.buckets)
+                    if value is not None:
+                        lines.append("{}{} {:.6f}".format(
+                            name, labels(names, key, quantile=q), value))
+        return "\n".join(lines) + "\n"
+
+    def response(self):
+        """
+        The framed HTTP response of a scrape.
+
+        :rtype bytes:
+        """
+        return text_response(self.render(),
+                             content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,372 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.middleware
+~~~~~~~~~~~~~~~~~
+
+This module provides the middleware of the backend: hooks run around the
+WeApRous handlers and the static site, registered once and compiled at
+startup into flat chains.
+
+A middleware is called with the :class:`Request <Request>` and the
+:class:`Response <Response>` of the exchange, and is one of:
+
+- ``before(request, response)``: returns None to go on, or the raw
+  response (bytes) answering the request in place of the handler.
+- ``after(request, response, raw)``: returns the raw response to send,
+  None to keep ``raw``.
+- ``around(request, response)``: a generator yielding once. The code before
+  the ``yield`` runs on the way in, the ``yield`` evaluates to the raw
+  response, or raises the error of the handler, and the code after it runs
+  on the way out; ``return`` a raw response to replace it. Returning
+  before the ``yield`` answers the request, like a ``before`` hook.
+
+The layers are entered in registration order and left in reverse order. A
+layer answering on the way in only unwinds the layers entered before it.
+
+Each route gets the chain of the server (metrics, profiler), then of the
+app, then of its own ``middleware``; the requests without a route get the
+chain of the server and the app, then the ``405`` of the paths routed for
+other methods and the login of the static site. The chains are compiled by
+:class:`Pipeline <Pipeline>` when the server starts and kept on the
+handlers, so that a request reads its chain as an attribute of its hook,
+with no lookup.
+
+Usage::
+
+  >>> admin = Middleware()
+  >>> @admin.before
+  >>> def require_auth(request, response):
+  >>>     if request.cookies.get('auth') != 'true':
+  >>>         return error_response(401, "Unauthorized")
+
+  >>> @app.around
+  >>> def timed(request, response):
+  >>>     started = time.perf_counter()
+  >>>     raw = yield
+  >>>     log.info("{} took {:.3f} s", request.path, time.perf_counter() - started)
+
+  >>> @app.route('/admin/peers', methods=['DELETE'], middleware=admin)
+  >>> def clear_peers(request):
+  >>>     ...
+"""
+
+import inspect
+
+from .response import error_response
+from .logger import get_logger
+
+log = get_logger("Middleware")
+
+BEFORE = "before"
+AFTER = "after"
+AROUND = "around"
+
+#: Paths of the static site served without the auth cookie.
+PUBLIC_PATHS = frozenset([
+    '/login.html',
+    '/chat.html',
+    '/nonexistent.html',  # For 404 testing
+])
+
+#: Prefixes of the static site served without the auth cookie.
+PUBLIC_PREFIXES = ('/static/', '/api/', '/images/')
+
+#: Pages of the static site behind the login.
+PROTECTED_PATHS = frozenset(['/', '/index.html'])
+
+
+class Middleware:
+    """
+    Ordered registry of middleware, of an app or of some of its routes.
+
+    Attributes:
+        layers (list): The ``(kind, func)`` middleware, in order.
+    """
+
+    __attrs__ = [
+        "layers",
+    ]
+
+    def __init__(self):
+        self.layers = []
+
+    def before(self, func):
+        """Register ``func(request, response)``, run before the handler."""
+        self.layers.append((BEFORE, func))
+        return func
+
+    def after(self, func):
+        """Register ``func(request, response, raw)``, run after the handler."""
+        self.layers.append((AFTER, func))
+        return func
+
+    def around(self, func):
+        """
+        Register the generator function ``func(request, response)``, run
+        around the handler.
+
+        :raise TypeError: if ``func`` is not a generator function.
+        """
+        if not inspect.isgeneratorfunction(func):
+            raise TypeError("An around middleware yields once, {} does not yield"
+                            .format(func.__name__))
+        self.layers.append((AROUND, func))
+        return func
+
+    def __len__(self):
+        return len(self.layers)
+
+    def __repr__(self):
+        return "<Middleware {}>".format(
+            ", ".join("{}:{}".format(kind, getattr(func, "__name__", func))
+                      for kind, func in self.layers))
+
+
+class Chain:
+    """
+    A compiled middleware chain, its layers flattened into one tuple.
+
+    :meth:`run` answers a request through the chain. The engines awaiting a
+    coroutine hook split it into :meth:`enter`, before the hook, and
+    :meth:`leave`, once it returned.
+    """
+
+    __slots__ = ("layers",)
+
+    def __init__(self, layers=()):
+        """
+        :param layers (iterable): The ``(kind, func)`` layers, in order.
+        """
+        self.layers = tuple(layers)
+
+    def run(self, req, resp, endpoint):
+        """
+        Answer a request through the chain.
+
+        :param req (Request): The prepared :class:`Request <Request>`.
+        :param resp (Response): The :class:`Response <Response>` to fill.
+        :param endpoint (callable): Called as ``endpoint(req, resp)`` for
+                                    the raw response, past the layers.
+
+        :rtype bytes: The raw response.
+        """
+        if not self.layers:
+            return endpoint(req, resp)
+        response, unwind = self.enter(req, resp)
+        if unwind is None:
+            return response
+        try:
+            response = endpoint(req, resp)
+        except Exception as e:
+            return self.leave(req, resp, unwind, error=e)
+        return self.leave(req, resp, unwind, response)
+
+    def enter(self, req, resp):
+        """
+        Run the layers on the way in.
+
+        :rtype tuple: (response, unwind): the raw response of a layer that
+                      answered, its inner layers already left, and None;
+                      else None and the layers to :meth:`leave`.
+        """
+        unwind = []
+        for kind, func in self.layers:
+            if kind == AFTER:
+                unwind.append((kind, func))
+                continue
+            try:
+                if kind == BEFORE:
+                    response = func(req, resp)
+                else:
+                    step = func(req, resp)
+                    try:
+                        next(step)
+                    except StopIteration as stop:
+                        response = stop.value
+                    else:
+                        unwind.append((kind, step))
+                        continue
+            except Exception as e:
+                return self.leave(req, resp, unwind, error=e), None
+            if response is not None:
+                return self.leave(req, resp, unwind, response), None
+        return None, unwind
+
+    def leave(self, req, resp, unwind, response=None, error=None):
+        """
+        Run the entered layers on the way out, innermost first.
+
+        :param unwind (list): The layers returned by :meth:`enter`.
+        :param response (bytes): The raw response of the handler.
+        :param error (Exception): The error of the handler, thrown into the
+                                  ``around`` layers; ``after`` layers are
+                                  skipped until one of them answers.
+
+        :rtype bytes: The raw response.
+
+        :raise Exception: ``error``, or the error of a layer, if no
+                          ``around`` layer answered it.
+        """
+        for kind, step in reversed(unwind):
+            try:
+                if kind == AFTER:
+                    if error is None:
+                        result = step(req, resp, response)
+                        if result is not None:
+                            response = result
+                    continue
+                if error is None:
+                    step.send(response)
+                else:
+                    step.throw(error)
+                # Yielded more than once, its output is ignored.
+                step.close()
+            except StopIteration as stop:
+                if stop.value is not None:
+                    response, error = stop.value, None
+            except Exception as e:
+                error = e
+        if error is not None:
+            raise error
+        return response
+
+
+#: Chain of the handlers compiled by no :class:`Pipeline <Pipeline>`.
+EMPTY = Chain()
+
+
+def not_allowed(req, resp):
+    """Before hook answering 405 when a route of the path exists for other
+    methods only."""
+    if req.allowed:
+        return error_response(405, "Method Not Allowed", allow=req.allowed)
+    return None
+
+
+def login(req, resp):
+    """Before hook of the static site: the login form, ``POST /login``."""
+    if req.method != 'POST' or req.path != '/login':
+        return None
+    form_data = req.form
+    username = form_data.get('username', '')
+    password = form_data.get('password', '')
+
+    log.debug("Login attempt: username={}", username)
+
+    # Check credentials (admin/password)
+    if username == 'admin' and password == 'password':
+        # Login successful - set cookie and serve index page
+        resp.set_cookie('auth', 'true')
+        resp.status_code = 200
+        req.path = '/index.html'  # Serve index page
+        return resp.build_response(req)
+    # Login failed - return 401
+    return error_response(401, "Unauthorized")
+
+
+def protect(public_paths=PUBLIC_PATHS, public_prefixes=PUBLIC_PREFIXES):
+    """
+    Build the before hook guarding the protected pages of the static site.
+
+    The public paths and prefixes are subtracted from
+    :data:`PROTECTED_PATHS` here, once, so that a request is checked with
+    one set lookup.
+
+    :param public_paths (iterable): Paths served without the auth cookie.
+    :param public_prefixes (tuple): Prefixes served without the auth cookie.
+
+    :rtype callable: ``protect(request, response)``.
+    """
+    protected = frozenset(path for path in PROTECTED_PATHS
+                          if path not in public_paths
+                          and not path.startswith(tuple(public_prefixes)))
+
+    def protect(req, resp):
+        if req.path not in protected:
+            return None
+        if req.cookies.get('auth', '') == 'true':
+            # Authenticated - the endpoint serves the requested page
+            if req.path == '/':
+                req.path = '/index.html'
+            return None
+        # Not authenticated - return 401 or redirect to login
+        return error_response(401, "Unauthorized - Please login first")
+
+    return protect
+
+
+def scrape(metrics):
+    """The before hook serving the ``metrics`` on their path."""
+    def scrape(req, resp):
+        if metrics.is_scrape(req.method, req.path):
+            return metrics.response()
+        return None
+    return scrape
+
+
+def profile(profiler):
+    """The before hook serving the admin routes of the ``profiler``."""
+    def profile(req, resp):
+        if profiler.handles(req.path):
+            return profiler.response(req.method, req.path)
+        return None
+    return profile
+
+
+class Pipeline:
+    """
+    The middleware chains of a server, compiled once at startup.
+
+    Attributes:
+        fallback (Chain): Chain of the requests without a route.
+    """
+
+    __attrs__ = [
+        "fallback",
+    ]
+
+    def __init__(self, routes=None, middleware=None, metrics=None, profiler=None,
+                 public_paths=PUBLIC_PATHS, public_prefixes=PUBLIC_PREFIXES):
+        """
+        Compile the chains, and set the one of each handler of ``routes``
+        as its ``_route_chain``.
+
+        :param routes (Router): The routes, or a ``(method, path) -> handler``
+                                dict.
+        :param middleware (Middleware): Middleware of the app.
+        :param metrics (Metrics): Metrics served on their path, if any.
+        :param profiler (Profiler): Profiler served on its admin routes, if any.
+        :param public_paths (iterable): Paths of the static site served
+                                        without the auth cookie.
+        :param public_prefixes (tuple): Prefixes of the static site served
+                                        without the auth cookie.
+        """
+        head = []
+        if metrics is not None:
+            head.append((BEFORE, scrape(metrics)))
+        if profiler is not None:
+            head.append((BEFORE, profile(profiler)))
+        if middleware is not None:
+            head.extend(middleware.layers)
+
+        self.fallback = Chain(head + [(BEFORE, not_allowed),
+                                      (BEFORE, login),
+                                      (BEFORE, protect(public_paths, public_prefixes))])
+        handlers = getattr(routes, "routes", routes) or {}
+        for handler in set(handlers.values()):
+            own = getattr(handler, "_route_middleware", None)
+            handler._route_chain = Chain(head + (own.layers if own is not None else []))
+
+    def __repr__(self):
+        return "<Pipeline fallback of {} layers>".format(len(self.fallback.layers))
@@ -0,0 +1,87 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.objectpool
+~~~~~~~~~~~~~~~~~
+
+This module provides a per-worker pool of reusable objects. Each thread keeps
+its own free list, so taking and giving back an object needs no lock; an
+object given back is ``reset()`` and kept for the next request served by the
+same thread.
+
+It recycles the :class:`Request <Request>`, :class:`Response <Response>` and
+:class:`HttpAdapter <HttpAdapter>` objects when the backend runs with
+``object_pool=True``.
+
+Usage Example:
+--------------
+>>> requests = ObjectPool(Request)
+>>> req = requests.acquire()
+>>> requests.release(req)
+"""
+
+import threading
+
+#: Maximum number of free objects kept per thread.
+POOL_SIZE = 16
+
+
+class ObjectPool:
+    """
+    Per-thread free lists of objects with a ``reset()`` method.
+
+    Attributes:
+        factory (callable): Builds a new object when the free list is empty.
+        size (int): Maximum number of free objects kept per thread.
+    """
+
+    __attrs__ = [
+        "factory",
+        "size",
+    ]
+
+    def __init__(self, factory, size=POOL_SIZE):
+        self.factory = factory
+        self.size = size
+        self._local = threading.local()
+
+    def acquire(self):
+        """
+        Take a free object of the calling thread, or build one.
+
+        :rtype object: The object, in its reset state.
+        """
+        free = self._free()
+        if free:
+            return free.pop()
+        return self.factory()
+
+    def release(self, obj):
+        """
+        Reset ``obj`` and keep it for the calling thread, unless its free
+        list is full.
+
+        :param obj: An object taken from the pool.
+        """
+        free = self._free()
+        if len(free) < self.size:
+            obj.reset()
+            free.append(obj)
+
+    def _free(self):
+        """Free list of the calling thread."""
+        try:
+            return self._local.free
+        except AttributeError:
+            free = self._local.free = []
+            return free
@@ -0,0 +1,199 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.parser
+~~~~~~~~~~~~~~~~~
+
+This module provides the bytes-level parser of the request messages framed
+by :class:`HttpReader <HttpReader>`.
+
+The message is never decoded as a whole. :func:`parse_request` only splits
+the request line off and bounds the header block; :class:`Headers <Headers>`
+looks a field up in that block the first time it is read, and decodes that
+value only. The body is left as bytes.
+
+Usage::
+
+  >>> method, target, version, headers, body = parse_request(msg)
+  >>> headers.get("cookie")        # found and decoded here, on first access
+"""
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+
+class Headers(MutableMapping):
+    """
+    Header fields of a message, by lowercase name.
+
+    The fields stay in the message until read: a lookup searches a lowercase
+    copy of the header block, made on the first one, and caches the decoded
+    value. Iterating, deleting or counting the fields parses them all once.
+    Values set by the server are plain ``str``.
+
+    As in the ``dict`` it replaces, and in :func:`get_header
+    <daemon.utils.get_header>`, the last of repeated fields wins. The lookup
+    relies on the framing of :class:`HttpReader <HttpReader>`, which rejects
+    the header blocks with bare LF line ends or obs-fold lines: a ``\n`` of
+    the block always starts a field.
+    """
+
+    __slots__ = ("_data", "_start", "_end", "_lower", "_fields", "_parsed")
+
+    def __init__(self, data=b"", start=0, end=0):
+        """
+        :param data (bytes): The message.
+        :param start (int): Offset of the ``\\r\\n`` ending the request line.
+        :param end (int): Offset of the ``\\r\\n`` ending the last field.
+        """
+        self._data = data
+        self._start = start
+        self._end = end
+        #: Lowercase copy of the header block, made on the first lookup.
+        self._lower = None
+        #: lowercase name (str) -> value (str), read or set so far.
+        self._fields = {}
+        #: Whether ``_fields`` holds every field of the block.
+        self._parsed = start >= end
+
+    def _find(self, name):
+        """
+        Offsets of the value of ``name`` in the message, OWS included.
+
+        :rtype tuple: (start, stop), None when absent.
+        """
+        lower = self._lower
+        if lower is None:
+            lower = self._lower = self._data[self._start:self._end + 2].lower()
+        try:
+            key = b"\n" + name.encode('latin-1') + b":"
+        except UnicodeEncodeError:
+            return None
+        at = lower.rfind(key)
+        if at < 0:
+            return None
+        start = at + len(key)
+        stop = lower.find(b"\r", start)
+        if stop < 0:
+            stop = len(lower)
+        return self._start + start, self._start + stop
+
+    def _parse(self):
+        """Parse every field of the block into ``_fields``, once."""
+        if self._parsed:
+            return
+        fields = {}
+        for line in self._data[self._start + 2:self._end].split(b"\r\n"):
+            name, colon, value = line.partition(b":")
+            if colon and name:
+                fields[name.lower().decode('latin-1')] = str(value, 'utf-8', 'replace').strip(" \t")
+        # What was read is the same; what was set overrides the message.
+        fields.update(self._fields)
+        self._fields = fields
+        self._parsed = True
+
+    def __getitem__(self, name):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name, value):
+        self._fields[name] = value
+
+    def __delitem__(self, name):
+        self._parse()
+        del self._fields[name]
+
+    def __iter__(self):
+        self._parse()
+        return iter(self._fields)
+
+    def __len__(self):
+        self._parse()
+        return len(self._fields)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def get(self, name, default=None):
+        # Not the Mapping one, which raises and catches KeyError on a miss.
+        value = self._fields.get(name)
+        if value is not None or self._parsed:
+            return default if value is None else value
+        span = self._find(name)
+        if span is None:
+            return default
+        value = self._fields[name] = str(self._data[span[0]:span[1]], 'utf-8', 'replace').strip(" \t")
+        return value
+
+    def raw(self, name, default=None):
+        """
+        The value of ``name`` without decoding it.
+
+        :rtype memoryview: A slice of the message, OWS stripped, or the
+                           encoded value once read or set; ``default`` when
+                           absent.
+        """
+        value = self._fields.get(name)
+        if value is not None:
+            return memoryview(value.encode('utf-8'))
+        span = None if self._parsed else self._find(name)
+        if span is None:
+            return default
+        start, stop = span
+        data = self._data
+        while start < stop and data[start] in b" \t":
+            start += 1
+        while stop > start and data[stop - 1] in b" \t":
+            stop -= 1
+        return memoryview(data)[start:stop]
+
+    def __repr__(self):
+        # The repr of the plain dict the hooks have always received.
+        self._parse()
+        return repr(self._fields)
+
+
+def parse_request(data):
+    """
+    Parse a complete request message: its request line, and the bounds of
+    its header block for :class:`Headers <Headers>`.
+
+    :param data (bytes): The message, as framed by
+                         :class:`HttpReader <HttpReader>`.
+
+    :rtype tuple: (method, target, version, headers, body): the request line
+                  decoded, :class:`Headers <Headers>` and the body (bytes).
+
+    :raise ValueError: if the request line is malformed.
+    """
+    end = data.find(b"\r\n\r\n")
+    if end < 0:
+        end = len(data)
+        body = b""
+    else:
+        body = data[end + 4:]
+
+    eol = data.find(b"\r\n", 0, end)
+    if eol < 0:
+        eol = end
+    line = data[:eol].split()
+    if len(line) != 3:
+        raise ValueError("Malformed request line")
+    method, target, version = line
+
+    return (method.decode('latin-1'), target.decode('utf-8', 'replace'),
+            version.decode('latin-1'), Headers(data, eol, end), body)
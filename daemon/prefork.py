@@ -0,0 +1,204 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.prefork
+~~~~~~~~~~~~~~~~~
+
+This module provides the pre-fork multi-process mode of the backend and the
+proxy. A :class:`Supervisor <Supervisor>` forks ``N`` worker processes; each
+worker binds its own listening socket with ``SO_REUSEPORT`` so the kernel
+spreads incoming connections across them, and every worker runs its engine
+under its own GIL.
+
+The supervisor:
+
+- restarts a worker that crashes (non-zero exit or killed by a signal),
+- forwards ``SIGTERM``, ``SIGINT``, ``SIGHUP``, ``SIGUSR1`` and ``SIGUSR2``
+  to the workers; ``SIGTERM`` and ``SIGINT`` also stop it once the workers
+  have exited, while a worker killed by ``SIGHUP`` is started again, which
+  reloads the workers one by one.
+
+Usage Example:
+--------------
+>>> Supervisor(lambda: run_backend(ip, port, routes, reuse_port=True), 4).run()
+"""
+
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+from .accesslog import flush as flush_access_log
+from .logger import get_logger, flush as flush_log
+
+log = get_logger("Supervisor")
+
+#: Signals of the supervisor passed on to the workers.
+FORWARDED_SIGNALS = (
+    signal.SIGTERM,
+    signal.SIGINT,
+    signal.SIGHUP,
+    signal.SIGUSR1,
+    signal.SIGUSR2,
+)
+
+#: Signals stopping the supervisor once the workers have exited.
+STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+#: Minimum seconds between two starts of the same worker.
+RESTART_DELAY = 1.0
+
+
+def listen_socket(ip, port, reuse_port=False, backlog=50):
+    """
+    Create a listening TCP socket.
+
+    :param ip (str): IP address to bind.
+    :param port (int): Port number to listen on.
+    :param reuse_port (bool): Set ``SO_REUSEPORT`` so that several processes
+                              can listen on the same address.
+    :param backlog (int): Listen backlog.
+
+    :rtype socket.socket: The listening socket.
+
+    :raise socket.error: if the address cannot be bound.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if reuse_port:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        server.bind((ip, port))
+        server.listen(backlog)
+    except socket.error:
+        server.close()
+        raise
+    return server
+
+
+class Supervisor:
+    """
+    Forks and watches a fixed number of worker processes.
+
+    Attributes:
+        target (callable): Called without arguments in each worker; the
+                           worker exits when it returns.
+        workers (int): Number of worker processes.
+        name (str): Name of the workers in the log lines.
+    """
+
+    __attrs__ = [
+        "target",
+        "workers",
+        "name",
+    ]
+
+    def __init__(self, target, workers, name="worker"):
+        """
+        Initialize a new Supervisor instance.
+
+        :param target (callable): Body of a worker process.
+        :param workers (int): Number of worker processes.
+        :param name (str): Name of the workers in the log lines.
+
+        :raise ValueError: If ``workers`` is not positive or the platform
+                           has no ``fork`` or ``SO_REUSEPORT``.
+        """
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        if not hasattr(os, "fork") or not hasattr(socket, "SO_REUSEPORT"):
+            raise ValueError("Multi-process mode requires fork and SO_REUSEPORT")
+
+        self.target = target
+        self.workers = workers
+        self.name = name
+        #: Live workers, pid -> (index, start time).
+        self._children = {}
+        #: Set once a stop signal is received.
+        self._stopping = False
+
+    def run(self):
+        """Start the workers and supervise them until they have all exited."""
+        for signum in FORWARDED_SIGNALS:
+            signal.signal(signum, self._forward)
+
+        log.info("Starting {} {} processes", self.workers, self.name)
+        for index in range(self.workers):
+            self.spawn(index)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            index, started = self._children.pop(pid, (None, 0))
+            if index is None:
+                continue
+            if self._stopping or status == 0:
+                log.info("{} {} (pid {}) exited", self.name, index, pid)
+                continue
+
+            if os.WIFSIGNALED(status):
+                cause = "killed by signal {}".format(os.WTERMSIG(status))
+            else:
+                cause = "exit code {}".format(os.WEXITSTATUS(status))
+            log.warning("{} {} (pid {}) died ({}), restarting",
+                        self.name, index, pid, cause)
+            # Avoid a tight restart loop when a worker crashes at startup.
+            delay = started + RESTART_DELAY - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            if not self._stopping:
+                self.spawn(index)
+
+    def spawn(self, index):
+        """
+        Fork the worker ``index``.
+
+        :param index (int): Index of the worker.
+        """
+        # Do not let the child flush the parent's pending output again.
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        pid = os.fork()
+        if pid:
+            self._children[pid] = (index, time.time())
+            return
+
+        for signum in FORWARDED_SIGNALS:
+            signal.signal(signum, signal.SIG_DFL)
+        code = 0
+        try:
+            self.target()
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            flush_access_log()
+            flush_log()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def _forward(self, signum, frame):
+        """Signal handler: pass the signal on to every worker."""
+        if signum in STOP_SIGNALS:
+            self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
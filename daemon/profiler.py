@@ -0,0 +1,282 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.profiler
+~~~~~~~~~~~~~~~~~
+
+This module provides a sampling profiler of the live process. A background
+thread takes the stacks of every other thread from
+:func:`sys._current_frames` at a fixed interval and counts them in the
+collapsed format of flame graph tools, one stack per line, root first::
+
+    Thread (handle_client);httpadapter.py:handle_client;httpadapter.py:dispatch 42
+
+The samples are wall-clock: a thread blocked in ``recv`` or waiting on a
+lock is counted where it waits, which shows where the request threads
+spend their time, not only where they burn CPU.
+
+It is driven through admin routes below ``path`` (``/debug/profile``):
+
+- ``POST /debug/profile/start?interval=0.01&duration=30``: reset and start,
+  stopping by itself after ``duration`` seconds. Both are finite positive
+  seconds, at most :data:`MAX_INTERVAL` and :data:`MAX_DURATION`; else 400.
+- ``POST /debug/profile/stop``: stop and return the collapsed stacks.
+- ``GET /debug/profile``: the collapsed stacks sampled so far.
+
+Usage Example:
+--------------
+>>> profiler = Profiler("/debug/profile")
+>>> profiler.start(interval=0.005, duration=10)
+>>> profiler.stop()
+>>> open("out.folded", "w").write(profiler.collapsed())
+"""
+
+import math
+import os
+import re
+import sys
+import threading
+import time
+from urllib.parse import parse_qs
+
+from .utils import text_response
+from .logger import get_logger
+
+log = get_logger("Profiler")
+
+#: Seconds between two samples.
+INTERVAL = 0.01
+
+#: Seconds after which a started profiler stops by itself.
+DURATION = 30
+
+#: Largest ``interval`` accepted by the admin routes, in seconds.
+MAX_INTERVAL = 1.0
+
+#: Largest ``duration`` accepted by the admin routes, in seconds.
+MAX_DURATION = 3600
+
+#: Distinct stacks counted; further new stacks are counted as ``<other>``.
+MAX_STACKS = 20000
+
+#: Seconds between two refreshes of the thread names.
+NAMES_INTERVAL = 1.0
+
+_DIGITS = re.compile(r"-\d+")
+
+
+class Profiler:
+    """
+    Statistical profiler sampling the stacks of the process' threads.
+
+    Attributes:
+        path (str): Prefix of the admin routes.
+        interval (float): Seconds between two samples.
+        duration (float): Seconds after which the profiler stops.
+        samples (int): Samples taken since the last start.
+        running (bool): Whether the sampling thread runs.
+    """
+
+    __attrs__ = [
+        "path",
+        "interval",
+        "duration",
+        "samples",
+        "running",
+    ]
+
+    def __init__(self, path="/debug/profile", interval=INTERVAL, duration=DURATION):
+        """
+        Initialize a new Profiler instance, stopped.
+
+        :param path (str): Prefix of the admin routes.
+        :param interval (float): Default seconds between two samples.
+        :param duration (float): Default seconds after which it stops.
+        """
+        self.path = path.rstrip("/")
+        self.interval = interval
+        self.duration = duration
+        self.samples = 0
+        self.running = False
+        #: Collapsed stack -> samples; written by the sampling thread only.
+        self._stacks = {}
+        #: Code object -> frame label.
+        self._labels = {}
+        #: Thread ident -> label of the root frame.
+        self._names = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self, interval=None, duration=None):
+        """
+        Reset the samples and start the sampling thread.
+
+        :param interval (float): Seconds between two samples.
+        :param duration (float): Seconds after which the profiler stops.
+
+        :rtype bool: False if it was already running.
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self.interval = interval or self.interval
+            self.duration = duration or self.duration
+            self._stacks = {}
+            self.samples = 0
+            self._stop.clear()
+            self.running = True
+            self._thread = threading.Thread(target=self.run, name="Profiler",
+                                            daemon=True)
+            self._thread.start()
+        log.info("Sampling every {}s for at most {}s", self.interval, self.duration)
+        return True
+
+    def stop(self):
+        """Stop the sampling thread and wait for its last sample."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        self._stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def run(self):
+        """Sample until stopped or ``duration`` elapsed."""
+        own = threading.get_ident()
+        deadline = time.monotonic() + self.duration
+        refreshed = 0
+        try:
+            while not self._stop.wait(self.interval):
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                if now - refreshed >= NAMES_INTERVAL:
+                    self.refresh_names()
+                    refreshed = now
+                self.sample(sys._current_frames(), own)
+        finally:
+            self.running = False
+            log.info("Stopped after {} samples, {} stacks", self.samples, len(self._stacks))
+
+    def refresh_names(self):
+        """Map the threads to their names, numbers stripped (``Thread-3`` to ``Thread``)."""
+        self._names = {thread.ident: _DIGITS.sub("", thread.name)
+                       for thread in threading.enumerate()}
+
+    def sample(self, frames, own=None):
+        """
+        Count the current stack of every thread but ``own``.
+
+        :param frames (dict): Thread ident -> innermost frame.
+        :param own (int): Ident of the sampling thread.
+        """
+        stacks = self._stacks
+        labels = self._labels
+        names = self._names
+        for ident, frame in frames.items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = "{}:{}".format(
+                        os.path.basename(code.co_filename), code.co_name)
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(names.get(ident, "Thread"))
+            stack.reverse()
+            key = ";".join(stack)
+            if key not in stacks and len(stacks) >= MAX_STACKS:
+                key = "<other>"
+            stacks[key] = stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def collapsed(self):
+        """
+        The sampled stacks in the collapsed format, most frequent first.
+
+        :rtype str:
+        """
+        stacks = sorted(list(self._stacks.items()), key=lambda item: -item[1])
+        return "".join("{} {}\n".format(stack, count) for stack, count in stacks)
+
+    def handles(self, path):
+        """
+        :rtype bool: True if ``path`` is one of the admin routes.
+        """
+        if path is None:
+            return False
+        path = path.split("?", 1)[0]
+        return path == self.path or path.startswith(self.path + "/")
+
+    def response(self, method, path):
+        """
+        Answer a request to an admin route.
+
+        :param method (str): Method of the request.
+        :param path (str): Path of the request, query included.
+
+        :rtype bytes: The raw HTTP response.
+        """
+        path, _, query = path.partition("?")
+        action = path[len(self.path):].strip("/")
+
+        if action == "":
+            if method != "GET":
+                return text_response("Method Not Allowed\n", "405 Method Not Allowed")
+            return text_response(self.collapsed())
+        if action not in ("start", "stop"):
+            return text_response("Not Found\n", "404 Not Found")
+        if method != "POST":
+            return text_response("Method Not Allowed\n", "405 Method Not Allowed")
+
+        if action == "stop":
+            self.stop()
+            return text_response(self.collapsed())
+
+        params = parse_qs(query)
+        try:
+            interval = _seconds(params, "interval", MAX_INTERVAL)
+            duration = _seconds(params, "duration", MAX_DURATION)
+        except ValueError as e:
+            return text_response("{}\n".format(e), "400 Bad Request")
+        if not self.start(interval, duration):
+            return text_response("Already running\n", "409 Conflict")
+        return text_response("Sampling every {}s for at most {}s\n".format(
+            self.interval, self.duration))
+
+
+def _seconds(params, name, limit):
+    """
+    Read a number of seconds from the query of an admin route.
+
+    :param params (dict): The parsed query.
+    :param name (str): Name of the parameter.
+    :param limit (float): Largest value accepted.
+
+    :rtype float: The value, or None if the parameter is absent.
+
+    :raise ValueError: if the value is not a finite number in ``(0, limit]``.
+    """
+    if name not in params:
+        return None
+    try:
+        value = float(params[name][0])
+    except ValueError:
+        raise ValueError("{} must be a number".format(name))
+    if not math.isfinite(value) or not 0 < value <= limit:
+        raise ValueError("{} must be a number of seconds in (0, {}]".format(name, limit))
+    return value
@@ -25,13 +25,31 @@ Requirement:
 - response: customized :class: `Response <Response>` utilities.
 - httpadapter: :class: `HttpAdapter <HttpAdapter >` adapter for HTTP request processing.
 - dictionary: :class: `CaseInsensitiveDict <CaseInsensitiveDict>` for managing headers and cookies.
+- reactor: non-blocking ``selectors`` engine used with ``engine="selectors"``.
+- timers: idle, read and write deadlines of the client connections.
+- admission: cap of the requests forwarded at once, shed with ``503``.
+- metrics: latencies and counters by upstream, served on an opt-in path.
 
 """
 import socket
 import threading
+import time
 from .response import *
-from .httpadapter import HttpAdapter
+from .reactor import run_reactor_proxy
+from .prefork import Supervisor, listen_socket
+from .handoff import Handoff, DRAIN_TIMEOUT
+from .httpadapter import HttpAdapter, IDLE_TIMEOUT
 from .dictionary import CaseInsensitiveDict
+from .reader import HttpReader, MessageError, MAX_HEADER_SIZE, MAX_BODY_SIZE, decode_chunks
+from .timers import Deadline, TimerWheel, READ_TIMEOUT, WRITE_TIMEOUT, shutdown
+from .admission import Admission, QUEUE_TIMEOUT
+from .accesslog import AccessLog, MAX_BYTES as ACCESS_LOG_MAX_BYTES
+from .metrics import Metrics
+from .utils import (frame_response, get_header, is_keep_alive, parse_content_length,
+                    new_request_id, server_timing)
+from .logger import get_logger
+
+log = get_logger("Proxy")
 
 #: A dictionary mapping hostnames to backend IP and port tuples.
 #: Used to determine routing targets for incoming requests.
@@ -41,41 +59,67 @@ PROXY_PASS = {
     "app2.local": ('192.168.56.103', 9002),
 }
 
-
-def forward_request(host, port, request):
+#: Serving engines supported by :func:`run_proxy`.
+ENGINES = ("threaded", "selectors")
+
+#: Prebuilt response for unreachable or unknown backends.
+RESPONSE_404 = (
+    "HTTP/1.1 404 Not Found\r\n"
+    "Content-Type: text/plain\r\n"
+    "Content-Length: 13\r\n"
+    "Connection: close\r\n"
+    "\r\n"
+    "404 Not Found"
+).encode('utf-8')
+
+#: Prebuilt response for errors raised while proxying.
+RESPONSE_500 = (
+    "HTTP/1.1 500 Internal Server Error\r\n"
+    "Content-Type: text/plain\r\n"
+    "Content-Length: 21\r\n"
+    "Connection: close\r\n"
+    "\r\n"
+    "Internal Server Error"
+).encode('utf-8')
+
+#: Routing target of the requests for the metrics, answered by the proxy.
+SCRAPE_TARGET = ("local", None)
+
+
+def forward_request(host, port, request, metrics=None):
     """
     Forwards an HTTP request to a backend server and retrieves the response.
 
     :params host (str): IP address of the backend server.
     :params port (int): port number of the backend server.
-    :params request (str): incoming HTTP request.
+    :params request (bytes): HTTP request to forward.
+    :params metrics (Metrics): metrics counting the exchange, if any.
 
     :rtype bytes: Raw HTTP response from the backend server. If the connection
                   fails, returns a 404 Not Found response.
     """
 
     backend = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    started = time.monotonic()
 
     try:
         backend.connect((host, port))
-        backend.sendall(request.encode())
+        backend.sendall(request)
         response = b""
         while True:
             chunk = backend.recv(4096)
             if not chunk:
                 break
             response += chunk
-        return response
     except socket.error as e:
-      print("Socket error: {}".format(e))
-      return (
-            "HTTP/1.1 404 Not Found\r\n"
-            "Content-Type: text/plain\r\n"
-            "Content-Length: 13\r\n"
-            "Connection: close\r\n"
-            "\r\n"
-            "404 Not Found"
-        ).encode('utf-8')
+      log.error("Socket error: {}", e)
+      response = RESPONSE_404
+    finally:
+        backend.close()
+    if metrics is not None:
+        metrics.observe_exchange(request, response, len(response),
+                                 time.monotonic() - started, "{}:{}".format(host, port))
+    return response
 
 
 def resolve_routing_policy(hostname, routes):
@@ -88,17 +132,15 @@ def resolve_routing_policy(hostname, routes):
     :params routes (dict): dictionary mapping hostnames and location.
     """
 
-    print(hostname)
     proxy_map, policy = routes.get(hostname,('127.0.0.1:9000','round-robin'))
-    print(proxy_map)
-    print(policy)
+    log.debug("hostname {} maps to {} ({})", hostname, proxy_map, policy)
 
     proxy_host = ''
     proxy_port = '9000'
     if isinstance(proxy_map, list):
         if len(proxy_map) == 0:
-            print("[Proxy] Emtpy resolved routing of hostname {}".format(hostname))
-            print("Empty proxy_map result")
+            log.warning("Emtpy resolved routing of hostname {}", hostname)
+            log.debug("Empty proxy_map result")
             # TODO: implement the error handling for non mapped host
             #       the policy is design by team, but it can be 
             #       basic default host in your self-defined system
@@ -115,12 +157,291 @@ def resolve_routing_policy(hostname, routes):
             proxy_host = '127.0.0.1'
             proxy_port = '9000'
     else:
-        print("[Proxy] resolve route of hostname {} is a singulair to".format(hostname))
+        log.debug("resolve route of hostname {} is a singulair to", hostname)
         proxy_host, proxy_port = proxy_map.split(":", 1)
 
     return proxy_host, proxy_port
 
-def handle_client(ip, port, conn, addr, routes):
+def extract_hostname(request):
+    """
+    Extract the hostname from the Host header of a raw HTTP request.
+
+    :params request (str): incoming HTTP request.
+
+    :rtype str: the Host header value, ``localhost`` if it is missing.
+    """
+    for line in request.splitlines():
+        if line.lower().startswith('host:'):
+            return line.split(':', 1)[1].strip()
+        if not line:
+            break
+    return "localhost"  # Default hostname if not found
+
+def upstream_request(request):
+    """
+    Prepare a raw client request for the backend.
+
+    The backends keep HTTP/1.1 connections alive, while the reactor proxy
+    relays the backend response until the connection closes, so the
+    forwarded request always carries ``Connection: close``.
+
+    :params request (bytes): incoming HTTP request.
+
+    :rtype bytes: the request to forward.
+    """
+    end = request.find(b"\r\n\r\n")
+    if end < 0:
+        return request
+
+    lines = request[:end].split(b"\r\n")
+    head = [lines[0]]
+    for line in lines[1:]:
+        name = line.split(b":", 1)[0].strip().lower()
+        if name not in (b"connection", b"keep-alive"):
+            head.append(line)
+    head.append(b"Connection: close")
+    return b"\r\n".join(head) + request[end:]
+
+def with_request_id(request):
+    """
+    Find the ``X-Request-ID`` of a raw client request, adding a new one when
+    it has none, so the backend logs the request under the same ID.
+
+    :params request (bytes): incoming HTTP request.
+
+    :rtype tuple: (bytes, str) the request to forward and its ID.
+    """
+    end = request.find(b"\r\n\r\n")
+    request_id = get_header(request[:end] if end >= 0 else request, b"x-request-id")
+    if request_id:
+        return request, request_id.decode('latin-1')
+    request_id = new_request_id()
+    line_end = request.find(b"\r\n")
+    if line_end < 0:
+        return request, request_id
+    return (request[:line_end] + b"\r\nX-Request-ID: " + request_id.encode('ascii')
+            + request[line_end:]), request_id
+
+def trace_headers(request_id, phases=None, response=None):
+    """
+    Header lines added by the proxy to a response.
+
+    :params request_id (str): ID of the request.
+    :params phases (list): (name, seconds) of the proxy phases, if timed.
+    :params response (bytes): the upstream response, which may already carry
+                              the ``X-Request-ID``.
+
+    :rtype list: header lines (bytes).
+    """
+    headers = []
+    if request_id and (response is None or get_header(
+            response[:response.find(b"\r\n\r\n")], b"x-request-id") is None):
+        headers.append(b"X-Request-ID: " + request_id.encode('latin-1'))
+    if phases:
+        headers.append(b"Server-Timing: " + server_timing(phases))
+    return headers
+
+def resolve_upstream(hostname, routes):
+    """
+    Resolve the backend address of a hostname through the routing policy.
+
+    :params hostname (str): hostname of the request.
+    :params routes (dict): dictionary mapping hostnames and location.
+
+    :rtype tuple: (host, port) of the backend, port as an integer.
+    """
+    resolved_host, resolved_port = resolve_routing_policy(hostname, routes)
+    try:
+        resolved_port = int(resolved_port)
+    except ValueError:
+        log.warning("Not a valid integer")
+        resolved_port = 9000
+    return resolved_host, resolved_port
+
+class Upstream:
+    """
+    A persistent connection from the proxy to one backend, on which the
+    requests of a client are pipelined.
+
+    Attributes:
+        host (str): IP address of the backend.
+        port (int): Port number of the backend.
+        sock (socket.socket): Connected socket, None until first used.
+        timings (list): ``(connect, ttfb, relay)`` seconds of each response
+                        of the last :meth:`exchange`.
+    """
+
+    __attrs__ = [
+        "host",
+        "port",
+        "sock",
+        "timings",
+    ]
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.sock = None
+        self.timings = []
+        #: Bytes received past the last complete response.
+        self._buffer = bytearray()
+        #: :func:`time.perf_counter` when the head of the last response was read.
+        self._head_at = 0
+
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port))
+        self._buffer = bytearray()
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def exchange(self, requests):
+        """
+        Send pipelined requests and read their responses in order.
+
+        When the backend closes the connection after answering part of the
+        pipeline (``Connection: close``), the remaining requests are sent
+        again on a new connection. A reused connection that the backend
+        closed while idle is reopened once.
+
+        :params requests (list): raw HTTP requests (bytes).
+
+        :rtype list: raw HTTP responses (bytes), one per request; their
+                     timings are left in ``timings``.
+
+        :raise socket.error: if the backend cannot be reached or closes the
+                             connection without answering.
+        """
+        responses = []
+        self.timings = timings = []
+        while len(responses) < len(requests):
+            pending = requests[len(responses):]
+            reused = self.sock is not None
+            clock = time.perf_counter()
+            if not reused:
+                self.connect()
+            connect = time.perf_counter() - clock
+
+            answered = 0
+            reusable = True
+            try:
+                self.sock.sendall(b"".join(pending))
+                clock = time.perf_counter()
+                for _ in pending:
+                    response, reusable = self.read_response()
+                    if response is None:
+                        break
+                    done = time.perf_counter()
+                    # A pipelined response waits from the end of the previous one.
+                    timings.append((connect, self._head_at - clock, done - self._head_at))
+                    connect = 0.0
+                    clock = done
+                    responses.append(response)
+                    answered += 1
+                    if not reusable:
+                        break
+            except (ConnectionResetError, BrokenPipeError):
+                if not reused or answered:
+                    raise
+                reusable = False
+
+            if not reusable or answered < len(pending):
+                self.close()
+            if answered == 0 and not reused:
+                raise socket.error("Backend {}:{} closed without answering".format(
+                    self.host, self.port))
+        return responses
+
+    def read_response(self):
+        """
+        Read one response, framed by its chunks when it uses
+        ``Transfer-Encoding: chunked``, else by its ``Content-Length`` or,
+        without one, by the backend closing the connection. Chunked
+        responses are relayed still encoded.
+
+        :rtype tuple: (bytes, bool) the response, None if the backend closed
+                      first, and whether the connection can be reused.
+        """
+        buf = self._buffer
+        end = buf.find(b"\r\n\r\n")
+        while end < 0:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                return None, False
+            buf += chunk
+            end = buf.find(b"\r\n\r\n")
+        self._head_at = time.perf_counter()
+
+        head = bytes(buf[:end])
+        length = parse_content_length(head, None)
+        status = head[9:12]
+        if status[:1] == b"1" or status in (b"204", b"304"):
+            # Responses that never carry a body
+            length = 0
+        elif (get_header(head, b"transfer-encoding") or b"").lower().endswith(b"chunked"):
+            length = self.read_chunks(end + 4) - end - 4
+        if length is None:
+            while True:
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    break
+                buf += chunk
+            response = bytes(buf)
+            del buf[:]
+            return response, False
+
+        total = end + 4 + length
+        while len(buf) < total:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise socket.error("Backend {}:{} closed mid-response".format(
+                    self.host, self.port))
+            buf += chunk
+
+        response = bytes(buf[:total])
+        del buf[:total]
+
+        connection = (get_header(head, b"connection") or b"").lower()
+        if head.startswith(b"HTTP/1.0"):
+            return response, b"keep-alive" in connection
+        return response, b"close" not in connection
+
+    def read_chunks(self, pos):
+        """
+        Receive a chunked body until its last chunk.
+
+        :params pos (int): offset of the body in the buffer.
+
+        :rtype int: offset past the end of the body.
+
+        :raise socket.error: if the body is malformed or the backend closes
+                             the connection before its end.
+        """
+        buf = self._buffer
+        try:
+            pos, _, done = decode_chunks(buf, pos)
+            while not done:
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    raise socket.error("Backend {}:{} closed mid-response".format(
+                        self.host, self.port))
+                buf += chunk
+                pos, _, done = decode_chunks(buf, pos)
+        except MessageError as e:
+            raise socket.error("Backend {}:{} sent a malformed chunked body: {}".format(
+                self.host, self.port, e))
+        return pos
+
+def handle_client(ip, port, conn, addr, routes,
+                  max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE,
+                  handoff=None, idle_timeout=IDLE_TIMEOUT, read_timeout=READ_TIMEOUT,
+                  write_timeout=WRITE_TIMEOUT, wheel=None, admission=None,
+                  access_log=None, metrics=None, server_timing=True):
     """
     Handles an individual client connection by parsing the request,
     determining the target backend, and forwarding the request.
@@ -132,107 +453,346 @@ def handle_client(ip, port, conn, addr, routes):
     The handler sends the backend response back to the client or
     returns 404 if the hostname is unreachable or is not recognized.
 
+    The client connection is persistent: the requests it pipelines are
+    forwarded together on a persistent :class:`Upstream <Upstream>`
+    connection, and the responses are written back in order. The
+    connection closes when the client asks to, when a backend cannot be
+    reached, or when the client stays idle for ``idle_timeout`` seconds.
+    A client taking more than ``read_timeout`` seconds to send a request,
+    or blocking a response write for ``write_timeout`` seconds, is
+    disconnected.
+
     :params ip (str): IP address of the proxy server.
     :params port (int): port number of the proxy server.
     :params conn (socket.socket): client connection socket.
     :params addr (tuple): client address (IP, port).
     :params routes (dict): dictionary mapping hostnames and location.
+    :params max_header_size (int): limit of a request line and headers.
+    :params max_body_size (int): limit of a request body.
+    :params handoff (Handoff): listening socket handoff of the process; the
+                               connection closes after its current requests
+                               once it is draining.
+    :params idle_timeout (float): seconds the client may stay idle.
+    :params read_timeout (float): seconds to receive a whole request.
+    :params write_timeout (float): seconds a response write may stay blocked.
+    :params wheel (TimerWheel): timer wheel enforcing the deadlines; without
+                                it only the idle timeout is applied, per
+                                socket operation.
+    :params admission (Admission): admission control; each group of requests
+                                   forwarded to a backend takes a slot of its
+                                   ``expensive`` gate or is shed with ``503``.
+    :params access_log (AccessLog): access log of the relayed requests.
+    :params metrics (Metrics): metrics of the relayed requests; a request for
+                               ``metrics.path`` is answered by the proxy.
+    :params server_timing (bool): add a ``Server-Timing`` header with the
+                                  resolve, connect, upstream TTFB and relay
+                                  phases, after the backend's own.
+
+    Every request is forwarded with an ``X-Request-ID``, the client's or a
+    new one, which the backend echoes and both access logs record.
     """
+    reader = HttpReader(max_header_size, max_body_size)
+    upstreams = {}
+    started = 0
+
+    def log_group(requests, traces, responses, upstream=None):
+        if access_log is None and metrics is None:
+            return
+        latency = time.monotonic() - started
+        for request, (request_id, _), response in zip(requests, traces, responses):
+            if access_log is not None:
+                access_log.record_exchange(addr, request, response, len(response),
+                                           latency, upstream, request_id)
+            if metrics is not None:
+                metrics.observe_exchange(request, response, len(response),
+                                         latency, upstream)
+
+    def expire():
+        log.info("Closing {} after {} timeout", addr, deadline.kind)
+        shutdown(conn)
+
+    deadline = Deadline(wheel, expire, idle_timeout, read_timeout, write_timeout)
+    if wheel is None:
+        conn.settimeout(idle_timeout)
+    if handoff is not None:
+        handoff.opened()
+
     try:
-        request = conn.recv(1024).decode()
-        
-        # Extract hostname
-        hostname = None
-        for line in request.splitlines():
-            if line.lower().startswith('host:'):
-                hostname = line.split(':', 1)[1].strip()
-                break
-        
-        if not hostname:
-            hostname = "localhost"  # Default hostname if not found
-        
-        print("[Proxy] {} at Host: {}".format(addr, hostname))
-
-        # Resolve the matching destination in routes and convert port to integer value
-        resolved_host, resolved_port = resolve_routing_policy(hostname, routes)
-        try:
-            resolved_port = int(resolved_port)
-        except ValueError:
-            print("Not a valid integer")
-            resolved_port = 9000
-
-        if resolved_host:
-            print("[Proxy] Host name {} is forwarded to {}:{}".format(hostname, resolved_host, resolved_port))
-            response = forward_request(resolved_host, resolved_port, request)        
-        else:
-            response = (
-                "HTTP/1.1 404 Not Found\r\n"
-                "Content-Type: text/plain\r\n"
-                "Content-Length: 13\r\n"
-                "Connection: close\r\n"
-                "\r\n"
-                "404 Not Found"
-            ).encode('utf-8')
-            
-        conn.sendall(response)
-        conn.close()
-        
+        keep_alive = True
+        while keep_alive:
+            try:
+                batch = reader.read(conn, deadline)
+            except MessageError as e:
+                log.warning("Rejected request from {}: {}", addr, e)
+                deadline.writing()
+                conn.sendall(e.response)
+                return
+            if not batch:
+                return
+            started = time.monotonic()
+
+            # The connection headers are hop-by-hop: the client connection
+            # follows the client's own request, whatever the backend answers.
+            batch_keep_alive = [is_keep_alive(request[:request.find(b"\r\n\r\n")])
+                                for request in batch]
+            if False in batch_keep_alive:
+                batch = batch[:batch_keep_alive.index(False) + 1]
+                keep_alive = False
+            if handoff is not None and handoff.draining.is_set():
+                keep_alive = False
+
+            # Group consecutive requests bound to the same backend so each
+            # group is pipelined in a single write.
+            # Each group keeps the (request_id, resolve seconds) of its requests.
+            groups = []
+            for request in batch:
+                request, request_id = with_request_id(request)
+                clock = time.perf_counter()
+                hostname = extract_hostname(request.decode())
+                log.debug("{} at Host: {}", addr, hostname)
+
+                # Resolve the matching destination in routes and convert port to integer value
+                if metrics is not None and metrics.is_scrape_message(request):
+                    target = SCRAPE_TARGET
+                else:
+                    target = resolve_upstream(hostname, routes)
+                trace = (request_id, time.perf_counter() - clock)
+                if groups and groups[-1][0] == target:
+                    groups[-1][2].append(request)
+                    groups[-1][3].append(trace)
+                else:
+                    groups.append((target, hostname, [request], [trace]))
+
+            # (response, extra header lines) to send back in order
+            output = []
+            for (resolved_host, resolved_port), hostname, requests, traces in groups:
+                if (resolved_host, resolved_port) == SCRAPE_TARGET:
+                    responses = [metrics.response() for request in requests]
+                    output.extend((response, trace_headers(request_id))
+                                  for response, (request_id, _) in zip(responses, traces))
+                    log_group(requests, traces, responses, "local")
+                    continue
+                if not resolved_host:
+                    output.append((RESPONSE_404, trace_headers(traces[0][0])))
+                    log_group(requests, traces, [RESPONSE_404])
+                    keep_alive = False
+                    break
+
+                log.debug("Host name {} is forwarded to {}:{}",
+                          hostname, resolved_host, resolved_port)
+                upstream = upstreams.get((resolved_host, resolved_port))
+                if upstream is None:
+                    upstream = Upstream(resolved_host, resolved_port)
+                    upstreams[(resolved_host, resolved_port)] = upstream
+                gate = admission.expensive if admission is not None else None
+                if gate is not None and not gate.acquire():
+                    log.warning("Shedding {} request(s) of {}", len(requests), addr)
+                    output.append((admission.response, trace_headers(traces[0][0])))
+                    log_group(requests, traces, [admission.response])
+                    keep_alive = False
+                    break
+                try:
+                    responses = upstream.exchange(requests)
+                except socket.error as e:
+                    log.error("Socket error: {}", e)
+                    upstream.close()
+                    output.append((RESPONSE_404, trace_headers(traces[0][0])))
+                    log_group(requests, traces, [RESPONSE_404],
+                              "{}:{}".format(resolved_host, resolved_port))
+                    keep_alive = False
+                    break
+                finally:
+                    if gate is not None:
+                        gate.release()
+
+                for response, (request_id, resolve), (connect, ttfb, relay) in zip(
+                        responses, traces, upstream.timings):
+                    phases = None
+                    if server_timing:
+                        phases = [("resolve", resolve), ("connect", connect),
+                                  ("ttfb", ttfb), ("relay", relay)]
+                    output.append((response, trace_headers(request_id, phases, response)))
+                log_group(requests, traces, responses,
+                          "{}:{}".format(resolved_host, resolved_port))
+
+            last = len(output) - 1
+            deadline.writing()
+            conn.sendall(b"".join(
+                frame_response(response, keep_alive or i < last, None, extra)
+                for i, (response, extra) in enumerate(output)))
+            deadline.clear()
+
+    except OSError:
+        # Idle timeout, expired deadline or connection reset
+        pass
     except Exception as e:
-        print("[Proxy] Error handling client {}: {}".format(addr, e))
+        log.error("Error handling client {}: {}", addr, e)
         try:
-            error_response = (
-                "HTTP/1.1 500 Internal Server Error\r\n"
-                "Content-Type: text/plain\r\n"
-                "Content-Length: 21\r\n"
-                "Connection: close\r\n"
-                "\r\n"
-                "Internal Server Error"
-            ).encode('utf-8')
-            conn.sendall(error_response)
-            conn.close()
+            conn.sendall(RESPONSE_500)
         except:
             pass
-
-def run_proxy(ip, port, routes):
+    finally:
+        deadline.clear()
+        for upstream in upstreams.values():
+            upstream.close()
+        try:
+            conn.close()
+        except OSError:
+            pass
+        if handoff is not None:
+            handoff.closed()
+
+def run_proxy(ip, port, routes, engine="threaded",
+              max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE,
+              reuse_port=False, handoff=None, drain_timeout=DRAIN_TIMEOUT,
+              idle_timeout=IDLE_TIMEOUT, read_timeout=READ_TIMEOUT,
+              write_timeout=WRITE_TIMEOUT, wheel=None, max_concurrency=None,
+              queue_timeout=QUEUE_TIMEOUT, access_log=None,
+              access_log_max_bytes=ACCESS_LOG_MAX_BYTES, access_log_rotate=None,
+              metrics=None, server_timing=True):
     """
     Starts the proxy server and listens for incoming connections. 
 
     The process dinds the proxy server to the specified IP and port.
     In each incomping connection, it accepts the connections and
     spawns a new thread for each client using `handle_client`.
- 
+
+    With ``engine="selectors"`` the connections are relayed by the
+    non-blocking reactor of :mod:`daemon.reactor` instead.
 
     :params ip (str): IP address to bind the proxy server.
     :params port (int): port number to listen on.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params engine (str): serving engine, ``threaded`` or ``selectors``.
+    :params max_header_size (int): limit of a request line and headers.
+    :params max_body_size (int): limit of a request body.
+    :params reuse_port (bool): bind with ``SO_REUSEPORT``, so that several
+                               processes can listen on the same port.
+    :params handoff (str): path of the Unix socket on which the listening
+                           socket is taken over from the previous process
+                           and handed over to the next one.
+    :params drain_timeout (float): seconds to drain the connections after
+                                   the handoff.
+    :params idle_timeout (float): seconds a client connection may stay idle.
+    :params read_timeout (float): seconds to receive a whole request.
+    :params write_timeout (float): seconds a response write may stay blocked.
+    :params wheel (TimerWheel): prebuilt timer wheel of the deadlines.
+    :params max_concurrency (int): cap of the requests forwarded at once;
+                                   the ``selectors`` engine sheds the
+                                   requests over it without queueing them.
+    :params queue_timeout (float): seconds a request over the cap may wait.
+    :params access_log (str): file of the access log, ``-`` for stdout; each
+                              line names the upstream of the request.
+    :params access_log_max_bytes (int): size past which the access log is
+                                        rotated.
+    :params access_log_rotate (float): seconds after which the access log
+                                       is rotated.
+    :params metrics (str): path on which the latencies and counters of each
+                           upstream are served, e.g. ``/metrics``; or
+                           prebuilt :class:`Metrics <Metrics>`.
+    :params server_timing (bool): add the proxy phases to the responses in a
+                                  ``Server-Timing`` header.
 
     """
 
-    proxy = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if engine not in ENGINES:
+        raise ValueError("Invalid proxy engine: {}".format(engine))
+
+    if handoff is not None:
+        handoff = Handoff(handoff, drain_timeout)
+    if wheel is None:
+        wheel = TimerWheel()
+    admission = None
+    if max_concurrency:
+        admission = Admission(max_concurrency, queue_timeout=queue_timeout)
+    if isinstance(access_log, str):
+        access_log = AccessLog(access_log, access_log_max_bytes, access_log_rotate)
+    if isinstance(metrics, str):
+        metrics = Metrics(metrics)
+    timeouts = {
+        "idle_timeout": idle_timeout,
+        "read_timeout": read_timeout,
+        "write_timeout": write_timeout,
+    }
+
+    if engine == "selectors":
+        def route(message):
+            message, request_id = with_request_id(message)
+            hostname = extract_hostname(message.decode())
+            host, port = resolve_upstream(hostname, routes)
+            return host, port, upstream_request(message), request_id
+
+        run_reactor_proxy(ip, port, route, RESPONSE_404,
+                          max_header_size=max_header_size,
+                          max_body_size=max_body_size,
+                          reuse_port=reuse_port,
+                          handoff=handoff,
+                          wheel=wheel,
+                          admission=admission,
+                          access_log=access_log,
+                          metrics=metrics,
+                          server_timing=server_timing,
+                          **timeouts)
+        return
+
+    wheel.start()
+    settings = {
+        "max_header_size": max_header_size,
+        "max_body_size": max_body_size,
+        "handoff": handoff,
+        "wheel": wheel,
+        "admission": admission,
+        "access_log": access_log,
+        "metrics": metrics,
+        "server_timing": server_timing,
+    }
+    settings.update(timeouts)
 
     try:
-        proxy.bind((ip, port))
-        proxy.listen(50)
-        print("[Proxy] Listening on IP {} port {}".format(ip,port))
+        if handoff is not None:
+            proxy = handoff.listen(ip, port, reuse_port)
+        else:
+            proxy = listen_socket(ip, port, reuse_port)
+        log.info("Listening on IP {} port {}", ip,port)
         while True:
             conn, addr = proxy.accept()
+            if handoff is not None and handoff.draining.is_set():
+                # Handed over while blocked in accept: relay this last
+                # connection, the handoff thread ends the process once
+                # the others are drained.
+                handle_client(ip, port, conn, addr, routes, **settings)
+                handoff.wait_drained()
+                return
             # Create a new thread for each client connection
             client_thread = threading.Thread(
                 target=handle_client,
-                args=(ip, port, conn, addr, routes)
+                args=(ip, port, conn, addr, routes),
+                kwargs=settings
             )
             client_thread.daemon = True  # Thread will die when main program exits
             client_thread.start()
     except socket.error as e:
-      print("Socket error: {}".format(e))
+      log.error("Socket error: {}", e)
 
-def create_proxy(ip, port, routes):
+def create_proxy(ip, port, routes, workers=1, **options):
     """
     Entry point for launching the proxy server.
 
     :params ip (str): IP address to bind the proxy server.
     :params port (int): port number to listen on.
     :params routes (dict): dictionary mapping hostnames and location.
+    :params workers (int): number of worker processes. With more than one,
+                           each process runs :func:`run_proxy` on its own
+                           ``SO_REUSEPORT`` socket under a supervisor. Not
+                           combined with ``handoff``.
+    :params options: engine options forwarded to :func:`run_proxy`.
     """
 
-    run_proxy(ip, port, routes)
+    if workers > 1:
+        if options.get("handoff"):
+            raise ValueError("handoff requires a single worker process")
+        Supervisor(lambda: run_proxy(ip, port, routes, reuse_port=True, **options),
+                   workers, name="proxy").run()
+        return
+
+    run_proxy(ip, port, routes, **options)
\ No newline at end of file
@@ -0,0 +1,822 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.reactor
+~~~~~~~~~~~~~~~~~
+
+This module provides a non-blocking ``selectors`` reactor (epoll on Linux)
+shared by the backend and the proxy. A single thread accepts, reads and writes
+every socket; each connection is a small state machine driven by readiness
+events, so there is no thread per connection.
+
+The memory used by one connection is bounded:
+
+- The incoming request is read by an :class:`HttpReader <HttpReader>`; headers
+  or bodies over its limits are answered with ``431`` or ``413`` and closed.
+- The proxy buffers at most ``max_buffer`` bytes of the upstream response and
+  stops reading from the upstream while the client is slower than it.
+
+Every connection is under an idle, read or write deadline (see
+:mod:`daemon.timers`); the reactor advances its timer wheel between two
+selects and closes the expired connections inline.
+
+Notes:
+------
+- Backend connections are persistent, with the keep-alive rules of
+  :meth:`HttpAdapter.handle_client <HttpAdapter.handle_client>`; proxy
+  connections are closed after one response.
+- WeApRous hooks never run on the reactor thread: native ``async def`` hooks
+  are awaited on the :class:`HookLoop <HookLoop>` of the server, the
+  synchronous ones in a thread pool executor. Their completion is handed
+  back to the reactor through a self-pipe, so a slow handler only holds its
+  own connection. Static files are still served inline.
+- Requests go through the admission gates of the adapter, if any; the
+  reactor never waits for a slot, a request over its cap is shed with
+  ``503`` at once and the slot of a hook is freed when the hook ends.
+
+Usage Example:
+--------------
+>>> reactor = Reactor()
+>>> reactor.listen("127.0.0.1", 9000, lambda sock, addr: BackendConnection(
+...     reactor, sock, addr, HttpAdapter("127.0.0.1", 9000, sock, addr, {}), {}))
+>>> reactor.run()
+"""
+
+import collections
+import errno
+import inspect
+import selectors
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .httpadapter import HttpAdapter, IDLE_TIMEOUT
+from .prefork import listen_socket
+from .reader import HttpReader, MessageError, MAX_HEADER_SIZE, MAX_BODY_SIZE
+from .timers import Deadline, TimerWheel, READ_TIMEOUT, WRITE_TIMEOUT
+from .utils import server_timing
+from .logger import get_logger
+
+log = get_logger("Reactor")
+
+#: Default limit of the relayed upstream response buffer, in bytes.
+MAX_BUFFER = 64 * 1024
+
+#: Size of a single non-blocking read.
+RECV_SIZE = 16 * 1024
+
+
+class Reactor:
+    """
+    A single-threaded readiness loop built on :mod:`selectors`.
+
+    Every registered socket carries a handler called as ``handler(mask)`` when
+    the socket becomes ready. Other threads hand work back to the loop with
+    :meth:`call_soon_threadsafe`.
+    """
+
+    def __init__(self, timers=None):
+        """
+        :param timers (TimerWheel): Timer wheel of the connection deadlines,
+                                    advanced by the reactor thread.
+        """
+        #: Selector, epoll on Linux.
+        self.selector = selectors.DefaultSelector()
+        #: Timer wheel of the deadlines.
+        self.timers = timers if timers is not None else TimerWheel()
+        #: Callbacks queued by other threads, as (callback, args).
+        self.ready = collections.deque()
+        # Self-pipe waking the select up when a callback is queued.
+        self._waker, self._wakeup = socket.socketpair()
+        self._waker.setblocking(False)
+        self._wakeup.setblocking(False)
+        self.register(self._waker, selectors.EVENT_READ, self._on_wake)
+
+    def call_soon_threadsafe(self, callback, *args):
+        """
+        Run ``callback(*args)`` on the reactor thread, from any thread.
+
+        :param callback (callable): The function to call.
+        """
+        self.ready.append((callback, args))
+        try:
+            self._wakeup.send(b"\0")
+        except (BlockingIOError, InterruptedError):
+            # The pipe is full, a wakeup is pending anyway.
+            pass
+
+    def _on_wake(self, mask):
+        try:
+            while self._waker.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        while self.ready:
+            callback, args = self.ready.popleft()
+            try:
+                callback(*args)
+            except Exception as e:
+                log.error("Error in reactor callback: {}", e)
+
+    def listen(self, ip, port, on_accept, backlog=50, reuse_port=False, handoff=None):
+        """
+        Bind a non-blocking listening socket.
+
+        :param ip (str): IP address to bind.
+        :param port (int): Port number to listen on.
+        :param on_accept (callable): Called as ``on_accept(conn, addr)`` for
+                                     each accepted (non-blocking) connection.
+        :param backlog (int): Listen backlog.
+        :param reuse_port (bool): Bind with ``SO_REUSEPORT``.
+        :param handoff (Handoff): Takes over and hands over the listening
+                                  socket; accepting stops once handed over.
+
+        :rtype socket.socket: The listening socket.
+        """
+        if handoff is not None:
+            server = handoff.listen(ip, port, reuse_port)
+        else:
+            server = listen_socket(ip, port, reuse_port, backlog)
+        server.setblocking(False)
+
+        def accept(mask):
+            # Drain the accept queue, a single readiness event may
+            # stand for several pending connections.
+            while True:
+                if handoff is not None and handoff.draining.is_set():
+                    # The pending connections belong to the successor.
+                    self.unregister(server)
+                    server.close()
+                    return
+                try:
+                    conn, addr = server.accept()
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError as e:
+                    log.warning("Accept error: {}", e)
+                    return
+                conn.setblocking(False)
+                on_accept(conn, addr)
+
+        self.register(server, selectors.EVENT_READ, accept)
+        return server
+
+    def register(self, sock, events, handler):
+        """Start watching ``sock`` for ``events``."""
+        self.selector.register(sock, events, handler)
+
+    def modify(self, sock, events, handler):
+        """Change the watched ``events`` of ``sock``."""
+        self.selector.modify(sock, events, handler)
+
+    def unregister(self, sock):
+        """Stop watching ``sock``, ignoring sockets not registered."""
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+
+    def watch(self, sock, current, events, handler):
+        """
+        Move ``sock`` from the ``current`` to the wanted ``events`` interest,
+        registering or unregistering it as needed (``0`` means not watched).
+
+        :rtype int: The new interest, to be passed back as ``current``.
+        """
+        if events == current:
+            return current
+        if current == 0:
+            self.register(sock, events, handler)
+        elif events == 0:
+            self.unregister(sock)
+        else:
+            self.modify(sock, events, handler)
+        return events
+
+    def run(self):
+        """Dispatch readiness events and expire the deadlines forever."""
+        while True:
+            for key, mask in self.selector.select(self.timers.tick):
+                key.data(mask)
+            self.timers.advance()
+
+
+class Connection:
+    """
+    Base state machine of a client connection: ``reading`` the request, then
+    ``writing`` the response, then ``closed`` or ``reading`` the next one.
+
+    The connection is idle until the first byte of a request, then under the
+    read deadline until the request is complete, and under the write
+    deadline while the client does not take the queued output.
+
+    Subclasses implement :meth:`on_request`.
+    """
+
+    def __init__(self, reactor, sock, addr, reader, max_buffer=MAX_BUFFER, handoff=None,
+                 idle_timeout=IDLE_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 write_timeout=WRITE_TIMEOUT):
+        self.reactor = reactor
+        self.sock = sock
+        self.addr = addr
+        self.max_buffer = max_buffer
+        #: Incremental reader of the incoming request.
+        self.reader = reader
+        #: Outgoing bytes not yet sent.
+        self.outbuf = bytearray()
+        #: No more output will be queued, close once ``outbuf`` is sent.
+        self.finished = False
+        self.state = "reading"
+        self.events = 0
+        #: Listening socket handoff counting the open connections.
+        self.handoff = handoff
+        if handoff is not None:
+            handoff.opened()
+        #: Deadline of the connection.
+        self.deadline = Deadline(reactor.timers, self.expire, idle_timeout,
+                                 read_timeout, write_timeout)
+        self.deadline.idle()
+        self.watch(selectors.EVENT_READ)
+
+    def watch(self, events):
+        """Set the events watched on the client socket."""
+        self.events = self.reactor.watch(self.sock, self.events, events, self.on_event)
+
+    def on_event(self, mask):
+        """Readiness handler of the client socket."""
+        if mask & selectors.EVENT_READ and self.state == "reading":
+            self.on_readable()
+        if mask & selectors.EVENT_WRITE and self.state != "closed":
+            self.on_writable()
+
+    def on_readable(self):
+        try:
+            received = self.reader.recv(self.sock)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.close()
+            return
+        if not received:
+            self.close()
+            return
+        if self.deadline.kind == "idle":
+            self.deadline.reading()
+        self.process()
+
+    def process(self):
+        """Handle the next request if it is complete in the buffer."""
+        try:
+            message = self.reader.next_message()
+        except MessageError as e:
+            self.state = "writing"
+            self.send(e.response, finished=True)
+            return
+        if message is None:
+            return
+
+        self.deadline.clear()
+        self.state = "writing"
+        self.watch(0)
+        self.on_request(message)
+
+    def read_next(self):
+        """Go back to reading, for the next request of a persistent connection."""
+        self.state = "reading"
+        if self.reader.pending:
+            self.deadline.reading()
+        else:
+            self.deadline.idle()
+        self.watch(selectors.EVENT_READ)
+        # A pipelined request may already be buffered.
+        self.process()
+
+    def on_request(self, message):
+        """Handle one complete request message (bytes)."""
+        raise NotImplementedError
+
+    def send(self, data, finished=False):
+        """Queue ``data`` for the client and watch for writability."""
+        self.outbuf += data
+        if finished:
+            self.finished = True
+        if self.state != "closed":
+            if self.deadline.kind != "write":
+                self.deadline.writing()
+            self.watch(selectors.EVENT_WRITE)
+
+    def on_writable(self):
+        if self.outbuf:
+            try:
+                sent = self.sock.send(self.outbuf)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self.close()
+                return
+            del self.outbuf[:sent]
+            if sent:
+                # The write deadline bounds a stall, not a slow transfer.
+                self.deadline.writing()
+
+        if not self.outbuf:
+            self.deadline.clear()
+            if self.finished:
+                self.close()
+            else:
+                self.on_drained()
+
+    def on_drained(self):
+        """Called when ``outbuf`` is empty but more output is expected."""
+        self.watch(0)
+
+    def expire(self):
+        """Deadline callback: close the connection."""
+        log.info("Closing {} after {} timeout", self.addr, self.deadline.kind)
+        self.close()
+
+    def close(self):
+        if self.state == "closed":
+            return
+        self.state = "closed"
+        self.deadline.clear()
+        self.watch(0)
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+        if self.handoff is not None:
+            self.handoff.closed()
+
+
+class BackendConnection(Connection):
+    """
+    Serves the requests of a persistent connection through
+    :class:`HttpAdapter <HttpAdapter>`.
+
+    A request with a WeApRous hook is answered off the reactor thread, on
+    the hook loop of the adapter or in ``executor``; the connection waits
+    in the ``writing`` state, watching nothing, until the response is back.
+    Any other request is answered inline.
+
+    The chunks of a streamed response are pulled one at a time, whenever
+    the previous one has been sent.
+    """
+
+    def __init__(self, reactor, sock, addr, adapter, routes, adapters=None,
+                 executor=None):
+        self.adapter = adapter
+        self.routes = routes
+        #: Executor of the synchronous hooks, None to run them inline.
+        self.executor = executor
+        #: Start of the request being answered.
+        self.started = None
+        #: Pool the adapter is given back to once closed, if any.
+        self.adapters = adapters
+        #: Chunks of a streamed response not yet produced.
+        self.stream = None
+        #: Number of requests served.
+        self.served = 0
+        #: Whether the connection stays open after the current response.
+        self.keep_alive = False
+        Connection.__init__(self, reactor, sock, addr, adapter.reader,
+                            handoff=adapter.handoff,
+                            idle_timeout=adapter.idle_timeout,
+                            read_timeout=adapter.read_timeout,
+                            write_timeout=adapter.write_timeout)
+
+    def on_request(self, message):
+        adapter = self.adapter
+        self.started = time.monotonic()
+        req, resp = adapter.new_exchange()
+        self.served += 1
+        gate = None
+        try:
+            adapter.mark(req, None)
+            req.prepare(message, self.routes)
+            adapter.mark(req, "parse")
+            self.keep_alive = (adapter.keep_alive(req)
+                               and self.served < adapter.max_requests)
+            gate = adapter.gate(req)
+            if gate is not None and not gate.acquire(0):
+                # The reactor never waits for a slot: over the cap, shed.
+                gate = None
+                self.keep_alive = False
+                response = adapter.admission.response
+            elif (req.hook and adapter.hook_loop is not None
+                    and inspect.iscoroutinefunction(req.hook)):
+                response, unwind = adapter.enter_hook(req, resp)
+                if unwind is not None:
+                    try:
+                        coro = adapter.call_hook(req)
+                    except Exception as e:
+                        response = adapter.leave_hook(req, resp, unwind, error=e)
+                    else:
+                        future = adapter.hook_loop.submit(coro)
+                        self.resume(future, gate, self.on_hook_result, req, resp, unwind)
+                        return
+            elif req.hook and self.executor is not None:
+                future = self.executor.submit(adapter.dispatch, req, resp)
+                self.resume(future, gate, self.on_dispatched, req, resp)
+                return
+            else:
+                response = adapter.dispatch(req, resp)
+        except Exception as e:
+            response = self.failed(e, resp)
+        if gate is not None:
+            gate.release()
+        self.respond(req, resp, response)
+
+    def resume(self, future, gate, callback, *args):
+        """
+        Release ``gate`` as soon as ``future`` is done, then call
+        ``callback(future, *args)`` on the reactor thread.
+
+        :param gate (Gate): Admission slot held by the request, if any.
+        """
+        call_soon = self.reactor.call_soon_threadsafe
+
+        def done(future):
+            if gate is not None:
+                gate.release()
+            call_soon(callback, future, *args)
+
+        future.add_done_callback(done)
+
+    def on_hook_result(self, future, req, resp, unwind):
+        """Answer with the result of an async hook awaited on the hook loop."""
+        if self.state == "closed":
+            return
+        try:
+            try:
+                hook_result = future.result()
+            except Exception as e:
+                response = self.adapter.leave_hook(req, resp, unwind, error=e)
+            else:
+                response = self.adapter.leave_hook(req, resp, unwind, hook_result)
+        except Exception as e:
+            response = self.failed(e, resp)
+        self.respond(req, resp, response)
+
+    def on_dispatched(self, future, req, resp):
+        """Answer with the response dispatched in the executor."""
+        if self.state == "closed":
+            return
+        try:
+            response = future.result()
+        except Exception as e:
+            response = self.failed(e, resp)
+        self.respond(req, resp, response)
+
+    def failed(self, error, resp):
+        """The 500 response of a request whose handling raised ``error``."""
+        log.error("Error processing request: {}", error)
+        self.keep_alive = False
+        resp.stream = None
+        return self.adapter.build_error_response(500, "Internal Server Error")
+
+    def respond(self, req, resp, response):
+        """Frame ``response`` and queue it for the client."""
+        adapter = self.adapter
+        response = adapter.frame_response(response, self.keep_alive, self.served, req)
+        self.stream = adapter.observe(req, response, resp.stream, self.started)
+        adapter.recycle()
+        self.send(response, finished=self.stream is None and not self.keep_alive)
+
+    def on_drained(self):
+        if self.stream is None:
+            # Response of a persistent connection sent.
+            self.read_next()
+            return
+        try:
+            chunk = next(self.stream, None)
+        except Exception as e:
+            log.error("Error streaming response: {}", e)
+            self.close()
+            return
+        if chunk is None:
+            self.stream = None
+            if self.keep_alive:
+                self.read_next()
+            else:
+                self.close()
+        else:
+            self.send(chunk)
+
+    def close(self):
+        if self.state == "closed":
+            return
+        Connection.close(self)
+        if self.adapters is not None:
+            self.adapters.release(self.adapter)
+            self.adapter = None
+
+
+class ProxyConnection(Connection):
+    """
+    Relays a request to the upstream chosen by ``route`` and streams the
+    upstream response back, with backpressure on the relay buffer.
+
+    With an :class:`Admission <Admission>` control, a relay holds a slot of
+    its ``expensive`` gate until the upstream is closed; a request finding
+    no free slot is shed at once, the reactor cannot wait for one.
+
+    With an :class:`AccessLog <AccessLog>` or :class:`Metrics <Metrics>`,
+    the relayed request is recorded once its response ends or the
+    connection closes; a request for ``metrics.path`` is answered by the
+    proxy itself.
+
+    With ``server_timing``, a ``Server-Timing`` header with the resolve,
+    connect and upstream TTFB phases is added to the relayed response head;
+    the relay phase is still running when the head is sent.
+    """
+
+    def __init__(self, reactor, sock, addr, reader, route, error_response,
+                 max_buffer=MAX_BUFFER, handoff=None, admission=None,
+                 access_log=None, metrics=None, server_timing=True, **timeouts):
+        #: Called as ``route(message)``, returns the upstream ``(host, port)``,
+        #: the message to forward to it and its request ID.
+        self.route = route
+        #: Response sent when the upstream cannot be reached.
+        self.error_response = error_response
+        self.upstream = None
+        self.upstream_out = b""
+        self.upstream_events = 0
+        self.admission = admission
+        #: Admission gate slot held by the relay.
+        self.gate = None
+        self.access_log = access_log
+        self.metrics = metrics
+        #: Request line of the relayed request, until it is logged.
+        self.request_line = None
+        #: ``host:port`` of the upstream.
+        self.upstream_name = None
+        #: Start of the relayed upstream response, and its size so far.
+        self.head = b""
+        self.relayed = 0
+        self.started = 0
+        self.request_id = None
+        self.server_timing = server_timing
+        #: (name, seconds) of the proxy phases, and the end of the last one.
+        self.phases = []
+        self.clock = 0
+        #: Upstream response head held until complete, None once relayed.
+        self.held = None
+        Connection.__init__(self, reactor, sock, addr, reader, max_buffer, handoff,
+                            **timeouts)
+
+    def on_request(self, message):
+        self.started = time.monotonic()
+        self.request_line = message[:message.find(b"\r\n") + 2]
+        if self.metrics is not None and self.metrics.is_scrape_message(message):
+            self.upstream_name = "local"
+            self.reply(self.metrics.response())
+            return
+        admission = self.admission
+        if admission is not None and admission.expensive is not None:
+            if not admission.expensive.acquire(0):
+                log.warning("Shedding request of {}", self.addr)
+                self.reply(admission.response)
+                return
+            self.gate = admission.expensive
+
+        try:
+            self.clock = time.perf_counter()
+            host, port, message, self.request_id = self.route(message)
+            self.lap("resolve")
+            self.upstream_name = "{}:{}".format(host, port)
+            upstream = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            upstream.setblocking(False)
+            err = upstream.connect_ex((host, port))
+        except Exception as e:
+            log.error("Error resolving upstream for {}: {}", self.addr, e)
+            self.reply(self.error_response)
+            return
+
+        if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            upstream.close()
+            self.reply(self.error_response)
+            return
+
+        self.upstream = upstream
+        self.upstream_out = message
+        self.held = b"" if self.server_timing else None
+        self.watch_upstream(selectors.EVENT_WRITE)
+
+    def lap(self, phase):
+        """End a proxy phase: it lasted since the end of the previous one."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.clock))
+        self.clock = now
+
+    def watch_upstream(self, events):
+        """Set the events watched on the upstream socket."""
+        self.upstream_events = self.reactor.watch(
+            self.upstream, self.upstream_events, events, self.on_upstream_event)
+
+    def on_upstream_event(self, mask):
+        if mask & selectors.EVENT_WRITE:
+            self.on_upstream_writable()
+        if mask & selectors.EVENT_READ and self.upstream is not None:
+            self.on_upstream_readable()
+
+    def on_upstream_writable(self):
+        if not self.upstream_out:
+            return
+        err = self.upstream.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            log.error("Socket error: {}", errno.errorcode.get(err, err))
+            self.close_upstream()
+            self.reply(self.error_response)
+            return
+        if len(self.phases) == 1:
+            # First writable event: the connection is established.
+            self.lap("connect")
+        try:
+            sent = self.upstream.send(self.upstream_out)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.close_upstream()
+            self.reply(self.error_response)
+            return
+        self.upstream_out = self.upstream_out[sent:]
+        if not self.upstream_out:
+            # The upstream TTFB counts from the request fully written.
+            self.clock = time.perf_counter()
+            self.watch_upstream(selectors.EVENT_READ)
+
+    def on_upstream_readable(self):
+        try:
+            data = self.upstream.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.close_upstream()
+            self.log_exchange()
+            self.send(self.held or b"", finished=True)
+            self.held = None
+            return
+
+        if not self.head:
+            self.head = data[:12]
+            self.lap("ttfb")
+        self.relayed += len(data)
+        if self.held is not None:
+            data = self.held + data
+            end = data.find(b"\r\n\r\n")
+            if end < 0 and len(data) < self.max_buffer:
+                self.held = data
+                return
+            self.held = None
+            if end >= 0:
+                data = (data[:end + 2] + b"Server-Timing: " + server_timing(self.phases)
+                        + b"\r\n" + data[end + 2:])
+        self.send(data)
+        if len(self.outbuf) >= self.max_buffer:
+            # Backpressure: the client drains slower than the upstream fills.
+            self.watch_upstream(0)
+
+    def on_drained(self):
+        # Nothing to send until the upstream produces more bytes.
+        self.watch(0)
+        if self.upstream is not None and self.upstream_events == 0:
+            self.watch_upstream(selectors.EVENT_READ)
+
+    def close_upstream(self):
+        if self.gate is not None:
+            self.gate.release()
+            self.gate = None
+        if self.upstream is None:
+            return
+        self.watch_upstream(0)
+        try:
+            self.upstream.close()
+        except OSError:
+            pass
+        self.upstream = None
+
+    def reply(self, response):
+        """Answer the request from the proxy itself, then close."""
+        self.head = response
+        self.relayed = len(response)
+        self.log_exchange()
+        self.send(response, finished=True)
+
+    def log_exchange(self):
+        """Record the relayed request in the access log and the metrics, once."""
+        if self.request_line is None:
+            return
+        latency = time.monotonic() - self.started
+        if self.access_log is not None:
+            self.access_log.record_exchange(self.addr, self.request_line, self.head,
+                                            self.relayed, latency, self.upstream_name,
+                                            self.request_id)
+        if self.metrics is not None:
+            self.metrics.observe_exchange(self.request_line, self.head, self.relayed,
+                                          latency, self.upstream_name)
+        self.request_line = None
+
+    def close(self):
+        self.close_upstream()
+        # A response cut short by either side is logged as far as it went.
+        self.log_exchange()
+        Connection.close(self)
+
+
+def run_reactor_backend(ip, port, routes, reuse_port=False, adapters=None, threads=8,
+                        **settings):
+    """
+    Run the backend on the selectors reactor.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param reuse_port (bool): Bind with ``SO_REUSEPORT``.
+    :param adapters (ObjectPool): Pool of recycled adapters, if any; they
+                                  must share the ``wheel`` of ``settings``.
+    :param threads (int): Size of the executor running synchronous hooks.
+    :param settings: Connection settings of :class:`HttpAdapter <HttpAdapter>`;
+                     its ``wheel`` is advanced by the reactor.
+    """
+    reactor = Reactor(settings.get("wheel"))
+    settings["wheel"] = reactor.timers
+    executor = ThreadPoolExecutor(max_workers=threads,
+                                  thread_name_prefix="backend-executor")
+
+    def on_accept(conn, addr):
+        if adapters is not None:
+            adapter = adapters.acquire()
+            adapter.conn = conn
+            adapter.connaddr = addr
+        else:
+            adapter = HttpAdapter(ip, port, conn, addr, routes, **settings)
+        BackendConnection(reactor, conn, addr, adapter, routes, adapters, executor)
+
+    try:
+        reactor.listen(ip, port, on_accept, reuse_port=reuse_port,
+                       handoff=settings.get("handoff"))
+        log.info("Backend listening on port {}", port)
+        if routes != {}:
+            log.info("route settings {}", routes)
+        reactor.run()
+    except socket.error as e:
+        log.error("Socket error: {}", e)
+    finally:
+        executor.shutdown(wait=False)
+
+
+def run_reactor_proxy(ip, port, route, error_response, max_buffer=MAX_BUFFER,
+                      max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE,
+                      reuse_port=False, handoff=None, wheel=None, admission=None,
+                      access_log=None, metrics=None, server_timing=True, **timeouts):
+    """
+    Run the proxy on the selectors reactor.
+
+    :param ip (str): IP address to bind the proxy server.
+    :param port (int): Port number to listen on.
+    :param route (callable): Maps a raw request (bytes) to the upstream
+                             ``(host, port, message, request_id)`` to
+                             forward it to.
+    :param error_response (bytes): Response sent when the upstream is unreachable.
+    :param max_buffer (int): Limit of the relayed upstream response buffer.
+    :param max_header_size (int): Limit of a request line and headers.
+    :param max_body_size (int): Limit of a request body.
+    :param reuse_port (bool): Bind with ``SO_REUSEPORT``.
+    :param handoff (Handoff): Listening socket handoff of the process.
+    :param wheel (TimerWheel): Timer wheel of the deadlines, advanced by the
+                               reactor.
+    :param admission (Admission): Admission control of the relays.
+    :param access_log (AccessLog): Access log of the relayed requests.
+    :param metrics (Metrics): Metrics of the relayed requests, served on
+                              ``metrics.path``.
+    :param server_timing (bool): Add the proxy phases to the response heads.
+    :param timeouts: ``idle_timeout``, ``read_timeout`` and ``write_timeout``
+                     of the client connections.
+    """
+    reactor = Reactor(wheel)
+
+    def on_accept(conn, addr):
+        reader = HttpReader(max_header_size, max_body_size)
+        ProxyConnection(reactor, conn, addr, reader, route, error_response,
+                        max_buffer, handoff, admission, access_log, metrics,
+                        server_timing, **timeouts)
+
+    try:
+        reactor.listen(ip, port, on_accept, reuse_port=reuse_port, handoff=handoff)
+        log.info("Proxy listening on IP {} port {}", ip, port)
+        reactor.run()
+    except socket.error as e:
+        log.error("Socket error: {}", e)
@@ -0,0 +1,367 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.reader
+~~~~~~~~~~~~~~~~~
+
+This module provides a buffered, incremental reader of HTTP request messages.
+
+Incoming bytes are appended to one ``bytearray``; the reader resumes the
+search for the end of the headers where the previous read stopped and frames
+the body by its ``Content-Length``, so a message is only copied out of the
+buffer once it is complete. Header and body sizes are bounded, and a message
+exceeding them raises :class:`MessageError <MessageError>` carrying the
+response to send before closing the connection.
+
+``Transfer-Encoding: chunked`` bodies are decoded as their chunks arrive:
+the decoded data is moved out of the receive buffer chunk by chunk, and the
+message is returned with a ``Content-Length`` header in place of the
+transfer coding.
+
+A header block with a bare CR or LF line end, an obs-fold continuation
+line or whitespace before the colon of a field name is rejected with
+``400``, so that every field of a returned message is on a line of its own.
+
+Usage::
+
+  >>> reader = HttpReader(max_header_size=8192, max_body_size=1048576)
+  >>> for msg in reader.read(conn):
+  >>>     req.prepare(msg, routes)
+"""
+
+import re
+
+from .utils import content_length, get_header, is_valid_head
+
+#: Default limit of the request line and headers, in bytes.
+MAX_HEADER_SIZE = 8 * 1024
+
+#: Default limit of a request body, in bytes.
+MAX_BODY_SIZE = 1024 * 1024
+
+#: Size of a single socket read.
+RECV_SIZE = 16 * 1024
+
+#: Limit of a chunk-size line (size, extensions and CRLF), in bytes.
+MAX_CHUNK_LINE = 1024
+
+#: A chunk-size line: the size in hex digits, then optional extensions.
+_CHUNK_SIZE = re.compile(rb"([0-9A-Fa-f]+)(?:[ \t]*;[^\r\n]*)?\Z")
+
+
+class MessageError(Exception):
+    """
+    A request message that cannot be read.
+
+    :attrs status_code (int): HTTP status code to answer with.
+    :attrs reason (str): reason phrase of the status code.
+    """
+
+    def __init__(self, status_code, reason):
+        Exception.__init__(self, "{} {}".format(status_code, reason))
+        self.status_code = status_code
+        self.reason = reason
+
+    @property
+    def response(self):
+        """The raw response to send before closing the connection."""
+        return (
+            "HTTP/1.1 {} {}\r\n"
+            "Content-Type: text/plain\r\n"
+            "Content-Length: {}\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+            "{}"
+        ).format(self.status_code, self.reason, len(self.reason), self.reason).encode('utf-8')
+
+
+def decode_chunks(buf, pos, body=None, max_size=None):
+    """
+    Decode the complete chunks of a chunked body.
+
+    Only whole chunks are consumed, so the decoding resumes at the returned
+    position once more bytes are received.
+
+    :param buf (bytearray): Received bytes.
+    :param pos (int): Offset of the next chunk-size line in ``buf``.
+    :param body (bytearray): Receives the decoded data, None to only scan.
+    :param max_size (int): Limit of the decoded size, None for no limit.
+
+    :rtype tuple: (int, int, bool) offset past the consumed chunks, decoded
+                  size and whether the last chunk and the trailers were read.
+
+    :raise MessageError: if the encoding is malformed or exceeds the limit.
+    """
+    size = 0
+    while True:
+        eol = buf.find(b"\r\n", pos)
+        if eol < 0:
+            if len(buf) - pos > MAX_CHUNK_LINE:
+                raise MessageError(400, "Bad Request")
+            return pos, size, False
+
+        # Hex digits only, int(line, 16) would also take 0x, +, _ and
+        # spaces; the chunk extensions after ';' are ignored.
+        size_line = _CHUNK_SIZE.match(buf, pos, eol)
+        if size_line is None:
+            raise MessageError(400, "Bad Request")
+        length = int(size_line.group(1), 16)
+
+        if length == 0:
+            # Last chunk, followed by optional trailers and an empty line.
+            if buf.startswith(b"\r\n", eol + 2):
+                return eol + 4, size, True
+            end = buf.find(b"\r\n\r\n", eol)
+            if end < 0:
+                if len(buf) - eol > MAX_HEADER_SIZE:
+                    raise MessageError(431, "Request Header Fields Too Large")
+                return pos, size, False
+            return end + 4, size, True
+
+        if max_size is not None and size + length > max_size:
+            raise MessageError(413, "Payload Too Large")
+        data_end = eol + 2 + length
+        if len(buf) < data_end + 2:
+            return pos, size, False
+        if buf[data_end:data_end + 2] != b"\r\n":
+            raise MessageError(400, "Bad Request")
+
+        if body is not None:
+            body += memoryview(buf)[eol + 2:data_end]
+        size += length
+        pos = data_end + 2
+
+
+def dechunked_head(head, length):
+    """
+    Replace the framing headers of a message decoded from chunks.
+
+    :param head (bytes): header block, request line included.
+    :param length (int): decoded body size.
+
+    :rtype bytes: the header block with ``Content-Length: length`` in place
+                  of ``Transfer-Encoding`` and ``Content-Length``.
+    """
+    lines = head.split(b"\r\n")
+    kept = [lines[0]]
+    for line in lines[1:]:
+        name = line.split(b":", 1)[0].strip().lower()
+        if name not in (b"transfer-encoding", b"content-length"):
+            kept.append(line)
+    kept.append(b"Content-Length: %d" % length)
+    return b"\r\n".join(kept)
+
+
+class HttpReader:
+    """
+    Incremental framing of the request messages of one connection.
+
+    Attributes:
+        max_header_size (int): Limit of the request line and headers.
+        max_body_size (int): Limit of a request body.
+        buffer (bytearray): Received bytes not yet returned as messages.
+    """
+
+    __attrs__ = [
+        "max_header_size",
+        "max_body_size",
+        "buffer",
+    ]
+
+    def __init__(self, max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE):
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        self.buffer = bytearray()
+        #: Reusable receive buffer.
+        self._scratch = bytearray(RECV_SIZE)
+        #: Offset of the current message in ``buffer``.
+        self._start = 0
+        #: Offset where the search for the end of the headers resumes.
+        self._scanned = 0
+        #: Size of the current message once its headers are parsed.
+        self._total = -1
+        #: Header block of the current chunked message.
+        self._head = None
+        #: Decoded body of the current chunked message.
+        self._body = None
+
+    def reset(self):
+        """Drop the buffered bytes, to read another connection."""
+        self.buffer = bytearray()
+        self._start = 0
+        self._scanned = 0
+        self._total = -1
+        self._head = None
+        self._body = None
+
+    def feed(self, data):
+        """Append received bytes to the buffer."""
+        self._compact()
+        self.buffer += data
+
+    def recv(self, conn):
+        """
+        Receive once from ``conn`` into the buffer.
+
+        :rtype int: Number of bytes received, 0 on EOF.
+        """
+        self._compact()
+        n = conn.recv_into(self._scratch)
+        if n:
+            self.buffer += memoryview(self._scratch)[:n]
+        return n
+
+    def next_message(self):
+        """
+        Take the next complete message out of the buffer.
+
+        :rtype bytes: The message, or None while it is incomplete.
+
+        :raise MessageError: if the message exceeds the limits or is malformed.
+        """
+        if self._body is not None:
+            return self._next_chunked()
+
+        buf = self.buffer
+        start = self._start
+
+        if self._total < 0:
+            # Skip the empty lines allowed between pipelined requests.
+            while buf.startswith(b"\r\n", start):
+                start += 2
+            self._start = start
+            self._scanned = max(self._scanned, start)
+
+            end = buf.find(b"\r\n\r\n", self._scanned)
+            if end < 0:
+                if len(buf) - start > self.max_header_size:
+                    raise MessageError(431, "Request Header Fields Too Large")
+                # Resume past what was scanned, minus a partial terminator.
+                self._scanned = max(start, len(buf) - 3)
+                return None
+            if end - start > self.max_header_size:
+                raise MessageError(431, "Request Header Fields Too Large")
+
+            head = bytes(buf[start:end])
+            if not is_valid_head(head):
+                # Bare LF, obs-fold or "Name :" would let a field hide
+                # in another, as read by the header lookups.
+                raise MessageError(400, "Bad Request")
+            coding = get_header(head, b"transfer-encoding")
+            if coding is not None:
+                # Transfer-Encoding overrides Content-Length; chunked is the
+                # only coding understood.
+                if coding.lower() != b"chunked":
+                    raise MessageError(501, "Not Implemented")
+                self._head = head
+                self._body = bytearray()
+                self._start = self._scanned = end + 4
+                return self._next_chunked()
+
+            try:
+                length = content_length(head) or 0
+            except ValueError:
+                # "+5", "0_5" or two differing fields: framed differently
+                # by the servers behind the proxy.
+                raise MessageError(400, "Bad Request")
+            if length > self.max_body_size:
+                raise MessageError(413, "Payload Too Large")
+            self._total = end + 4 - start + length
+
+        if len(buf) - start < self._total:
+            return None
+
+        end = start + self._total
+        msg = bytes(buf[start:end])
+        self._start = self._scanned = end
+        self._total = -1
+        return msg
+
+    def _next_chunked(self):
+        """
+        Decode the chunks received so far of the current chunked message.
+
+        The consumed chunks are released from the buffer on the next read.
+
+        :rtype bytes: The message, or None while it is incomplete.
+        """
+        body = self._body
+        pos, _, done = decode_chunks(self.buffer, self._start, body,
+                                     self.max_body_size - len(body))
+        self._start = self._scanned = pos
+        if not done:
+            return None
+
+        msg = dechunked_head(self._head, len(body)) + b"\r\n\r\n" + body
+        self._head = self._body = None
+        return msg
+
+    def messages(self):
+        """
+        Take every complete message out of the buffer.
+
+        :rtype list: The messages (bytes), in order.
+
+        :raise MessageError: if a message exceeds the limits or is malformed.
+        """
+        messages = []
+        msg = self.next_message()
+        while msg is not None:
+            messages.append(msg)
+            msg = self.next_message()
+        return messages
+
+    @property
+    def pending(self):
+        """Whether part of a message is buffered."""
+        return len(self.buffer) > self._start or self._body is not None
+
+    def read(self, conn, deadline=None):
+        """
+        Block until at least one message is complete and return every
+        complete message received so far (pipelined requests included).
+
+        :param conn (socket): The client socket connection.
+        :param deadline (Deadline): Deadline of the connection: idle until
+                                    the first byte of a message, then read
+                                    until the message is complete.
+
+        :rtype list: The messages (bytes), empty on EOF.
+
+        :raise MessageError: if a message exceeds the limits or is malformed.
+        """
+        messages = self.messages()
+        if messages:
+            return messages
+
+        if deadline is not None:
+            if self.pending:
+                deadline.reading()
+            else:
+                deadline.idle()
+        while not messages:
+            if not self.recv(conn):
+                return []
+            if deadline is not None and deadline.kind == "idle":
+                deadline.reading()
+            messages = self.messages()
+        if deadline is not None:
+            deadline.clear()
+        return messages
+
+    def _compact(self):
+        """Drop the consumed bytes from the front of the buffer."""
+        if self._start:
+            del self.buffer[:self._start]
+            self._scanned -= self._start
+            self._start = 0
@@ -17,7 +17,19 @@ daemon.request
 This module provides a Request object to manage and persist 
 request settings (cookies, auth, proxies).
 """
-from .dictionary import CaseInsensitiveDict
+import json
+from urllib.parse import parse_qsl
+
+from .dictionary import CaseInsensitiveDict, QueryDict
+from .parser import parse_request
+from .router import Router
+from .utils import parse_cookie
+from .logger import get_logger
+
+log = get_logger("Request")
+
+#: Marks :attr:`Request.json` as not decoded yet (None is a JSON value).
+_UNSET = object()
 
 class Request():
     """The fully mutable "class" `Request <Request>` object,
@@ -48,53 +60,88 @@ class Request():
         "hook",
     ]
 
+    # No per-instance ``__dict__``: a Request is built for every message.
+    # The cookies, the query, the form and the JSON body are parsed on first
+    # access, see :attr:`cookies`, :attr:`query`, :attr:`form` and :attr:`json`.
+    __slots__ = (
+        "method",
+        "url",
+        "headers",
+        "path",
+        "query_string",
+        "_query",
+        "version",
+        "_cookies",
+        "_form",
+        "_json",
+        "body",
+        "routes",
+        "hook",
+        "params",
+        "allowed",
+        "request_id",
+        "timings",
+    )
+
     def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear the request, to reuse it for another message."""
         #: HTTP verb to send to the server.
         self.method = None
         #: HTTP URL to send the request to.
         self.url = None
         #: dictionary of HTTP headers.
         self.headers = None
-        #: HTTP path
-        self.path = None        
-        # The cookies set used to create Cookie header
-        self.cookies = None
-        #: request body to send to the server.
+        #: HTTP path, query string included
+        self.path = None
+        #: Query string of the path, without the ``?``
+        self.query_string = ""
+        #: Created on first use, see :attr:`query`.
+        self._query = None
+        #: HTTP version of the request line
+        self.version = None
+        #: Created on first use, see :attr:`cookies`.
+        self._cookies = None
+        #: Created on first use, see :attr:`form`.
+        self._form = None
+        #: Decoded on first use, see :attr:`json`.
+        self._json = _UNSET
+        #: request body (bytes).
         self.body = None
         #: Routes
-        self.routes = {}
+        self.routes = None
         #: Hook point for routed mapped-path
         self.hook = None
-
-    def extract_request_line(self, request):
-        try:
-            lines = request.splitlines()
-            first_line = lines[0]
-            method, path, version = first_line.split()
-
-            if path == '/':
-                path = '/index.html'
-        except Exception:
-            return None, None, None
-
-        return method, path, version
-             
-    def prepare_headers(self, request):
-        """Prepares the given HTTP headers."""
-        lines = request.split('\r\n')
-        headers = {}
-        for line in lines[1:]:
-            if ': ' in line:
-                key, val = line.split(': ', 1)
-                headers[key.lower()] = val
-        return headers
+        #: Path parameters of the hook's route, by name
+        self.params = None
+        #: Methods of the route when it exists for another method only
+        self.allowed = None
+        #: ID joining the logs of the proxy and the backend
+        self.request_id = None
+        #: Marks ``(phase, time.perf_counter())`` of the request processing
+        self.timings = []
 
     def prepare(self, request, routes=None):
-        """Prepares the entire request with the given parameters."""
+        """
+        Prepares the entire request from the raw message.
+
+        :param request (bytes): The complete message; it is parsed by
+                                :func:`parse_request <parse_request>`, so
+                                the header values are only decoded when read.
+        :param routes (Router): The WeApRous routes, to find the hook; a
+                                plain ``(method, path)`` dict is matched
+                                exactly.
+        """
 
-        # Prepare the request line from the request header
-        self.method, self.path, self.version = self.extract_request_line(request)
-        print("[Request] {} path {} version {}".format(self.method, self.path, self.version))
+        # Prepare the request line and the header slices in one pass
+        self.method, self.path, self.version, self.headers, body = parse_request(request)
+        if self.path == '/':
+            self.path = '/index.html'
+        path_without_query, _, self.query_string = self.path.partition('?')
+        self._query = None
+        log.debug("{} path {} version {}", self.method, self.path, self.version)
 
         #
         # @bksysnet Preapring the webapp hook with WeApRous instance
@@ -103,28 +150,29 @@ class Request():
         # TODO manage the webapp hook in this mounting point
         #
         
-        if not routes == {}:
+        if routes:
             self.routes = routes
-            
-            # Strip query string for route matching
-            path_without_query = self.path.split('?')[0] if '?' in self.path else self.path
-            
-            self.hook = routes.get((self.method, path_without_query))
+
+            # Match the route on the path without its query string
+            if isinstance(routes, Router):
+                self.hook, self.params, self.allowed = routes.match(
+                    self.method, path_without_query)
+            else:
+                self.hook = routes.get((self.method, path_without_query))
             #
             # self.hook manipulation goes here
             # ...
             #
 
-        self.headers = self.prepare_headers(request)
-        
-        # Parse cookies from headers
-        self.cookies = self.parse_cookies()
-        
-        # Extract body for POST requests
-        if self.method == 'POST':
-            self.body = self.extract_body(request)
-        else:
-            self.body = ""
+        self.request_id = self.headers.get('x-request-id')
+
+        # The cookies, form and JSON body are parsed when first read
+        self._cookies = None
+        self._form = None
+        self._json = _UNSET
+
+        # Keep the framed body of every method, as bytes
+        self.body = body
 
         return
 
@@ -158,34 +206,56 @@ class Request():
     def prepare_cookies(self, cookies):
         self.headers["Cookie"] = cookies
 
+    @property
+    def cookies(self):
+        """Cookies of the request headers (Cookie), parsed on first access."""
+        if self._cookies is None:
+            self._cookies = self.parse_cookies()
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, cookies):
+        self._cookies = cookies
+
+    @property
+    def query(self):
+        """
+        Parameters of the query string, a :class:`QueryDict <QueryDict>`,
+        parsed on first access.
+        """
+        if self._query is None:
+            self._query = QueryDict(self.query_string)
+        return self._query
+
+    @property
+    def form(self):
+        """
+        Fields of a ``application/x-www-form-urlencoded`` body, decoded on
+        first access. The last of repeated fields wins.
+        """
+        if self._form is None:
+            self._form = self.parse_form_data()
+        return self._form
+
+    @property
+    def json(self):
+        """
+        The JSON body, decoded on first access; None without a body.
+
+        :raise ValueError: if the body is not valid JSON.
+        """
+        if self._json is _UNSET:
+            self._json = json.loads(self.body) if self.body else None
+        return self._json
+
     def parse_cookies(self):
-        """Parse cookies from Cookie header."""
-        cookies = {}
-        cookie_header = self.headers.get('cookie', '')
-        if cookie_header:
-            for pair in cookie_header.split(';'):
-                if '=' in pair:
-                    key, value = pair.strip().split('=', 1)
-                    cookies[key] = value
-        return cookies
-    
-    def extract_body(self, request):
-        """Extract body from POST request."""
-        try:
-            parts = request.split('\r\n\r\n', 1)
-            if len(parts) > 1:
-                return parts[1]
-        except Exception:
-            pass
-        return ""
-    
+        """Parse cookies from Cookie header, quoted values unquoted."""
+        cookie_header = self.headers.get('cookie', '') if self.headers is not None else ''
+        return parse_cookie(cookie_header) if cookie_header else {}
+
     def parse_form_data(self):
-        """Parse form data from POST body."""
-        form_data = {}
-        if self.body:
-            for pair in self.body.split('&'):
-                if '=' in pair:
-                    key, value = pair.split('=', 1)
-                    # URL decode if needed
-                    form_data[key] = value.replace('+', ' ')
-        return form_data
+        """Parse form data from POST body, percent-decoded."""
+        if not self.body:
+            return {}
+        return dict(parse_qsl(self.body.decode('utf-8', 'replace'),
+                              keep_blank_values=True))
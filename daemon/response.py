@@ -18,15 +18,76 @@ This module provides a :class: `Response <Response>` object to manage and persis
 response settings (cookies, auth, proxies), and to construct HTTP responses
 based on incoming requests. 
 
-The current version supports MIME type detection, content loading and header formatting
+The current version supports MIME type detection, content loading and header formatting.
+Dynamic content produced as an iterable of parts is streamed with
+``Transfer-Encoding: chunked`` to HTTP/1.1 clients.
 """
 import datetime
 import os
 import mimetypes
+from http import HTTPStatus
 from .dictionary import CaseInsensitiveDict
+from .utils import encode_chunks, encode_json, iter_json, json_length, quote_cookie
+from .logger import get_logger
+
+log = get_logger("Response")
 
 BASE_DIR = ""
 
+#: Elapsed time of a new response, shared since timedelta is immutable.
+NO_TIME = datetime.timedelta(0)
+
+#: Length of a list from which a dict or list body is streamed.
+STREAM_ITEMS = 256
+
+
+def _reason(status):
+    """The reason phrase of a status code, e.g. ``Created`` for 201."""
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return "Unknown"
+
+def error_response(status_code, message, allow=None):
+    """
+    Build an error response, closing the connection.
+
+    :param status_code (int): Status code.
+    :param message (str): Reason phrase, also shown in the page.
+    :param allow (tuple): Methods of the ``Allow`` header of a 405.
+
+    :rtype bytes: The encoded HTTP response.
+    """
+    if status_code == 401:
+        response_body = """
+        <html><body>
+        <h1>401 Unauthorized</h1>
+        <p>{}</p>
+        <a href="/login.html">Login Here</a>
+        </body></html>
+        """.format(message)
+    else:
+        response_body = """
+        <html><body>
+        <h1>{} {}</h1>
+        <p>An error occurred: {}</p>
+        </body></html>
+        """.format(status_code, message, message)
+
+    response_text = (
+        "HTTP/1.1 {} {}\r\n"
+        "Content-Type: text/html\r\n"
+        "Content-Length: {}\r\n"
+        "{}"
+        "Connection: close\r\n"
+        "\r\n"
+        "{}"
+    ).format(status_code, message, len(response_body.encode('utf-8')),
+             "Allow: {}\r\n".format(", ".join(allow)) if allow else "",
+             response_body)
+
+    return response_text.encode('utf-8')
+
 class Response():   
     """The :class:`Response <Response>` object, which contains a
     server's response to an HTTP request.
@@ -48,6 +109,7 @@ class Response():
     :attrs cookies (CaseInsensitiveDict): response cookies.
     :attrs elapsed (datetime.timedelta): time taken to complete the request.
     :attrs request (PreparedRequest): the original request object.
+    :attrs stream (generator): chunks of a streamed body, sent after the header.
 
     Usage::
 
@@ -73,8 +135,30 @@ class Response():
         "request",
         "body",
         "reason",
+        "stream",
     ]
 
+    # Fixed attribute layout without a ``__dict__``; the cookies and the
+    # history are only allocated when used.
+    __slots__ = (
+        "_content",
+        "_content_consumed",
+        "_next",
+        "_header",
+        "_cookies",
+        "_history",
+        "status_code",
+        "headers",
+        "url",
+        "encoding",
+        "reason",
+        "elapsed",
+        "request",
+        "content",
+        "stream",
+        "raw",
+        "connection",
+    )
 
     def __init__(self, request=None):
         """
@@ -82,10 +166,15 @@ class Response():
 
         : params request : The originating request object.
         """
+        self.headers = {}
+        self.reset()
 
+    def reset(self):
+        """Clear the response, to reuse it for another request."""
         self._content = False
         self._content_consumed = False
         self._next = None
+        self._header = None
 
         #: Integer Code of responded HTTP Status, e.g. 404 or 200.
         self.status_code = None
@@ -93,7 +182,7 @@ class Response():
         #: Case-insensitive Dictionary of Response Headers.
         #: For example, ``headers['content-type']`` will return the
         #: value of a ``'Content-Type'`` response header.
-        self.headers = {}
+        self.headers.clear()
 
         #: URL location of Response.
         self.url = None
@@ -101,26 +190,58 @@ class Response():
         #: Encoding to decode with when accessing response text.
         self.encoding = None
 
-        #: A list of :class:`Response <Response>` objects from
-        #: the history of the Request.
-        self.history = []
+        #: Created on first use, see :attr:`history`.
+        self._history = None
 
         #: Textual reason of responded HTTP Status, e.g. "Not Found" or "OK".
         self.reason = None
 
-        #: A of Cookies the response headers.
-        self.cookies = CaseInsensitiveDict()
+        #: Created on first use, see :attr:`cookies`.
+        self._cookies = None
 
         #: The amount of time elapsed between sending the request
-        self.elapsed = datetime.timedelta(0)
+        self.elapsed = NO_TIME
 
         #: The :class:`PreparedRequest <PreparedRequest>` object to which this
         #: is a response.
         self.request = None
-    
+
+        #: Dynamic content returned by a WeApRous hook.
+        self.content = None
+
+        #: Chunks of a body streamed with ``Transfer-Encoding: chunked``,
+        #: None when the body is part of the built response.
+        self.stream = None
+
+        self.raw = None
+        self.connection = None
+
+    @property
+    def cookies(self):
+        """Cookies of the response headers (Set-Cookie)."""
+        if self._cookies is None:
+            self._cookies = CaseInsensitiveDict()
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, cookies):
+        self._cookies = cookies
+
+    @property
+    def history(self):
+        """A list of :class:`Response <Response>` objects from
+        the history of the Request."""
+        if self._history is None:
+            self._history = []
+        return self._history
+
+    @history.setter
+    def history(self, history):
+        self._history = history
+
     def set_cookie(self, name, value, path="/", domain=None, max_age=None):
         """Set a cookie in the response."""
-        cookie_str = "{}={}".format(name, value)
+        cookie_str = "{}={}".format(name, quote_cookie(value))
         if path:
             cookie_str += "; Path={}".format(path)
         if domain:
@@ -135,11 +256,11 @@ class Response():
         Set a cookie in the response.
         
         :param name (str): Cookie name
-        :param value (str): Cookie value
+        :param value (str): Cookie value, quoted if it needs to be
         :param path (str): Cookie path
         :param max_age (int): Cookie max age in seconds
         """
-        cookie_str = "{}={}; Path={}".format(name, value, path)
+        cookie_str = "{}={}; Path={}".format(name, quote_cookie(value), path)
         if max_age:
             cookie_str += "; Max-Age={}".format(max_age)
         self.cookies[name] = cookie_str
@@ -176,7 +297,7 @@ class Response():
 
         # Processing mime_type based on main_type and sub_type
         main_type, sub_type = mime_type.split('/', 1)
-        print("[Response] processing MIME main_type={} sub_type={}".format(main_type,sub_type))
+        log.debug("processing MIME main_type={} sub_type={}", main_type, sub_type)
         if main_type == 'text':
             self.headers['Content-Type']='text/{}'.format(sub_type)
             if sub_type == 'plain' or sub_type == 'css':
@@ -235,18 +356,18 @@ class Response():
         # --- KẾT THÚC SỬA LỖI ---
         #
 
-        print("[Response] serving the object at location {}".format(filepath))
+        log.debug("serving the object at location {}", filepath)
         
         try:
             with open(filepath, 'rb') as f:
                 content = f.read()
             return len(content), content
         except FileNotFoundError:
-            print("[Response] File not found at {}".format(filepath))
+            log.debug("File not found at {}", filepath)
             # Trả về 0 và content để build_response có thể xử lý 404
             return 0, b"File not found"
         except Exception as e:
-            print("[Response] Error reading file {}: {}".format(filepath, e))
+            log.warning("Error reading file {}: {}", filepath, e)
             return 0, b"Error reading file"
 
     def build_response_header(self, request):
@@ -267,8 +388,6 @@ class Response():
                 "Accept-Language": "{}".format(reqhdr.get("Accept-Language", "en-US,en;q=0.9")),
                 "Authorization": "{}".format(reqhdr.get("Authorization", "Basic <credentials>")),
                 "Cache-Control": "no-cache",
-                "Content-Type": "{}".format(self.headers['Content-Type']),
-                "Content-Length": "{}".format(len(self._content)),
 #                "Cookie": "{}".format(reqhdr.get("Cookie", "sessionid=xyz789")), #dummy cooki
         #
         # TODO prepare the request authentication
@@ -281,15 +400,33 @@ class Response():
                 "Warning": "199 Miscellaneous warning",
                 "User-Agent": "{}".format(reqhdr.get("User-Agent", "Chrome/123.0.0.0")),
             }
+        # The headers set by the route override the defaults; the framing
+        # ones are computed here.
+        names = {name.lower(): name for name in headers}
+        for key, value in rsphdr.items():
+            lower = key.lower()
+            if lower in ("content-length", "transfer-encoding", "connection"):
+                continue
+            if lower in names:
+                del headers[names[lower]]
+            names[lower] = key
+            headers[key] = "{}".format(value)
+        if self.stream is not None:
+            headers["Transfer-Encoding"] = "chunked"
+        else:
+            headers["Content-Length"] = "{}".format(len(self._content))
 
         # Build header string
-        header_lines = ["HTTP/1.1 200 OK"]
+        status = self.status_code or 200
+        reason = self.reason or _reason(status)
+        header_lines = ["HTTP/1.1 {} {}".format(status, reason)]
         for key, value in headers.items():
             header_lines.append("{}: {}".format(key, value))
             
         # Add Set-Cookie headers
-        for cookie_name, cookie_value in self.cookies.items():
-            header_lines.append("Set-Cookie: {}".format(cookie_value))
+        if self._cookies:
+            for cookie_name, cookie_value in self._cookies.items():
+                header_lines.append("Set-Cookie: {}".format(cookie_value))
             
         header_lines.append("")  # Empty line to separate headers from body
         fmt_header = "\r\n".join(header_lines) + "\r\n"
@@ -297,6 +434,43 @@ class Response():
         return fmt_header.encode('utf-8')
 
 
+    def is_streamed(self, content):
+        """
+        Whether dynamic content is an iterable of parts (e.g. a generator)
+        rather than a complete body.
+
+        :params content: the value returned by a route handler.
+
+        :rtype bool:
+        """
+        return (hasattr(content, '__iter__') and
+                not isinstance(content, (str, bytes, bytearray, dict, list, tuple)))
+
+    def build_streamed_response(self, request):
+        """
+        Constructs the HTTP response header of a body produced by an iterable
+        of parts, whose length is not known in advance.
+
+        HTTP/1.1 clients receive the parts as chunks through :attr:`stream`,
+        as soon as they are produced. Older clients cannot decode chunks, so
+        the parts are joined into a plain body.
+
+        :params request (class:`Request <Request>`): incoming request object.
+
+        :rtype bytes: the encoded header, or the full response for HTTP/1.0.
+        """
+        if getattr(request, 'version', None) != 'HTTP/1.1':
+            self._content = b"".join(
+                part.encode('utf-8') if isinstance(part, str) else part
+                for part in self.content)
+            self._header = self.build_response_header(request)
+            return self._header + self._content
+
+        self._content = b""
+        self.stream = encode_chunks(self.content)
+        self._header = self.build_response_header(request)
+        return self._header
+
     def build_notfound(self):
         """
         Constructs a standard 404 Not Found HTTP response.
@@ -316,23 +490,47 @@ class Response():
             ).encode('utf-8')
 
 
+    def build_content_response(self, request):
+        """
+        Builds the HTTP response of the dynamic content of a WeApRous route,
+        with the :attr:`status_code` and :attr:`headers` it set, if any.
+        The content type defaults to ``application/json``.
+
+        A dict or list content is encoded as compact JSON, once, to bytes;
+        with a list of :data:`STREAM_ITEMS` items or more, at the top or
+        in the top dict, it is streamed in parts instead.
+
+        :params request (class:`Request <Request>`): incoming request object.
+
+        :rtype bytes: the encoded response, or its header when streamed.
+        """
+        log.debug("Building dynamic response for {} {}", request.method, request.path)
+        if not any(name.lower() == 'content-type' for name in self.headers):
+            self.headers['Content-Type'] = 'application/json'
+        if isinstance(self.content, (dict, list)):
+            if json_length(self.content) >= STREAM_ITEMS:
+                self.content = iter_json(self.content)
+            else:
+                self.content = encode_json(self.content)
+        if self.is_streamed(self.content):
+            return self.build_streamed_response(request)
+        self._content = self.content.encode('utf-8') if isinstance(self.content, str) else self.content
+        self._header = self.build_response_header(request)
+        return self._header + self._content
+
     def build_response(self, request):
         """
         Builds a full HTTP response including headers and content based on the request.
         """
 
         # Check if we have dynamic content from WeApRous route
-        if hasattr(self, 'content') and self.content:
-            print("[Response] Building dynamic response for {} {}".format(request.method, request.path))
-            self.headers['Content-Type'] = 'application/json'
-            self._content = self.content.encode('utf-8') if isinstance(self.content, str) else self.content
-            self._header = self.build_response_header(request)
-            return self._header + self._content
+        if self.content:
+            return self.build_content_response(request)
 
         path = request.path
 
         mime_type = self.get_mime_type(path)
-        print("[Response] {} path {} mime_type {}".format(request.method, request.path, mime_type))
+        log.debug("{} path {} mime_type {}", request.method, request.path, mime_type)
 
         base_dir = ""
 
@@ -0,0 +1,241 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.router
+~~~~~~~~~~~~~~~~~
+
+This module provides the router of the WeApRous routes, a tree of the path
+segments compiled once from the ``(method, path) -> handler`` registry.
+
+A route path is made of literal segments and typed parameters::
+
+    /channels/<id>/messages         # str: one non-empty segment
+    /peers/<int:peer_id>            # int: digits, passed as int
+    /files/<path:name>              # path: the rest, slashes included
+
+Matching walks the tree one segment at a time: a dict lookup for the
+literal segments, then the parameters of the node, ``int`` and ``float``
+before ``str`` and ``path``, backtracking only when a branch dead-ends.
+A path matched for another method gives the allowed methods, so that the
+server answers 405 rather than 404.
+
+Usage Example:
+--------------
+>>> router = Router({("GET", "/peers/<int:peer_id>"): get_peer})
+>>> router.match("GET", "/peers/42")
+(get_peer, {'peer_id': 42}, None)
+>>> router.match("POST", "/peers/42")
+(None, None, ('GET',))
+"""
+
+import math
+import re
+
+try:
+    from urllib.parse import unquote
+except ImportError:
+    from urllib import unquote
+
+
+def _int(segment):
+    # ASCII digits only: isdigit() alone accepts e.g. '\u00b2'
+    return int(segment) if segment.isascii() and segment.isdigit() else None
+
+
+def _float(segment):
+    try:
+        value = float(segment)
+    except ValueError:
+        return None
+    # Not nan, inf nor -inf
+    return value if math.isfinite(value) else None
+
+
+def _str(segment):
+    return segment or None
+
+
+#: Converters of the typed parameters: type -> (priority, function).
+#: The function returns the value, or None to reject the segment.
+CONVERTERS = {
+    "int": (0, _int),
+    "float": (1, _float),
+    "str": (2, _str),
+    "path": (3, _str),
+}
+
+_PARAM = re.compile(r"^<(?:(\w+):)?(\w+)>$")
+
+
+class _Node:
+    """A segment of the tree: its literal children, its parameters and the
+    handlers of the routes ending there."""
+
+    __slots__ = ("children", "params", "handlers")
+
+    def __init__(self):
+        #: literal segment -> _Node
+        self.children = {}
+        #: (priority, type, name, converter, _Node), by priority
+        self.params = []
+        #: method -> handler
+        self.handlers = {}
+
+
+class Router:
+    """
+    Compiled router of the WeApRous routes.
+
+    Attributes:
+        routes (dict): The ``(method, path) -> handler`` registry it was
+                       built from.
+    """
+
+    __attrs__ = [
+        "routes",
+    ]
+
+    def __init__(self, routes=None):
+        """
+        Build the tree of ``routes``.
+
+        :param routes (dict): ``(method, path) -> handler``.
+
+        :raise ValueError: if a path has an unknown parameter type, or a
+                           ``path`` parameter before its last segment.
+        """
+        self.routes = {}
+        self._root = _Node()
+        #: Path without parameters -> the handlers of its node, by method
+        self._static = {}
+        for (method, path), handler in (routes or {}).items():
+            self.add(method, path, handler)
+
+    def add(self, method, path, handler):
+        """
+        Add the route ``(method, path)`` to the tree.
+
+        :param method (str): HTTP method.
+        :param path (str): Route path, with ``<type:name>`` parameters.
+        :param handler (callable): The route handler.
+        """
+        node = self._root
+        segments = path.strip("/").split("/") if path.strip("/") else []
+        for index, segment in enumerate(segments):
+            param = _PARAM.match(segment)
+            if param is None:
+                node = node.children.setdefault(segment, _Node())
+                continue
+            kind, name = param.group(1) or "str", param.group(2)
+            if kind not in CONVERTERS:
+                raise ValueError("Unknown parameter type {!r} in {}".format(kind, path))
+            if kind == "path" and index != len(segments) - 1:
+                raise ValueError("A path parameter must end the route {}".format(path))
+            for _, other_kind, other_name, _, child in node.params:
+                if other_kind == kind and other_name == name:
+                    node = child
+                    break
+            else:
+                priority, converter = CONVERTERS[kind]
+                child = _Node()
+                node.params.append((priority, kind, name, converter, child))
+                node.params.sort(key=lambda param: param[0])
+                node = child
+        node.handlers[method.upper()] = handler
+        self.routes[(method.upper(), path)] = handler
+        if "<" not in path:
+            self._static["/".join(segments)] = node.handlers
+
+    def match(self, method, path):
+        """
+        Find the handler of a request.
+
+        :param method (str): Method of the request.
+        :param path (str): Path of the request, without the query string.
+
+        :rtype tuple: (handler, params, allowed): the handler and its path
+                      parameters, by name; or (None, None, allowed) where
+                      ``allowed`` is the tuple of the methods of the path,
+                      None when no route has this path.
+        """
+        stripped = path.strip("/")
+        # The routes without parameters first, in one lookup
+        handlers = self._static.get(stripped)
+        if handlers is not None:
+            handler = handlers.get(method)
+            if handler is not None:
+                return handler, {}, None
+
+        segments = stripped.split("/") if stripped else []
+        params = []
+        allowed = []
+        handler = self._match(self._root, segments, 0, method, params, allowed)
+        if handler is not None:
+            return handler, dict(params), None
+        return None, None, tuple(sorted(set(allowed))) or None
+
+    def _match(self, node, segments, index, method, params, allowed):
+        """
+        Depth-first search below ``node`` of the handler of ``method`` for
+        ``segments[index:]``.
+
+        :param params (list): (name, value) of the parameters matched so far,
+                              those of the result when found.
+        :param allowed (list): Collects the methods of the matching paths.
+
+        :rtype callable: The handler, None when not found.
+        """
+        if index == len(segments):
+            if not node.handlers:
+                return None
+            handler = node.handlers.get(method)
+            if handler is None:
+                allowed.extend(node.handlers)
+            return handler
+
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            handler = self._match(child, segments, index + 1, method, params, allowed)
+            if handler is not None:
+                return handler
+
+        for _, kind, name, converter, child in node.params:
+            if kind == "path":
+                value = converter(unquote("/".join(segments[index:])))
+                if value is None or not child.handlers:
+                    continue
+                handler = child.handlers.get(method)
+                if handler is None:
+                    allowed.extend(child.handlers)
+                    continue
+                params.append((name, value))
+                return handler
+            value = converter(unquote(segment))
+            if value is None:
+                continue
+            params.append((name, value))
+            handler = self._match(child, segments, index + 1, method, params, allowed)
+            if handler is not None:
+                return handler
+            params.pop()
+        return None
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __bool__(self):
+        return bool(self.routes)
+
+    def __repr__(self):
+        return repr(sorted(self.routes))
@@ -0,0 +1,287 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.timers
+~~~~~~~~~~~~~~~~~
+
+This module provides the deadline manager of the connections: a hashed
+:class:`TimerWheel <TimerWheel>` and the per-connection
+:class:`Deadline <Deadline>` built on it.
+
+Every connection is under one deadline at a time:
+
+- ``idle``: waiting for the first byte of the next request,
+- ``read``: receiving the rest of a request, whatever the pace of the bytes,
+  so a client trickling its headers (slowloris) cannot hold a connection,
+- ``write``: sending a response to a client that does not read it.
+
+Scheduling and cancelling a timer are O(1); the wheel visits each slot once
+per turn, so expiring the timers costs O(1) amortised per timer. Expired
+connections are closed and counted in :meth:`TimerWheel.stats`.
+
+Usage Example:
+--------------
+>>> wheel = TimerWheel()
+>>> wheel.start()
+>>> deadline = Deadline(wheel, lambda: shutdown(conn), idle_timeout=5)
+>>> deadline.idle()
+"""
+
+import math
+import socket
+import threading
+import time
+
+from .logger import get_logger
+
+log = get_logger("TimerWheel")
+
+#: Seconds of a wheel tick, the resolution of the deadlines.
+TICK = 0.25
+
+#: Slots of the wheel; a turn covers ``TICK * SLOTS`` seconds.
+SLOTS = 512
+
+#: Seconds to receive a whole request once its first byte arrived.
+READ_TIMEOUT = 10
+
+#: Seconds a response write may stay blocked by the client.
+WRITE_TIMEOUT = 10
+
+
+def shutdown(sock):
+    """
+    Shut a socket down, waking up a thread blocked reading or writing it.
+
+    :param sock (socket.socket): The socket to shut down.
+    """
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class Timer:
+    """
+    A callback scheduled on a :class:`TimerWheel <TimerWheel>`.
+
+    Attributes:
+        expires (int): Tick at which the timer fires.
+        callback (callable): Called without arguments when the timer fires.
+        kind (str): Kind of the timer, counted when it fires.
+    """
+
+    __attrs__ = [
+        "expires",
+        "callback",
+        "kind",
+    ]
+
+    def __init__(self, wheel, expires, callback, kind):
+        self.wheel = wheel
+        self.expires = expires
+        self.callback = callback
+        self.kind = kind
+        #: Slot of the wheel holding the timer, None once fired or cancelled.
+        self.slot = None
+
+    def cancel(self):
+        """Cancel the timer if it has not fired yet."""
+        self.wheel.cancel(self)
+
+
+class TimerWheel:
+    """
+    A hashed timing wheel.
+
+    A timer is put in the slot of its expiry tick modulo the number of
+    slots; a slot may hold timers of later turns, which are kept until
+    their turn comes.
+
+    The wheel is advanced either by its own thread (:meth:`start`) or by
+    an event loop calling :meth:`advance`.
+
+    Attributes:
+        tick (float): Seconds of a tick.
+        slots (int): Number of slots.
+        reaped (int): Number of timers fired.
+    """
+
+    __attrs__ = [
+        "tick",
+        "slots",
+        "reaped",
+    ]
+
+    def __init__(self, tick=TICK, slots=SLOTS):
+        self.tick = tick
+        self.slots = slots
+        self.reaped = 0
+        self._wheel = [set() for _ in range(slots)]
+        #: Last tick processed.
+        self._current = self.now()
+        #: Number of pending timers.
+        self._pending = 0
+        #: Fired timers per kind.
+        self._expired = {}
+        self._lock = threading.Lock()
+
+    def now(self):
+        """Current tick."""
+        return int(time.monotonic() / self.tick)
+
+    def schedule(self, delay, callback, kind="timer"):
+        """
+        Schedule ``callback`` in ``delay`` seconds, rounded up to a tick.
+
+        :param delay (float): Seconds before the timer fires.
+        :param callback (callable): Called without arguments when it fires.
+        :param kind (str): Kind of the timer, counted when it fires.
+
+        :rtype Timer: The timer, to cancel it.
+        """
+        expires = int(math.ceil((time.monotonic() + delay) / self.tick))
+        with self._lock:
+            timer = Timer(self, max(expires, self._current + 1), callback, kind)
+            timer.slot = timer.expires % self.slots
+            self._wheel[timer.slot].add(timer)
+            self._pending += 1
+        return timer
+
+    def cancel(self, timer):
+        """Cancel ``timer`` if it has not fired yet."""
+        with self._lock:
+            if timer.slot is not None:
+                self._wheel[timer.slot].discard(timer)
+                timer.slot = None
+                self._pending -= 1
+
+    def advance(self):
+        """
+        Fire the timers expired since the last call.
+
+        :rtype int: Number of timers fired.
+        """
+        now = self.now()
+        fired = []
+        with self._lock:
+            # Each slot is visited at most once, even after a long pause.
+            steps = min(now - self._current, self.slots)
+            for step in range(1, steps + 1):
+                bucket = self._wheel[(self._current + step) % self.slots]
+                if not bucket:
+                    continue
+                expired = [timer for timer in bucket if timer.expires <= now]
+                for timer in expired:
+                    bucket.discard(timer)
+                    timer.slot = None
+                fired.extend(expired)
+            self._current = max(self._current, now)
+
+            self._pending -= len(fired)
+            self.reaped += len(fired)
+            for timer in fired:
+                self._expired[timer.kind] = self._expired.get(timer.kind, 0) + 1
+
+        for timer in fired:
+            try:
+                timer.callback()
+            except Exception as e:
+                log.error("Error in {} timer: {}", timer.kind, e)
+        return len(fired)
+
+    def start(self):
+        """Advance the wheel every tick from a daemon thread."""
+        thread = threading.Thread(target=self.run, name="timer-wheel")
+        thread.daemon = True  # Thread will die when main program exits
+        thread.start()
+
+    def run(self):
+        """Advance the wheel forever."""
+        while True:
+            time.sleep(self.tick)
+            self.advance()
+
+    def stats(self):
+        """
+        Snapshot of the wheel counters.
+
+        :rtype dict: pending timers, reaped total and reaped per kind.
+        """
+        with self._lock:
+            stats = {"pending": self._pending, "reaped": self.reaped}
+            for kind, count in self._expired.items():
+                stats["reaped_" + kind] = count
+            return stats
+
+
+class Deadline:
+    """
+    The idle, read and write deadlines of one connection; arming one
+    cancels the previous one.
+
+    Without a wheel every method is a no-op.
+
+    Attributes:
+        kind (str): The armed deadline, ``idle``, ``read``, ``write`` or None.
+        idle_timeout (float): Seconds to wait for the next request.
+        read_timeout (float): Seconds to receive a whole request.
+        write_timeout (float): Seconds a response write may stay blocked.
+    """
+
+    __attrs__ = [
+        "kind",
+        "idle_timeout",
+        "read_timeout",
+        "write_timeout",
+    ]
+
+    def __init__(self, wheel, on_expire, idle_timeout,
+                 read_timeout=READ_TIMEOUT, write_timeout=WRITE_TIMEOUT):
+        """
+        :param wheel (TimerWheel): Wheel of the timers, None to disable.
+        :param on_expire (callable): Closes the connection, called from the
+                                     thread advancing the wheel.
+        """
+        self.wheel = wheel
+        self.on_expire = on_expire
+        self.kind = None
+        self.idle_timeout = idle_timeout
+        self.read_timeout = read_timeout
+        self.write_timeout = write_timeout
+        self._timer = None
+
+    def idle(self):
+        """Arm the idle deadline."""
+        self._arm("idle", self.idle_timeout)
+
+    def reading(self):
+        """Arm the read deadline."""
+        self._arm("read", self.read_timeout)
+
+    def writing(self):
+        """Arm the write deadline."""
+        self._arm("write", self.write_timeout)
+
+    def clear(self):
+        """Cancel the armed deadline."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.kind = None
+
+    def _arm(self, kind, timeout):
+        self.clear()
+        self.kind = kind
+        if self.wheel is not None:
+            self._timer = self.wheel.schedule(timeout, self.on_expire, kind)
@@ -10,6 +10,11 @@
 # while attending the course
 #
 
+import itertools
+import json
+import os
+import re
+
 # Python 3 compatibility: urlparse moved to urllib.parse
 try:
     from urllib.parse import urlparse, unquote
@@ -29,4 +34,366 @@ def get_auth_from_url(url):
     except (AttributeError, TypeError):
         auth = ("", "")
 
-    return auth
\ No newline at end of file
+    return auth
+
+#: A bare CR or LF, an obs-fold line or whitespace before the colon of a
+#: field name: framings parsed differently from one server to another.
+_BAD_HEAD = re.compile(rb"\r(?!\n)|(?<!\r)\n|\n[ \t]|\n[^:\r\n]*[ \t]:")
+
+
+def is_valid_head(head):
+    """Whether the header block of a request is free of bare CR or LF line
+    ends, obs-fold continuation lines and whitespace between a field name
+    and its colon, which must be answered with 400 (RFC 9112).
+
+    :param head (bytes): header block, request line included, without the
+                         final empty line.
+    :rtype: bool
+    """
+    return _BAD_HEAD.search(head) is None
+
+
+def get_header(head, name):
+    """Given the raw header block of an HTTP message, return the raw value of
+    the header ``name`` (lowercase bytes), or None when it is absent.
+
+    As in :class:`Headers <daemon.parser.Headers>`, the last of repeated
+    fields wins.
+
+    :param head (bytes): header block, request or status line included.
+    :param name (bytes): lowercase header name.
+    :rtype: bytes
+    """
+    for line in reversed(head.split(b"\r\n")[1:]):
+        key, _, value = line.partition(b":")
+        if key.strip().lower() == name:
+            return value.strip()
+    return None
+
+
+#: A Content-Length value: ASCII digits only, no sign, separator or base.
+_CONTENT_LENGTH = re.compile(rb"[0-9]+\Z")
+
+
+def content_length(head):
+    """Given the raw header block of an HTTP message, return the value of its
+    Content-Length header, or None when it is absent.
+
+    Unlike ``int()``, only ASCII digits are accepted, and repeated fields
+    must agree (RFC 9112, section 6.3): a parser reading another form or
+    another field would frame the body differently.
+
+    :param head (bytes): header block, request or status line included.
+    :rtype: int
+    :raise ValueError: if a value is not digits, or the values differ.
+    """
+    values = set()
+    for line in head.split(b"\r\n")[1:]:
+        key, _, value = line.partition(b":")
+        if key.strip().lower() == b"content-length":
+            value = value.strip(b" \t")
+            if _CONTENT_LENGTH.match(value) is None:
+                raise ValueError("Invalid Content-Length {!r}".format(value))
+            values.add(int(value))
+    if len(values) > 1:
+        raise ValueError("Conflicting Content-Length {}".format(sorted(values)))
+    return values.pop() if values else None
+
+
+def parse_content_length(head, default=0):
+    """Given the raw header block of an HTTP message, return the value of its
+    Content-Length header, or ``default`` when it is absent or malformed.
+
+    :param head (bytes): header block, request or status line included.
+    :rtype: int
+    """
+    try:
+        length = content_length(head)
+    except ValueError:
+        return default
+    return default if length is None else length
+
+
+def is_keep_alive(head):
+    """Given the raw header block of an HTTP request, tell whether the client
+    wants the connection kept open: HTTP/1.1 unless ``Connection: close``,
+    HTTP/1.0 only with ``Connection: keep-alive``.
+
+    :param head (bytes): header block, request line included.
+    :rtype: bool
+    """
+    request_line = head.split(b"\r\n", 1)[0]
+    connection = (get_header(head, b"connection") or b"").lower()
+    if request_line.endswith(b"HTTP/1.1"):
+        return b"close" not in connection
+    if request_line.endswith(b"HTTP/1.0"):
+        return b"keep-alive" in connection
+    return False
+
+
+def frame_response(response, keep_alive, keep_alive_params=None, extra_headers=None):
+    """Given a raw HTTP response, recompute its Content-Length from the actual
+    body and replace its Connection (and Keep-Alive) headers.
+
+    A response with ``Transfer-Encoding: chunked`` is framed by its chunks and
+    gets no Content-Length; its body may follow the header block separately.
+
+    :param response (bytes): raw HTTP response.
+    :param keep_alive (bool): whether the connection stays open.
+    :param keep_alive_params (bytes): value of the Keep-Alive header, if any.
+    :param extra_headers (list): header lines (bytes) to add, if any.
+    :rtype: bytes
+    """
+    end = response.find(b"\r\n\r\n")
+    if end < 0:
+        return response
+
+    lines = response[:end].split(b"\r\n")
+    head = [lines[0]]
+    chunked = False
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"transfer-encoding":
+            chunked = value.strip().lower().endswith(b"chunked")
+        if name not in (b"content-length", b"connection", b"keep-alive"):
+            head.append(line)
+
+    if not chunked:
+        head.append(b"Content-Length: %d" % (len(response) - end - 4))
+    if keep_alive:
+        head.append(b"Connection: keep-alive")
+        if keep_alive_params:
+            head.append(b"Keep-Alive: " + keep_alive_params)
+    else:
+        head.append(b"Connection: close")
+    if extra_headers:
+        head.extend(extra_headers)
+    head.append(b"\r\n")
+
+    return b"\r\n".join(head) + memoryview(response)[end + 4:]
+
+
+def encode_chunks(parts):
+    """Given an iterable of body parts, generate the chunks of a
+    ``Transfer-Encoding: chunked`` body, last chunk included. Each non-empty
+    part becomes one chunk, so it is sent as soon as it is produced.
+
+    :param parts (iterable): body parts, str (UTF-8 encoded) or bytes.
+    :rtype: generator of bytes
+    """
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        if part:
+            yield b"%x\r\n" % len(part) + part + b"\r\n"
+    yield b"0\r\n\r\n"
+
+
+#: Encoder of the JSON bodies, reused: compact, ASCII only.
+JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+#: Items of a list encoded per call when a JSON body is streamed.
+JSON_BATCH = 32
+
+#: Bytes gathered in a part of a streamed JSON body.
+JSON_PART_SIZE = 8 * 1024
+
+
+def encode_json(obj):
+    """Given a JSON-serializable value, return it encoded, compact.
+
+    :rtype: bytes
+    """
+    # ASCII only, so encoding the str is a plain copy
+    return JSON_ENCODER.encode(obj).encode('ascii')
+
+
+def iter_json(obj, batch=JSON_BATCH, size=JSON_PART_SIZE):
+    """Given a JSON-serializable value, generate its encoding in parts of
+    about ``size`` bytes. Long lists, at the top or as values of the top
+    dict, are encoded ``batch`` items at a time, so the whole body is never
+    held at once.
+
+    :rtype: generator of bytes
+    """
+    parts = []
+    held = 0
+    for piece in _json_pieces(obj, batch):
+        parts.append(piece)
+        held += len(piece)
+        if held >= size:
+            yield "".join(parts).encode('ascii')
+            parts = []
+            held = 0
+    if parts:
+        yield "".join(parts).encode('ascii')
+
+
+def _json_pieces(obj, batch, top=True):
+    encode = JSON_ENCODER.encode
+    if isinstance(obj, list) and len(obj) > batch:
+        yield "["
+        for start in range(0, len(obj), batch):
+            items = encode(obj[start:start + batch])[1:-1]
+            yield items if start == 0 else "," + items
+        yield "]"
+    elif isinstance(obj, dict) and top:
+        yield "{"
+        for index, (key, value) in enumerate(obj.items()):
+            # Keys become strings, as json.dumps does
+            key = key if isinstance(key, str) else encode(key)
+            yield ("," if index else "") + encode(key) + ":"
+            yield from _json_pieces(value, batch, top=False)
+        yield "}"
+    else:
+        yield encode(obj)
+
+
+def json_length(obj):
+    """Given a JSON value, return the length of its longest list, at the top
+    or as a value of the top dict, to tell whether to stream it.
+
+    :rtype: int
+    """
+    if isinstance(obj, list):
+        return len(obj)
+    if isinstance(obj, dict):
+        return max([len(value) for value in obj.values() if isinstance(value, list)] or [0])
+    return 0
+
+
+def text_response(body, status="200 OK", content_type="text/plain; charset=utf-8"):
+    """Given a text body, build a complete raw HTTP response.
+
+    :param body (str): the body, UTF-8 encoded.
+    :param status (str): status code and reason, e.g. ``"404 Not Found"``.
+    :param content_type (str): value of the Content-Type header.
+    :rtype: bytes
+    """
+    body = body.encode('utf-8')
+    return (
+        "HTTP/1.1 {}\r\n"
+        "Content-Type: {}\r\n"
+        "Content-Length: {}\r\n"
+        "\r\n"
+    ).format(status, content_type, len(body)).encode('utf-8') + body
+
+
+_request_ids = itertools.count(1)
+_request_id_prefix = None
+
+
+def new_request_id():
+    """Generate a request ID, unique across processes: a random prefix drawn
+    once per process followed by a counter, e.g. ``3f9a0c12b7e4-1a``.
+
+    :rtype: str
+    """
+    global _request_id_prefix
+    if _request_id_prefix is None:
+        _request_id_prefix = os.urandom(6).hex()
+    return "{}-{:x}".format(_request_id_prefix, next(_request_ids))
+
+
+def _reset_request_ids():
+    global _request_id_prefix
+    _request_id_prefix = None
+
+
+if hasattr(os, "register_at_fork"):
+    # A forked worker draws its own prefix.
+    os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+def server_timing(phases):
+    """Given the durations of the phases of a request, build the value of a
+    ``Server-Timing`` header, durations in milliseconds.
+
+    :param phases (iterable): (name, seconds) pairs.
+    :rtype: bytes
+    """
+    return ", ".join("{};dur={:.3f}".format(name, seconds * 1000)
+                     for name, seconds in phases).encode('ascii')
+
+
+#: Characters allowed in an unquoted cookie value (RFC 6265 cookie-octet).
+_COOKIE_OCTETS = frozenset(
+    chr(c) for c in range(0x21, 0x7f) if chr(c) not in '",;\\')
+
+
+def quote_cookie(value):
+    """Given a cookie value, return it as is when it only has cookie-octets,
+    else as a quoted-string with ``"`` and ``\\`` escaped.
+
+    :param value (str): the cookie value.
+    :rtype: str
+    """
+    value = str(value)
+    if all(c in _COOKIE_OCTETS for c in value):
+        return value
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def unquote_cookie(value):
+    """Given a raw cookie value, strip its surrounding double quotes and
+    undo the escaping of :func:`quote_cookie`.
+
+    :param value (str): the raw cookie value.
+    :rtype: str
+    """
+    if len(value) < 2 or value[0] != '"' or value[-1] != '"':
+        return value
+    value = value[1:-1]
+    if '\\' not in value:
+        return value
+    chars = []
+    escaped = False
+    for c in value:
+        if escaped or c != '\\':
+            chars.append(c)
+            escaped = False
+        else:
+            escaped = True
+    return "".join(chars)
+
+
+def parse_cookie(header):
+    """Given the value of a Cookie header, return its cookies. Pairs are
+    separated by ``;``, a quoted value may contain ``;``, and a pair without
+    ``=`` is skipped; the last of repeated names wins.
+
+    :param header (str): value of the Cookie header.
+    :rtype: dict
+    """
+    cookies = {}
+    pos = 0
+    size = len(header)
+    while pos < size:
+        eq = header.find('=', pos)
+        semi = header.find(';', pos)
+        if eq < 0 or (0 <= semi < eq):
+            # A pair without a value
+            if semi < 0:
+                break
+            pos = semi + 1
+            continue
+        name = header[pos:eq].strip()
+        start = eq + 1
+        while start < size and header[start] in ' \t':
+            start += 1
+        if start < size and header[start] == '"':
+            # A quoted-string ends at the first unescaped quote
+            end = start + 1
+            while end < size and header[end] != '"':
+                end += 2 if header[end] == '\\' else 1
+            value = unquote_cookie(header[start:end + 1])
+            semi = header.find(';', end + 1)
+        else:
+            value = header[start:semi if semi >= 0 else size].strip()
+        if name:
+            cookies[name] = value
+        if semi < 0:
+            break
+        pos = semi + 1
+    return cookies
@@ -17,7 +17,32 @@ deamon.weaproute
 This module provides a WeApRous object to deploy RESTful url web app with routing
 """
 
+import inspect
+
 from .backend import create_backend
+from .router import Router
+from .middleware import Middleware
+from .logger import get_logger
+
+log = get_logger("WeApRous")
+
+
+def accepts(func, name, named=False):
+    """
+    Whether ``func`` can be called with the keyword argument ``name``.
+
+    :param named (bool): Whether a ``**kwargs`` parameter does not count.
+
+    :rtype bool:
+    """
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any((param.kind is param.VAR_KEYWORD and not named) or
+               (param.name == name and param.kind in (param.POSITIONAL_OR_KEYWORD,
+                                                      param.KEYWORD_ONLY))
+               for param in params)
 
 class WeApRous:
     """The fully mutable :class:`WeApRous <WeApRous>` object, which is a lightweight,
@@ -40,16 +65,40 @@ class WeApRous:
       >>> def hello(headers, body):
       >>>     return {'message': 'Hello, world!'}
 
-      >>> app.run()
+      >>> @app.route('/search', methods=['GET'])
+      >>> def search(headers, body, query):
+      >>>     return {'q': query.get('q', ''), 'limit': query.get('limit', 20, type=int)}
+
+      >>> @app.route('/peers/<int:peer_id>', methods=['GET'])
+      >>> def peer(headers, body, peer_id):
+      >>>     return {'peer': peer_id}
+
+      >>> @app.route('/peers/<int:peer_id>', methods=['PUT'])
+      >>> def update_peer(request, peer_id):
+      >>>     peers[peer_id] = request.json
+      >>>     return "", 204
+
+      >>> @app.route('/slow', methods=['GET'])
+      >>> async def slow(headers, body):
+      >>>     await asyncio.sleep(1)
+      >>>     return {'message': 'done'}
+
+      >>> @app.after
+      >>> def no_store(request, response, raw):
+      >>>     return raw.replace(b"\r\n", b"\r\nCache-Control: no-store\r\n", 1)
+
+      >>> app.run(engine="selectors")
     """
 
     def __init__(self):
         """
         Initialize a new WeApRous instance.
 
-        Sets up an empty route registry and prepares placeholders for IP and port.
+        Sets up an empty route registry and middleware registry, and
+        prepares placeholders for IP and port.
         """
         self.routes = {}
+        self.middleware = Middleware()
         self.ip = None
         self.port = None
         return
@@ -64,12 +113,57 @@ class WeApRous:
         self.ip = ip
         self.port = port
 
-    def route(self, path, methods=['GET']):
+    def before(self, func):
+        """
+        Decorator to register a middleware run before every handler and
+        static file, see :meth:`Middleware.before <Middleware.before>`.
+        """
+        return self.middleware.before(func)
+
+    def after(self, func):
+        """
+        Decorator to register a middleware run after every handler and
+        static file, see :meth:`Middleware.after <Middleware.after>`.
+        """
+        return self.middleware.after(func)
+
+    def around(self, func):
+        """
+        Decorator to register a middleware run around every handler and
+        static file, see :meth:`Middleware.around <Middleware.around>`.
+        """
+        return self.middleware.around(func)
+
+    def route(self, path, methods=['GET'], middleware=None):
         """
         Decorator to register a route handler for a specific path and HTTP methods.
 
+        The path may hold typed parameters, ``<name>``, ``<int:name>``,
+        ``<float:name>`` or a final ``<path:name>`` (see
+        :mod:`daemon.router`); their values are passed to the handler as
+        keyword arguments of that name.
+
+        A handler declaring a ``request`` parameter is called with a
+        :class:`Context <Context>` of the request, and the path parameters.
+        Any other handler is called as before, with the ``headers`` as a
+        string and the decoded ``body``; one declaring a ``query`` parameter
+        (or ``**kwargs``) also receives the parameters of the query string,
+        a :class:`QueryDict <QueryDict>`.
+
+        A handler returns the body, or a ``(body, status)`` or
+        ``(body, status, headers)`` tuple.
+
+        A handler may be a coroutine function (``async def``): it is awaited
+        on the event loop of the server and holds no thread while it waits.
+        Synchronous handlers keep running in the thread pool of the engine;
+        an app can mix both.
+
+        The ``middleware`` of a route runs inside the one of the app; both
+        are compiled into the chain of the route when the server starts.
+
         :param path (str): The URL path to route.
         :param methods (list): A list of HTTP methods (e.g., ['GET', 'POST']) to bind.
+        :param middleware (Middleware): Middleware of this route only.
 
         :rtype: function - A decorator that registers the handler function.
         """
@@ -80,22 +174,30 @@ class WeApRous:
             # Optional attach route metadata to the function
             func._route_path = path
             func._route_methods = methods
+            func._route_context = accepts(func, "request", named=True)
+            func._route_query = accepts(func, "query")
+            func._route_middleware = middleware
 
             return func
         return decorator
 
-    def run(self):
+    def run(self, **options):
         """
         Start the backend server and begin handling requests.
 
         This method launches the TCP server using the configured IP and port,
-        and dispatches incoming requests to the registered route handlers.
+        and dispatches incoming requests to the registered route handlers,
+        compiled once here into a :class:`Router <Router>`.
+
+        :param options: Engine options forwarded to :func:`create_backend`
+                        (e.g. ``engine="pool"``, ``threads=16``).
 
         :raise: Error if IP or port has not been configured.
         """
         if not self.ip or not self.port:
-            print("Rous app need to preapre address"
-                  "by calling app.prepare_address(ip,port)")
+            log.error("Rous app need to preapre address "
+                      "by calling app.prepare_address(ip,port)")
 
-        create_backend(self.ip, self.port, self.routes)
+        create_backend(self.ip, self.port, Router(self.routes),
+                       middleware=self.middleware, **options)
         
@@ -0,0 +1,204 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.workerpool
+~~~~~~~~~~~~~~~~~
+
+This module provides a fixed-size worker thread pool that drains a bounded
+queue of accepted connections. It is used by the backend in ``pool`` engine
+mode instead of spawning one thread per connection.
+
+When the accept queue is full, the pool applies one of the overload policies:
+
+- ``block``: the accept loop waits until a worker frees a queue slot.
+- ``reject``: the connection receives a prebuilt ``503 Service Unavailable``
+  response and is closed.
+- ``drop``: the connection is closed without a response.
+
+Usage Example:
+--------------
+>>> pool = WorkerPool(workers=8, queue_size=64, overload="reject")
+>>> pool.start(lambda conn, addr: conn.close())
+>>> pool.submit(conn, addr)
+>>> pool.stats()
+"""
+
+import queue
+import threading
+
+from .admission import build_overload_response
+from .logger import get_logger
+
+log = get_logger("WorkerPool")
+
+#: Overload policies accepted by :class:`WorkerPool <WorkerPool>`.
+OVERLOAD_POLICIES = ("block", "reject", "drop")
+
+#: Prebuilt response sent to connections rejected under overload.
+RESPONSE_503 = build_overload_response()
+
+
+class WorkerPool:
+    """
+    A fixed-size pool of worker threads fed by a bounded accept queue.
+
+    Attributes:
+        workers (int): Number of worker threads.
+        queue_size (int): Maximum number of connections waiting for a worker.
+        overload (str): Overload policy, one of ``block``, ``reject`` or ``drop``.
+    """
+
+    __attrs__ = [
+        "workers",
+        "queue_size",
+        "overload",
+    ]
+
+    def __init__(self, workers=8, queue_size=64, overload="block"):
+        """
+        Initialize a new WorkerPool instance.
+
+        :param workers (int): Number of worker threads.
+        :param queue_size (int): Capacity of the accept queue.
+        :param overload (str): Overload policy applied when the queue is full.
+
+        :raise ValueError: If the sizes are not positive or the policy is unknown.
+        """
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be positive")
+        if overload not in OVERLOAD_POLICIES:
+            raise ValueError("Invalid overload policy: {}".format(overload))
+
+        #: Number of worker threads.
+        self.workers = workers
+        #: Accept queue capacity.
+        self.queue_size = queue_size
+        #: Overload policy.
+        self.overload = overload
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._handler = None
+        self._lock = threading.Lock()
+
+        # Live counters, guarded by ``_lock``.
+        self._busy = 0
+        self._accepted = 0
+        self._rejected = 0
+        self._dropped = 0
+        self._completed = 0
+
+    def start(self, handler):
+        """
+        Start the worker threads.
+
+        :param handler (callable): Called as ``handler(conn, addr)`` for each
+                                   queued connection.
+        """
+        self._handler = handler
+        for i in range(self.workers):
+            worker = threading.Thread(
+                target=self._work,
+                name="backend-worker-{}".format(i)
+            )
+            worker.daemon = True  # Thread will die when main program exits
+            worker.start()
+            self._threads.append(worker)
+
+    def submit(self, conn, addr):
+        """
+        Queue an accepted connection for the workers, applying the overload
+        policy when the queue is full.
+
+        :param conn (socket.socket): Client connection socket.
+        :param addr (tuple): Client address (IP, port).
+
+        :rtype bool: True if the connection was queued.
+        """
+        if self.overload == "block":
+            self._queue.put((conn, addr))
+        else:
+            try:
+                self._queue.put_nowait((conn, addr))
+            except queue.Full:
+                self._shed(conn)
+                return False
+
+        with self._lock:
+            self._accepted += 1
+        return True
+
+    def stop(self):
+        """Ask every worker to exit once the queued connections are drained."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for worker in self._threads:
+            worker.join()
+        self._threads = []
+
+    def stats(self):
+        """
+        Snapshot of the live pool counters.
+
+        :rtype dict: queue depth, worker utilisation and connection counters.
+        """
+        with self._lock:
+            busy = self._busy
+            return {
+                "workers": self.workers,
+                "busy_workers": busy,
+                "utilisation": float(busy) / self.workers,
+                "queue_depth": self._queue.qsize(),
+                "queue_size": self.queue_size,
+                "accepted": self._accepted,
+                "rejected": self._rejected,
+                "dropped": self._dropped,
+                "completed": self._completed,
+            }
+
+    def _shed(self, conn):
+        """Reject or drop a connection that did not fit in the queue."""
+        if self.overload == "reject":
+            try:
+                conn.sendall(RESPONSE_503)
+            except OSError:
+                pass
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+        with self._lock:
+            if self.overload == "reject":
+                self._rejected += 1
+            else:
+                self._dropped += 1
+
+    def _work(self):
+        """Worker loop: take connections from the queue until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            conn, addr = item
+            with self._lock:
+                self._busy += 1
+            try:
+                self._handler(conn, addr)
+            except Exception as e:
+                log.error("Error handling client {}: {}", addr, e)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._completed += 1
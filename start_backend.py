@@ -26,6 +26,14 @@ import socket
 import argparse
 
 from daemon import create_backend
+from daemon.backend import ENGINES
+from daemon.workerpool import OVERLOAD_POLICIES
+from daemon.httpadapter import IDLE_TIMEOUT, MAX_REQUESTS
+from daemon.handoff import DRAIN_TIMEOUT
+from daemon.timers import READ_TIMEOUT, WRITE_TIMEOUT
+from daemon.admission import QUEUE_TIMEOUT
+from daemon.logger import LEVELS, configure
+from daemon.accesslog import MAX_BYTES as ACCESS_LOG_MAX_BYTES
 
 # Default port number used if none is specified via command-line arguments.
 PORT = 9000 
@@ -40,6 +48,29 @@ if __name__ == "__main__":
 
     :arg --server-ip (str): IP address to bind the server (default: 127.0.0.1).
     :arg --server-port (int): Port number to bind the server (default: 9000).
+    :arg --engine (str): Serving engine (default: threaded).
+    :arg --threads (int): Worker threads of the pool engine (default: 8).
+    :arg --queue-size (int): Accept queue capacity of the pool engine (default: 64).
+    :arg --overload (str): Pool overload policy block/reject/drop (default: block).
+    :arg --idle-timeout (float): Keep-alive idle timeout in seconds (default: 5).
+    :arg --max-requests (int): Requests served per connection (default: 100).
+    :arg --read-timeout (float): Seconds to receive a whole request (default: 10).
+    :arg --write-timeout (float): Seconds a response write may block (default: 10).
+    :arg --max-concurrency (int): WeApRous hooks running at once (default: no limit).
+    :arg --max-static (int): Static requests processed at once (default: no limit).
+    :arg --queue-timeout (float): Seconds a request over a cap waits (default: 1).
+    :arg --object-pool: Recycle the request, response and adapter objects.
+    :arg --workers (int): Worker processes sharing the port (default: 1).
+    :arg --handoff (str): Unix socket path for zero-downtime restarts.
+    :arg --drain-timeout (float): Seconds to drain after a handoff (default: 30).
+    :arg --log-level (str): Lowest level logged debug/info/warning/error (default: info).
+    :arg --log-file (str): File the log is appended to (default: stdout).
+    :arg --access-log (str): File of the access log, - for stdout (default: none).
+    :arg --access-log-max-bytes (int): Size rotating the access log (default: 10 MiB).
+    :arg --access-log-rotate (float): Seconds rotating the access log (default: never).
+    :arg --metrics (str): Path serving the metrics, /metrics without a value (default: off).
+    :arg --profiler (str): Prefix of the profiler routes, /debug/profile without a value (default: off).
+    :arg --no-server-timing: Leave the Server-Timing header out of the responses.
     """
 
     parser = argparse.ArgumentParser(
@@ -58,9 +89,169 @@ if __name__ == "__main__":
         default=PORT,
         help='Port number to bind the server. Default is {}.'.format(PORT)
     )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='threaded',
+        help='Serving engine. Default is threaded.'
+    )
+    parser.add_argument(
+        '--threads',
+        type=int,
+        default=8,
+        help='Worker threads of the pool engine. Default is 8.'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=64,
+        help='Accept queue capacity of the pool engine. Default is 64.'
+    )
+    parser.add_argument(
+        '--overload',
+        choices=OVERLOAD_POLICIES,
+        default='block',
+        help='Overload policy of the pool engine. Default is block.'
+    )
+    parser.add_argument(
+        '--idle-timeout',
+        type=float,
+        default=IDLE_TIMEOUT,
+        help='Keep-alive idle timeout in seconds. Default is {}.'.format(IDLE_TIMEOUT)
+    )
+    parser.add_argument(
+        '--max-requests',
+        type=int,
+        default=MAX_REQUESTS,
+        help='Requests served per connection. Default is {}.'.format(MAX_REQUESTS)
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=READ_TIMEOUT,
+        help='Seconds to receive a whole request. Default is {}.'.format(READ_TIMEOUT)
+    )
+    parser.add_argument(
+        '--write-timeout',
+        type=float,
+        default=WRITE_TIMEOUT,
+        help='Seconds a response write may stay blocked. Default is {}.'.format(WRITE_TIMEOUT)
+    )
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=None,
+        help='WeApRous hooks running at once, the others are queued then shed '
+             'with 503. Default is no limit.'
+    )
+    parser.add_argument(
+        '--max-static',
+        type=int,
+        default=None,
+        help='Static requests processed at once. Default is no limit.'
+    )
+    parser.add_argument(
+        '--queue-timeout',
+        type=float,
+        default=QUEUE_TIMEOUT,
+        help='Seconds a request over a cap waits before being shed. Default is {}.'.format(QUEUE_TIMEOUT)
+    )
+    parser.add_argument(
+        '--object-pool',
+        action='store_true',
+        help='Recycle the request, response and adapter objects per worker.'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes sharing the port with SO_REUSEPORT. Default is 1.'
+    )
+    parser.add_argument(
+        '--handoff',
+        default=None,
+        help='Unix socket path on which the listening socket is handed over '
+             'to the next process started with the same path.'
+    )
+    parser.add_argument(
+        '--drain-timeout',
+        type=float,
+        default=DRAIN_TIMEOUT,
+        help='Seconds to drain the connections after a handoff. Default is {}.'.format(DRAIN_TIMEOUT)
+    )
+    parser.add_argument(
+        '--log-level',
+        choices=LEVELS,
+        default='info',
+        help='Lowest level logged; debug traces every request. Default is info.'
+    )
+    parser.add_argument(
+        '--log-file',
+        default=None,
+        help='Append the log records to this file instead of stdout.'
+    )
+    parser.add_argument(
+        '--access-log',
+        default=None,
+        help='File of the access log, one line per request; - for stdout.'
+    )
+    parser.add_argument(
+        '--access-log-max-bytes',
+        type=int,
+        default=ACCESS_LOG_MAX_BYTES,
+        help='Size in bytes rotating the access log. Default is {}.'.format(ACCESS_LOG_MAX_BYTES)
+    )
+    parser.add_argument(
+        '--access-log-rotate',
+        type=float,
+        default=None,
+        help='Seconds after which the access log is rotated. Default is never.'
+    )
+    parser.add_argument(
+        '--metrics',
+        nargs='?',
+        const='/metrics',
+        default=None,
+        help='Serve the latencies and counters of each route on this path, /metrics by default.'
+    )
+    parser.add_argument(
+        '--profiler',
+        nargs='?',
+        const='/debug/profile',
+        default=None,
+        help='Enable the sampling profiler routes below this path, /debug/profile by default.'
+    )
+    parser.add_argument(
+        '--no-server-timing',
+        dest='server_timing',
+        action='store_false',
+        help='Leave the Server-Timing header out of the responses.'
+    )
  
     args = parser.parse_args()
     ip = args.server_ip
     port = args.server_port
+    configure(level=args.log_level, path=args.log_file)
 
-    create_backend(ip, port)
+    create_backend(ip, port,
+                   workers=args.workers,
+                   engine=args.engine,
+                   threads=args.threads,
+                   queue_size=args.queue_size,
+                   overload=args.overload,
+                   idle_timeout=args.idle_timeout,
+                   max_requests=args.max_requests,
+                   read_timeout=args.read_timeout,
+                   write_timeout=args.write_timeout,
+                   max_concurrency=args.max_concurrency,
+                   max_static=args.max_static,
+                   queue_timeout=args.queue_timeout,
+                   object_pool=args.object_pool,
+                   access_log=args.access_log,
+                   access_log_max_bytes=args.access_log_max_bytes,
+                   access_log_rotate=args.access_log_rotate,
+                   metrics=args.metrics,
+                   profiler=args.profiler,
+                   server_timing=args.server_timing,
+                   handoff=args.handoff,
+                   drain_timeout=args.drain_timeout)
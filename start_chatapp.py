@@ -22,6 +22,7 @@ and peer-to-peer (for direct messaging) paradigms.
 """
 
 import json
+import os
 import socket
 import argparse
 import threading
@@ -29,14 +30,27 @@ import time
 from datetime import datetime
 
 from daemon.weaprous import WeApRous
+from daemon.backend import ENGINES
+from daemon.workerpool import OVERLOAD_POLICIES
+from daemon.httpadapter import IDLE_TIMEOUT, MAX_REQUESTS
+from daemon.handoff import DRAIN_TIMEOUT
+from daemon.timers import READ_TIMEOUT, WRITE_TIMEOUT
+from daemon.admission import QUEUE_TIMEOUT
+from daemon.logger import LEVELS, configure, get_logger
+from daemon.accesslog import MAX_BYTES as ACCESS_LOG_MAX_BYTES
 
 PORT = 8001  # Default port for chat server
 
+log = get_logger("ChatApp")
+
 # Global data structures for chat application
 active_peers = {}  # {peer_id: {"ip": ip, "port": port, "last_seen": timestamp}}
 channels = {}      # {channel_id: {"members": [peer_ids], "messages": []}}
 peer_connections = {}  # {peer_id: socket_connection}
 
+DEFAULT_LIMIT = 50  # Messages returned by /get-messages by default
+MAX_LIMIT = 500     # Largest page of /get-messages
+
 app = WeApRous()
 
 @app.route('/login', methods=['POST'])
@@ -50,7 +64,7 @@ def chat_login(headers="guest", body="anonymous"):
         username = data.get('username', 'anonymous')
         password = data.get('password', '')
         
-        print("[ChatApp] Login attempt: {}".format(username))
+        log.info("Login attempt: {}", username)
         
         # Simple authentication (can be enhanced)
         if username and password:
@@ -66,10 +80,10 @@ def chat_login(headers="guest", body="anonymous"):
                 "message": "Invalid credentials"
             }
             
-        return json.dumps(response)
+        return response
     except Exception as e:
-        print("[ChatApp] Login error: {}".format(e))
-        return json.dumps({"status": "error", "message": "Login failed"})
+        log.error("Login error: {}", e)
+        return {"status": "error", "message": "Login failed"}
 
 @app.route('/submit-info', methods=['POST'])
 def submit_peer_info(headers="guest", body="anonymous"):
@@ -90,7 +104,7 @@ def submit_peer_info(headers="guest", body="anonymous"):
                 "last_seen": time.time()
             }
             
-            print("[ChatApp] Peer registered: {} at {}:{}".format(peer_id, peer_ip, peer_port))
+            log.info("Peer registered: {} at {}:{}", peer_id, peer_ip, peer_port)
             
             response = {
                 "status": "success",
@@ -103,10 +117,10 @@ def submit_peer_info(headers="guest", body="anonymous"):
                 "message": "Missing peer information"
             }
             
-        return json.dumps(response)
+        return response
     except Exception as e:
-        print("[ChatApp] Submit info error: {}".format(e))
-        return json.dumps({"status": "error", "message": "Registration failed"})
+        log.error("Submit info error: {}", e)
+        return {"status": "error", "message": "Registration failed"}
 
 @app.route('/get-list', methods=['GET'])
 def get_peer_list(headers="guest", body="anonymous"):
@@ -123,7 +137,7 @@ def get_peer_list(headers="guest", body="anonymous"):
         ]
         for peer_id in expired_peers:
             del active_peers[peer_id]
-            print("[ChatApp] Removed expired peer: {}".format(peer_id))
+            log.info("Removed expired peer: {}", peer_id)
         
         peers_list = []
         for peer_id, info in active_peers.items():
@@ -139,11 +153,25 @@ def get_peer_list(headers="guest", body="anonymous"):
             "count": len(peers_list)
         }
         
-        print("[ChatApp] Returned peer list: {} peers".format(len(peers_list)))
-        return json.dumps(response)
+        log.debug("Returned peer list: {} peers", len(peers_list))
+        return response
     except Exception as e:
-        print("[ChatApp] Get list error: {}".format(e))
-        return json.dumps({"status": "error", "message": "Failed to get peer list"})
+        log.error("Get list error: {}", e)
+        return {"status": "error", "message": "Failed to get peer list"}
+
+@app.route('/peers/<peer_id>', methods=['GET'])
+def get_peer(request, peer_id):
+    """
+    Get the connection info of one active peer.
+    Returns: {"peer": {"peer_id": "user1", "ip": "192.168.1.100", "port": 9999}}
+    """
+    info = active_peers.get(peer_id)
+    if info is None:
+        return {"status": "error", "message": "Peer not found"}, 404
+    return {
+        "status": "success",
+        "peer": {"peer_id": peer_id, "ip": info['ip'], "port": info['port']}
+    }
 
 @app.route('/connect-peer', methods=['POST'])
 def connect_peer(headers="guest", body="anonymous"):
@@ -168,17 +196,17 @@ def connect_peer(headers="guest", body="anonymous"):
                 }
             }
             
-            print("[ChatApp] Connection info provided: {} -> {}".format(from_peer, to_peer))
+            log.debug("Connection info provided: {} -> {}", from_peer, to_peer)
         else:
             response = {
                 "status": "error",
                 "message": "Peer not found or offline"
             }
             
-        return json.dumps(response)
+        return response
     except Exception as e:
-        print("[ChatApp] Connect peer error: {}".format(e))
-        return json.dumps({"status": "error", "message": "Connection failed"})
+        log.error("Connect peer error: {}", e)
+        return {"status": "error", "message": "Connection failed"}
 
 @app.route('/broadcast-peer', methods=['POST'])
 def broadcast_peer(headers="guest", body="anonymous"):
@@ -210,7 +238,7 @@ def broadcast_peer(headers="guest", body="anonymous"):
             if from_peer not in channels[channel]["members"]:
                 channels[channel]["members"].append(from_peer)
             
-            print("[ChatApp] Broadcast message from {} in channel {}: {}".format(from_peer, channel, message))
+            log.debug("Broadcast message from {} in channel {}: {}", from_peer, channel, message)
             
             response = {
                 "status": "success",
@@ -223,10 +251,10 @@ def broadcast_peer(headers="guest", body="anonymous"):
                 "message": "Missing message data"
             }
             
-        return json.dumps(response)
+        return response
     except Exception as e:
-        print("[ChatApp] Broadcast error: {}".format(e))
-        return json.dumps({"status": "error", "message": "Broadcast failed"})
+        log.error("Broadcast error: {}", e)
+        return {"status": "error", "message": "Broadcast failed"}
 
 @app.route('/send-peer', methods=['POST'])
 def send_peer(headers="guest", body="anonymous"):
@@ -250,7 +278,7 @@ def send_peer(headers="guest", body="anonymous"):
                 "type": "private"
             }
             
-            print("[ChatApp] Direct message from {} to {}: {}".format(from_peer, to_peer, message))
+            log.debug("Direct message from {} to {}: {}", from_peer, to_peer, message)
             
             response = {
                 "status": "success",
@@ -263,43 +291,56 @@ def send_peer(headers="guest", body="anonymous"):
                 "message": "Invalid message or peer not found"
             }
             
-        return json.dumps(response)
+        return response
     except Exception as e:
-        print("[ChatApp] Send peer error: {}".format(e))
-        return json.dumps({"status": "error", "message": "Send failed"})
+        log.error("Send peer error: {}", e)
+        return {"status": "error", "message": "Send failed"}
 
 @app.route('/get-messages', methods=['GET'])
-def get_messages(headers="guest", body="anonymous"):
+def get_messages(request, channel=None):
     """
     Get messages from a specific channel.
-    Expected query: ?channel=general&limit=50
+    Expected query: ?channel=general&limit=50&cursor=120
+
+    Without a cursor, the last ``limit`` messages are returned; with one,
+    the ``limit`` messages after the first ``cursor`` ones. The response
+    carries ``next_cursor``, to ask only for the messages not seen yet.
     """
     try:
-        # Parse query parameters (simplified)
-        channel = "general"  # Default channel
-        limit = 50          # Default limit
-        
-        if channel in channels:
-            messages = channels[channel]["messages"][-limit:]  # Get last N messages
-            
-            response = {
-                "status": "success",
-                "channel": channel,
-                "messages": messages,
-                "count": len(messages)
-            }
+        query = request.query
+        channel = channel or query.get("channel") or "general"
+        limit = query.get("limit", DEFAULT_LIMIT, type=int)
+        limit = min(max(limit, 1), MAX_LIMIT)
+        cursor = query.get("cursor", None, type=int)
+
+        history = channels[channel]["messages"] if channel in channels else []
+        if cursor is None:
+            start = max(len(history) - limit, 0)
         else:
-            response = {
-                "status": "success",
-                "channel": channel,
-                "messages": [],
-                "count": 0
-            }
-        
-        return json.dumps(response)
+            start = min(max(cursor, 0), len(history))
+        messages = history[start:start + limit]
+        next_cursor = start + len(messages)
     except Exception as e:
-        print("[ChatApp] Get messages error: {}".format(e))
-        return json.dumps({"status": "error", "message": "Failed to get messages"})
+        log.error("Get messages error: {}", e)
+        return {"status": "error", "message": "Failed to get messages"}
+
+    # A long history is streamed by the framework, a batch of messages
+    # per part, so the first bytes leave before the whole list is encoded.
+    return {
+        "status": "success",
+        "channel": channel,
+        "count": len(messages),
+        "next_cursor": next_cursor,
+        "messages": messages
+    }
+
+@app.route('/channels/<channel>/messages', methods=['GET'])
+def get_channel_messages(request, channel):
+    """
+    Get messages from the channel of the path.
+    Expected query: ?limit=50&cursor=120, see /get-messages.
+    """
+    return get_messages(request, channel=channel)
 
 @app.route('/channels', methods=['GET'])
 def get_channels(headers="guest", body="anonymous"):
@@ -321,10 +362,10 @@ def get_channels(headers="guest", body="anonymous"):
             "count": len(channel_list)
         }
         
-        return json.dumps(response)
+        return response
     except Exception as e:
-        print("[ChatApp] Get channels error: {}".format(e))
-        return json.dumps({"status": "error", "message": "Failed to get channels"})
+        log.error("Get channels error: {}", e)
+        return {"status": "error", "message": "Failed to get channels"}
 
 def cleanup_peers():
     """Background task to clean up inactive peers."""
@@ -338,39 +379,99 @@ def cleanup_peers():
             
             for peer_id in expired_peers:
                 del active_peers[peer_id]
-                print("[ChatApp] Cleaned up expired peer: {}".format(peer_id))
+                log.info("Cleaned up expired peer: {}", peer_id)
             
             time.sleep(60)  # Check every minute
         except Exception as e:
-            print("[ChatApp] Cleanup error: {}".format(e))
+            log.error("Cleanup error: {}", e)
             time.sleep(60)
 
+def start_cleanup():
+    """Start the background cleanup task."""
+    cleanup_thread = threading.Thread(target=cleanup_peers)
+    cleanup_thread.daemon = True
+    cleanup_thread.start()
+
 if __name__ == "__main__":
     # Parse command-line arguments to configure server IP and port
     parser = argparse.ArgumentParser(prog='ChatApp', description='Chat Application Server', epilog='WeApRous Chat daemon')
     parser.add_argument('--server-ip', default='0.0.0.0')
     parser.add_argument('--server-port', type=int, default=PORT)
+    parser.add_argument('--engine', choices=ENGINES, default='threaded')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--queue-size', type=int, default=64)
+    parser.add_argument('--overload', choices=OVERLOAD_POLICIES, default='block')
+    parser.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT)
+    parser.add_argument('--max-requests', type=int, default=MAX_REQUESTS)
+    parser.add_argument('--read-timeout', type=float, default=READ_TIMEOUT)
+    parser.add_argument('--write-timeout', type=float, default=WRITE_TIMEOUT)
+    parser.add_argument('--max-concurrency', type=int, default=None)
+    parser.add_argument('--max-static', type=int, default=None)
+    parser.add_argument('--queue-timeout', type=float, default=QUEUE_TIMEOUT)
+    parser.add_argument('--object-pool', action='store_true')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes; each keeps its own peers and channels')
+    parser.add_argument('--handoff', default=None,
+                        help='Unix socket path for zero-downtime restarts')
+    parser.add_argument('--drain-timeout', type=float, default=DRAIN_TIMEOUT)
+    parser.add_argument('--log-level', choices=LEVELS, default='info')
+    parser.add_argument('--log-file', default=None,
+                        help='Append the log records to this file instead of stdout')
+    parser.add_argument('--access-log', default=None,
+                        help='File of the access log, one line per request; - for stdout')
+    parser.add_argument('--access-log-max-bytes', type=int, default=ACCESS_LOG_MAX_BYTES)
+    parser.add_argument('--access-log-rotate', type=float, default=None)
+    parser.add_argument('--metrics', nargs='?', const='/metrics', default=None,
+                        help='Serve the latencies and counters of each route on this path')
+    parser.add_argument('--profiler', nargs='?', const='/debug/profile', default=None,
+                        help='Enable the sampling profiler routes below this path')
+    parser.add_argument('--no-server-timing', dest='server_timing', action='store_false',
+                        help='Leave the Server-Timing header out of the responses')
  
     args = parser.parse_args()
     ip = args.server_ip
     port = args.server_port
+    configure(level=args.log_level, path=args.log_file)
 
-    # Start background cleanup task
-    cleanup_thread = threading.Thread(target=cleanup_peers)
-    cleanup_thread.daemon = True
-    cleanup_thread.start()
+    # Start background cleanup task, in every worker process when forking
+    if args.workers > 1:
+        os.register_at_fork(after_in_child=start_cleanup)
+    else:
+        start_cleanup()
 
     print("[ChatApp] Starting chat application server on {}:{}".format(ip, port))
     print("[ChatApp] Available endpoints:")
     print("  POST /login - User authentication")
     print("  POST /submit-info - Register peer")
     print("  GET  /get-list - Get active peers")
+    print("  GET  /peers/<peer_id> - Get one active peer")
     print("  POST /connect-peer - Get peer connection info")
     print("  POST /broadcast-peer - Broadcast message")
     print("  POST /send-peer - Send direct message")
     print("  GET  /get-messages - Get channel messages")
     print("  GET  /channels - Get available channels")
+    print("  GET  /channels/<channel>/messages - Get channel messages")
 
     # Prepare and launch the chat application
     app.prepare_address(ip, port)
-    app.run()
\ No newline at end of file
+    app.run(workers=args.workers,
+            engine=args.engine,
+            threads=args.threads,
+            queue_size=args.queue_size,
+            overload=args.overload,
+            idle_timeout=args.idle_timeout,
+            max_requests=args.max_requests,
+            read_timeout=args.read_timeout,
+            write_timeout=args.write_timeout,
+            max_concurrency=args.max_concurrency,
+            max_static=args.max_static,
+            queue_timeout=args.queue_timeout,
+            object_pool=args.object_pool,
+            access_log=args.access_log,
+            access_log_max_bytes=args.access_log_max_bytes,
+            access_log_rotate=args.access_log_rotate,
+            metrics=args.metrics,
+            profiler=args.profiler,
+            server_timing=args.server_timing,
+            handoff=args.handoff,
+            drain_timeout=args.drain_timeout)
\ No newline at end of file
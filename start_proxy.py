@@ -46,6 +46,13 @@ except ImportError:
 from collections import defaultdict
 
 from daemon import create_proxy
+from daemon.proxy import ENGINES
+from daemon.handoff import DRAIN_TIMEOUT
+from daemon.httpadapter import IDLE_TIMEOUT
+from daemon.timers import READ_TIMEOUT, WRITE_TIMEOUT
+from daemon.admission import QUEUE_TIMEOUT
+from daemon.logger import LEVELS, configure
+from daemon.accesslog import MAX_BYTES as ACCESS_LOG_MAX_BYTES
 
 PROXY_PORT = 8080
 
@@ -114,16 +121,63 @@ if __name__ == "__main__":
 
     :arg --server-ip (str): IP address to bind the server (default: 127.0.0.1).
     :arg --server-port (int): Port number to bind the server (default: 9000).
+    :arg --engine (str): Serving engine (default: threaded).
+    :arg --workers (int): Worker processes sharing the port (default: 1).
+    :arg --handoff (str): Unix socket path for zero-downtime restarts.
+    :arg --drain-timeout (float): Seconds to drain after a handoff (default: 30).
+    :arg --idle-timeout (float): Keep-alive idle timeout in seconds (default: 5).
+    :arg --read-timeout (float): Seconds to receive a whole request (default: 10).
+    :arg --write-timeout (float): Seconds a response write may block (default: 10).
+    :arg --max-concurrency (int): Requests forwarded at once (default: no limit).
+    :arg --queue-timeout (float): Seconds a request over the cap waits (default: 1).
+    :arg --log-level (str): Lowest level logged debug/info/warning/error (default: info).
+    :arg --log-file (str): File the log is appended to (default: stdout).
+    :arg --access-log (str): File of the access log, - for stdout (default: none).
+    :arg --access-log-max-bytes (int): Size rotating the access log (default: 10 MiB).
+    :arg --access-log-rotate (float): Seconds rotating the access log (default: never).
+    :arg --metrics (str): Path serving the metrics, /metrics without a value (default: off).
+    :arg --no-server-timing: Leave the proxy phases out of the Server-Timing header.
     """
 
     parser = argparse.ArgumentParser(prog='Proxy', description='', epilog='Proxy daemon')
     parser.add_argument('--server-ip', default='0.0.0.0')
     parser.add_argument('--server-port', type=int, default=PROXY_PORT)
+    parser.add_argument('--engine', choices=ENGINES, default='threaded')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--handoff', default=None)
+    parser.add_argument('--drain-timeout', type=float, default=DRAIN_TIMEOUT)
+    parser.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT)
+    parser.add_argument('--read-timeout', type=float, default=READ_TIMEOUT)
+    parser.add_argument('--write-timeout', type=float, default=WRITE_TIMEOUT)
+    parser.add_argument('--max-concurrency', type=int, default=None)
+    parser.add_argument('--queue-timeout', type=float, default=QUEUE_TIMEOUT)
+    parser.add_argument('--log-level', choices=LEVELS, default='info')
+    parser.add_argument('--log-file', default=None)
+    parser.add_argument('--access-log', default=None)
+    parser.add_argument('--access-log-max-bytes', type=int, default=ACCESS_LOG_MAX_BYTES)
+    parser.add_argument('--access-log-rotate', type=float, default=None)
+    parser.add_argument('--metrics', nargs='?', const='/metrics', default=None)
+    parser.add_argument('--no-server-timing', dest='server_timing', action='store_false')
  
     args = parser.parse_args()
     ip = args.server_ip
     port = args.server_port
+    configure(level=args.log_level, path=args.log_file)
 
     routes = parse_virtual_hosts("config/proxy.conf")
 
-    create_proxy(ip, port, routes)
+    create_proxy(ip, port, routes,
+                 workers=args.workers,
+                 engine=args.engine,
+                 handoff=args.handoff,
+                 drain_timeout=args.drain_timeout,
+                 idle_timeout=args.idle_timeout,
+                 read_timeout=args.read_timeout,
+                 write_timeout=args.write_timeout,
+                 max_concurrency=args.max_concurrency,
+                 queue_timeout=args.queue_timeout,
+                 access_log=args.access_log,
+                 access_log_max_bytes=args.access_log_max_bytes,
+                 access_log_rotate=args.access_log_rotate,
+                 metrics=args.metrics,
+                 server_timing=args.server_timing)
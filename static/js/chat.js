@@ -8,6 +8,7 @@ class ChatApp {
     constructor() {
         this.currentUser = null;
         this.currentChannel = 'general';
+        this.messageCursor = null;  // next_cursor of the last /get-messages
         this.peers = [];
         this.messages = [];
         this.isLoggedIn = false;
@@ -339,9 +340,17 @@ class ChatApp {
     
     async getChannelMessages() {
         try {
-            const response = await this.makeRequest('GET', `/get-messages?channel=${this.currentChannel}`);
+            let url = `/get-messages?channel=${encodeURIComponent(this.currentChannel)}`;
+            if (this.messageCursor !== null) {
+                // Only the messages not received yet
+                url += `&cursor=${this.messageCursor}`;
+            }
+            const response = await this.makeRequest('GET', url);
             
             if (response.status === 'success' && response.messages) {
+                if (typeof response.next_cursor === 'number') {
+                    this.messageCursor = response.next_cursor;
+                }
                 response.messages.forEach(msg => {
                     const type = msg.from === this.currentUser ? 'own' : 'other';
                     // Gọi thẳng addMessage, để nó tự xử lý việc hợp nhất (merge)
@@ -369,6 +378,7 @@ class ChatApp {
         this.currentUser = null;
         this.peers = [];
         this.messages = [];
+        this.messageCursor = null;
         this.showLoginSection();
         this.updateConnectionStatus('disconnected');
         this.clearForm();